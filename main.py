@@ -1,14 +1,26 @@
 from __future__ import annotations
 
 import argparse
+import os
 
 from social_game import BotPolicy, EloRating, GameRoom, PlayerAction, render_board
+from social_game import tournament
 
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Happy Social Game CLI MVP")
     p.add_argument("--auto", action="store_true", help="run bot vs bot non-interactive demo")
-    return p.parse_args()
+    p.add_argument("--tournament", type=int, metavar="N", help="play N headless bot games and report win rates")
+    p.add_argument("--workers", type=int, default=None, help="tournament processes (default: all cores)")
+    p.add_argument("--policies", default="greedy,random", help=f"comma list from {','.join(tournament.POLICIES)}")
+    p.add_argument("--layouts", default="standard", help=f"comma list from {','.join(tournament.LAYOUTS)}")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", default="tournament.csv", help="results file (CSV, one row per game)")
+    p.add_argument("--scaling", action="store_true", help="also measure games/s at 1, 2, 4, ... workers")
+    args = p.parse_args()
+    if args.tournament is not None and args.tournament < 1:
+        p.error("--tournament needs at least 1 game")
+    return args
 
 
 def choose_player_action(room: GameRoom, player_id: str) -> PlayerAction:
@@ -49,8 +61,8 @@ def run_game(auto: bool = False) -> None:
         result = room.resolve_turn()
 
         print("\n--- 回合结算 ---")
-        for event in result.events:
-            print("-", event)
+        for line in result.events.lines():
+            print("-", line)
         print("比分:", room.score)
         print(render_board(room, "you", "bot"))
 
@@ -62,9 +74,26 @@ def run_game(auto: bool = False) -> None:
             break
 
 
+def run_tournament(args: argparse.Namespace) -> None:
+    policies = args.policies.split(",")
+    layouts = args.layouts.split(",")
+    workers = args.workers or os.cpu_count() or 1
+    specs = tournament.schedule(args.tournament, policies, layouts, args.seed)
+    games, seconds = tournament.run_tournament(specs, args.out, workers)
+    print(tournament.format_report(tournament.aggregate(args.out), games, seconds, workers))
+    if args.scaling:
+        base = None
+        for n, rate in tournament.measure_scaling(args.tournament, policies, layouts, args.seed, workers):
+            base = base or rate
+            print(f"  workers={n:<3} {rate:8.1f} games/s  speedup {rate / base:.2f}x")
+
+
 def main() -> None:
     args = parse_args()
-    run_game(auto=args.auto)
+    if args.tournament is not None:
+        run_tournament(args)
+    else:
+        run_game(auto=args.auto)
 
 
 if __name__ == "__main__":
@@ -1,15 +1,20 @@
 """Happy Social Game MVP package."""
 
 from .ai import BotPolicy
+from .compact import CompactRoom
 from .engine import GameRoom, PlayerAction, UnitType
+from .events import EventCode, EventLog
 from .rating import EloRating, PlayerRating, TrueSkillLite
 from .render import render_board
 
 __all__ = [
     "BotPolicy",
+    "CompactRoom",
     "GameRoom",
     "PlayerAction",
     "UnitType",
+    "EventCode",
+    "EventLog",
     "EloRating",
     "PlayerRating",
     "TrueSkillLite",
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Dict, List, Sequence
 
 from .engine import GameRoom, PlayerAction
+from .influence import score_grid
 
 
 @dataclass
@@ -11,12 +13,12 @@ class BotPolicy:
     player_id: str
 
     def choose_action(self, room: GameRoom) -> PlayerAction:
-        enemy_id = next(pid for pid in room.players if pid != self.player_id)
+        influence = room.influence(self.player_id)
         best = None
 
         for i, unit in enumerate(room.players[self.player_id].units):
             for tx, ty in room.legal_moves(self.player_id, i):
-                score = self._score_move(room, enemy_id, tx, ty)
+                score = influence.score(tx, ty)
                 if best is None or score > best[0]:
                     use_skill = score >= 8 and not unit.skill_used
                     best = (score, PlayerAction(self.player_id, i, tx, ty, use_skill=use_skill))
@@ -25,13 +27,33 @@ class BotPolicy:
             return PlayerAction(self.player_id, 0, 0, 0)
         return best[1]
 
-    def _score_move(self, room: GameRoom, enemy_id: str, tx: int, ty: int) -> int:
-        score = 0
-        if (tx, ty) in room.control_points:
-            score += 6
-        for enemy in room.players[enemy_id].units:
-            if (enemy.x, enemy.y) == (tx, ty):
-                score += 7
-            dist = abs(enemy.x - tx) + abs(enemy.y - ty)
-            score += max(0, 3 - dist)
-        return score
+
+def choose_actions_batch(rooms: Sequence[GameRoom], player_ids: Sequence[str]) -> List[PlayerAction]:
+    """BotPolicy.choose_action for many rooms at once, with identical decisions.
+
+    The move score only depends on the board, control points and enemy positions, so
+    rooms are grouped by that layout and one score_grid (InfluenceMap.move_score) is
+    built per group; every room in it scores its candidates by table lookup.
+    """
+    grids: Dict[tuple, array] = {}
+    actions: List[PlayerAction] = []
+    for room, pid in zip(rooms, player_ids):
+        enemy_id = next(other for other in room.players if other != pid)
+        enemy_cells = tuple((e.x, e.y) for e in room.players[enemy_id].units)
+        key = (room.width, room.height, tuple(room.control_points), enemy_cells)
+        grid = grids.get(key)
+        if grid is None:
+            grid = grids[key] = score_grid(room.width, room.height, room.control_points, enemy_cells)
+
+        height = room.height
+        best = None
+        for i, unit in enumerate(room.players[pid].units):
+            for tx, ty in room.moves.reachable(unit.x, unit.y, unit.move_range):
+                score = grid[tx * height + ty]
+                if best is None or score > best[0]:
+                    best = (score, i, tx, ty, score >= 8 and not unit.skill_used)
+        if best is None:
+            actions.append(PlayerAction(pid, 0, 0, 0))
+        else:
+            actions.append(PlayerAction(pid, best[1], best[2], best[3], use_skill=best[4]))
+    return actions
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import random
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from .engine import UNIT_KINDS, GameRoom, PlayerAction, Unit
+
+try:
+    import numpy as np
+except ImportError:  # optional: BatchEngine falls back to per-room loops
+    np = None
+
+_NP_TYPES = {"b": "int8", "i": "int32"}
+
+
+@dataclass
+class ActionBatch:
+    """One action per room, stored column-wise. `player` is 0 or 1; a negative unit index skips the room."""
+
+    player: array
+    unit_index: array
+    target_x: array
+    target_y: array
+    use_skill: array
+
+    @classmethod
+    def empty(cls, n: int) -> "ActionBatch":
+        return cls(*(array("i", bytes(4 * n)) for _ in range(5)))
+
+    @classmethod
+    def from_actions(cls, actions: Sequence[PlayerAction], player_ids: Sequence[str]) -> "ActionBatch":
+        return cls(
+            array("i", [player_ids.index(a.player_id) for a in actions]),
+            array("i", [a.unit_index for a in actions]),
+            array("i", [a.target_x for a in actions]),
+            array("i", [a.target_y for a in actions]),
+            array("i", [int(a.use_skill) for a in actions]),
+        )
+
+
+class BatchEngine:
+    """N GameRooms held as flat per-field arrays, resolved one rule step at a time.
+
+    Each room keeps a fixed block of unit slots (spawn order, alive flag instead of
+    list removal); finished rooms are frozen. With NumPy installed every rule step is
+    one array operation over all rooms (the columns are viewed as rooms x slots);
+    without it, or with vectorized=False, the same steps run as per-room Python loops
+    over stdlib arrays. Results match GameRoom turn for turn either way.
+    """
+
+    def __init__(self, n_rooms: int, player_a: str = "p1", player_b: str = "p2", vectorized: Optional[bool] = None):
+        if vectorized and np is None:
+            raise RuntimeError("vectorized BatchEngine needs numpy")
+        self.vectorized = np is not None if vectorized is None else vectorized
+        template = GameRoom("batch", player_a, player_b)
+        self.n = n_rooms
+        self.player_ids: Tuple[str, str] = (player_a, player_b)
+        self.width = template.width
+        self.height = template.height
+        self.max_turns = template.max_turns
+        self.target_score = template.target_score
+        self.control_points: List[Tuple[int, int]] = list(template.control_points)
+        self.moves = template.moves
+
+        spawn: List[Tuple[int, Unit]] = [
+            (p, u) for p, pid in enumerate(self.player_ids) for u in template.players[pid].units
+        ]
+        column = self._column
+        self.units_per_room = len(spawn)
+        self.owner = column("b", [p for p, _ in spawn])
+        self.kind = column("b", [UNIT_KINDS.index(u.unit_type) for _, u in spawn])
+        self.attack = column("i", [u.attack for _, u in spawn])
+        self.move_range = column("i", [u.move_range for _, u in spawn])
+
+        self.hp = column("i", [u.hp for _, u in spawn] * n_rooms)
+        self.x = column("i", [u.x for _, u in spawn] * n_rooms)
+        self.y = column("i", [u.y for _, u in spawn] * n_rooms)
+        self.skill_used = column("b", [0] * (self.units_per_room * n_rooms))
+        self.alive = column("b", [1] * (self.units_per_room * n_rooms))
+        self.turn = column("i", [template.turn] * n_rooms)
+        self.score = (column("i", [0] * n_rooms), column("i", [0] * n_rooms))
+        self.winner = column("b", [-1] * n_rooms)
+
+    def active(self) -> List[int]:
+        if self.vectorized:
+            return np.flatnonzero(self.winner < 0).tolist()
+        return [r for r in range(self.n) if self.winner[r] < 0]
+
+    def resolve_turn(self, phases: Sequence[ActionBatch]) -> array:
+        """Resolve one turn for every unfinished room; `phases` are applied in submission order.
+
+        Returns the winner column (-1 while a room is still running).
+        """
+        if self.vectorized:
+            self._resolve_vectorized(phases)
+            return self.winner
+        rooms = self.active()
+        for batch in phases:
+            slots = self._select_slots(rooms, batch)
+            self._move(rooms, batch, slots)
+            self._strike(rooms, batch, slots)
+        self._cleanup_dead_units(rooms)
+        self._score_control_points(rooms)
+        self._update_winner(rooms)
+        turn = self.turn
+        for r in rooms:
+            turn[r] += 1
+        return self.winner
+
+    def legal_moves(self, room: int, player: int, unit_index: int) -> List[Tuple[int, int]]:
+        s = self._slot_for(room, player, unit_index)
+        return list(self.moves.reachable(int(self.x[s]), int(self.y[s]), int(self.move_range[s % self.units_per_room])))
+
+    def unit_count(self, room: int, player: int) -> int:
+        k = self.units_per_room
+        base = room * k
+        return sum(1 for u in range(k) if self.owner[u] == player and self.alive[base + u])
+
+    def random_actions(self, rng: random.Random, player: int, rooms: Optional[Sequence[int]] = None) -> ActionBatch:
+        """Uniform random legal action per room, for balance sweeps and benchmarks."""
+        batch = ActionBatch.empty(self.n)
+        k = self.units_per_room
+        mine = [u for u in range(k) if self.owner[u] == player]
+        reach = [int(self.move_range[u]) for u in range(k)]
+        # plain lists: per-element reads from a numpy column are slow
+        alive, xs, ys = self.alive.tolist(), self.x.tolist(), self.y.tolist()
+        reachable = self.moves.reachable
+        for r in self.active() if rooms is None else rooms:
+            batch.player[r] = player
+            base = r * k
+            living = [u for u in mine if alive[base + u]]
+            if not living:
+                batch.unit_index[r] = -1
+                continue
+            i = rng.randrange(len(living))
+            u = living[i]
+            tx, ty = rng.choice(reachable(xs[base + u], ys[base + u], reach[u]))
+            batch.unit_index[r] = i
+            batch.target_x[r] = tx
+            batch.target_y[r] = ty
+            batch.use_skill[r] = rng.random() < 0.5
+        return batch
+
+    def to_room(self, room: int) -> GameRoom:
+        """Materialize one room as a GameRoom (for rendering, replays and differential tests)."""
+        out = GameRoom(f"batch-{room}", *self.player_ids)
+        out.turn = int(self.turn[room])
+        k = self.units_per_room
+        for p, pid in enumerate(self.player_ids):
+            out.score[pid] = int(self.score[p][room])
+            out.players[pid].units = [
+                Unit(
+                    owner_id=pid,
+                    unit_type=UNIT_KINDS[self.kind[u]],
+                    hp=int(self.hp[room * k + u]),
+                    attack=int(self.attack[u]),
+                    move_range=int(self.move_range[u]),
+                    x=int(self.x[room * k + u]),
+                    y=int(self.y[room * k + u]),
+                    skill_used=bool(self.skill_used[room * k + u]),
+                    uid=u,
+                )
+                for u in range(k)
+                if self.owner[u] == p and self.alive[room * k + u]
+            ]
+        out.rebuild_occupancy()
+        return out
+
+    def _column(self, typecode: str, values: list):
+        if self.vectorized:
+            return np.array(values, dtype=_NP_TYPES[typecode])
+        return array(typecode, values)
+
+    def _resolve_vectorized(self, phases: Sequence[ActionBatch]) -> None:
+        """resolve_turn as whole-column NumPy steps; the columns are viewed as (rooms, slots)."""
+        n, k = self.n, self.units_per_room
+        xs, ys = self.x.reshape(n, k), self.y.reshape(n, k)
+        hp, alive, skill_used = self.hp.reshape(n, k), self.alive.reshape(n, k), self.skill_used.reshape(n, k)
+        owner = self.owner.astype(np.int32)
+        running = self.winner < 0
+
+        for batch in phases:
+            player = np.frombuffer(batch.player, dtype=np.int32)
+            index = np.frombuffer(batch.unit_index, dtype=np.int32)
+            # select: the index-th living unit of the acting player, in spawn order
+            mine = (owner == player[:, None]) & (alive != 0)
+            chosen = mine & (np.cumsum(mine, axis=1) - 1 == index[:, None])
+            chosen &= (running & (index >= 0))[:, None]
+            rooms = np.flatnonzero(chosen.any(axis=1))
+            slots = chosen[rooms].argmax(axis=1)
+
+            # move
+            tx = np.frombuffer(batch.target_x, dtype=np.int32)[rooms]
+            ty = np.frombuffer(batch.target_y, dtype=np.int32)[rooms]
+            dist = np.abs(xs[rooms, slots] - tx) + np.abs(ys[rooms, slots] - ty)
+            ok = (dist <= self.move_range[slots]) & (tx >= 0) & (tx < self.width) & (ty >= 0) & (ty < self.height)
+            xs[rooms[ok], slots[ok]] = tx[ok]
+            ys[rooms[ok], slots[ok]] = ty[ok]
+
+            # strike the first living enemy unit (spawn order) on the mover's cell
+            ux, uy = xs[rooms, slots], ys[rooms, slots]
+            enemy = (owner == 1 - player[rooms][:, None]) & (alive[rooms] != 0)
+            enemy &= (xs[rooms] == ux[:, None]) & (ys[rooms] == uy[:, None])
+            hit = enemy.any(axis=1)
+            rooms, slots, targets = rooms[hit], slots[hit], enemy[hit].argmax(axis=1)
+            use = np.frombuffer(batch.use_skill, dtype=np.int32)[rooms]
+            bonus = ((use != 0) & (skill_used[rooms, slots] == 0)).astype(np.int32)
+            hp[rooms, targets] -= self.attack[slots] + bonus
+            skill_used[rooms[bonus == 1], slots[bonus == 1]] = 1
+
+        # cleanup
+        alive[(hp <= 0) & running[:, None]] = 0
+
+        # control points: one player alone on the cell scores it
+        living = alive != 0
+        side_a, side_b = owner == 0, owner == 1
+        score_a, score_b = self.score
+        for cx, cy in self.control_points:
+            on = living & (xs == cx) & (ys == cy)
+            a, b = (on & side_a).any(axis=1), (on & side_b).any(axis=1)
+            score_a += running & a & ~b
+            score_b += running & b & ~a
+
+        # winner
+        has_a, has_b = (living & side_a).any(axis=1), (living & side_b).any(axis=1)
+        decided = np.select(
+            [
+                has_a & ~has_b,
+                has_b & ~has_a,
+                score_a >= self.target_score,
+                score_b >= self.target_score,
+                self.turn >= self.max_turns,
+            ],
+            [0, 1, 0, 1, np.where(score_a >= score_b, 0, 1)],
+            -1,
+        )
+        self.winner[running] = decided[running]
+        self.turn[running] += 1
+
+    def _slot_for(self, room: int, player: int, unit_index: int) -> int:
+        k = self.units_per_room
+        base = room * k
+        remaining = unit_index
+        for u in range(k):
+            if self.owner[u] == player and self.alive[base + u]:
+                if remaining == 0:
+                    return base + u
+                remaining -= 1
+        return -1
+
+    def _select_slots(self, rooms: Sequence[int], batch: ActionBatch) -> List[int]:
+        slots = [-1] * self.n
+        for r in rooms:
+            if batch.unit_index[r] >= 0:
+                slots[r] = self._slot_for(r, batch.player[r], batch.unit_index[r])
+        return slots
+
+    def _move(self, rooms: Sequence[int], batch: ActionBatch, slots: List[int]) -> None:
+        k = self.units_per_room
+        xs, ys, reach = self.x, self.y, self.move_range
+        w, h = self.width, self.height
+        for r in rooms:
+            s = slots[r]
+            if s < 0:
+                continue
+            tx, ty = batch.target_x[r], batch.target_y[r]
+            if abs(xs[s] - tx) + abs(ys[s] - ty) <= reach[s % k] and 0 <= tx < w and 0 <= ty < h:
+                xs[s] = tx
+                ys[s] = ty
+
+    def _strike(self, rooms: Sequence[int], batch: ActionBatch, slots: List[int]) -> None:
+        k = self.units_per_room
+        xs, ys, hp, alive, owner = self.x, self.y, self.hp, self.alive, self.owner
+        for r in rooms:
+            s = slots[r]
+            if s < 0:
+                continue
+            enemy = 1 - batch.player[r]
+            base = r * k
+            for u in range(k):
+                t = base + u
+                if owner[u] == enemy and alive[t] and xs[t] == xs[s] and ys[t] == ys[s]:
+                    bonus = 1 if batch.use_skill[r] and not self.skill_used[s] else 0
+                    hp[t] -= self.attack[s % k] + bonus
+                    if bonus:
+                        self.skill_used[s] = 1
+                    break
+
+    def _cleanup_dead_units(self, rooms: Sequence[int]) -> None:
+        k = self.units_per_room
+        hp, alive = self.hp, self.alive
+        for r in rooms:
+            for t in range(r * k, r * k + k):
+                if alive[t] and hp[t] <= 0:
+                    alive[t] = 0
+
+    def _score_control_points(self, rooms: Sequence[int]) -> None:
+        k = self.units_per_room
+        xs, ys, alive, owner = self.x, self.y, self.alive, self.owner
+        for r in rooms:
+            base = r * k
+            for cx, cy in self.control_points:
+                held = 0
+                for u in range(k):
+                    t = base + u
+                    if alive[t] and xs[t] == cx and ys[t] == cy:
+                        held |= 1 << owner[u]
+                if held == 1 or held == 2:
+                    self.score[held - 1][r] += 1
+
+    def _update_winner(self, rooms: Sequence[int]) -> None:
+        k = self.units_per_room
+        alive, owner = self.alive, self.owner
+        score_a, score_b = self.score
+        for r in rooms:
+            living = 0
+            for u in range(k):
+                if alive[r * k + u]:
+                    living |= 1 << owner[u]
+            if living == 1 or living == 2:
+                self.winner[r] = living - 1
+            elif score_a[r] >= self.target_score:
+                self.winner[r] = 0
+            elif score_b[r] >= self.target_score:
+                self.winner[r] = 1
+            elif self.turn[r] >= self.max_turns:
+                self.winner[r] = 0 if score_a[r] >= score_b[r] else 1
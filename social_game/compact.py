@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .engine import UNIT_KINDS, GameRoom, MoveTable, PlayerAction, TurnResult, Unit, UnitType
+from .events import EventCode, EventLog, NullEventLog
+from .influence import InfluenceMap
+
+# All mutable state lives in one flat int array: [turn, score_a, score_b, unit0..., unit1..., ...]
+TURN = 0
+SCORE = 1
+UNIT_BASE = 3
+STRIDE = 5
+HP, X, Y, SKILL, ALIVE = range(STRIDE)
+
+_NO_EVENTS = NullEventLog(())
+
+
+class UnitView:
+    """Read-only unit view mirroring engine.Unit, so BotPolicy and render_board work unchanged."""
+
+    __slots__ = ("_room", "_slot")
+
+    def __init__(self, room: "CompactRoom", slot: int):
+        self._room = room
+        self._slot = slot
+
+    def _get(self, field: int) -> int:
+        return self._room._state[UNIT_BASE + self._slot * STRIDE + field]
+
+    @property
+    def owner_id(self) -> str:
+        return self._room.player_ids[self._room._owner[self._slot]]
+
+    @property
+    def uid(self) -> int:
+        return self._room._uid[self._slot]
+
+    @property
+    def unit_type(self) -> UnitType:
+        return UNIT_KINDS[self._room._kind[self._slot]]
+
+    @property
+    def attack(self) -> int:
+        return self._room._attack[self._slot]
+
+    @property
+    def move_range(self) -> int:
+        return self._room._move_range[self._slot]
+
+    @property
+    def hp(self) -> int:
+        return self._get(HP)
+
+    @property
+    def x(self) -> int:
+        return self._get(X)
+
+    @property
+    def y(self) -> int:
+        return self._get(Y)
+
+    @property
+    def skill_used(self) -> bool:
+        return bool(self._get(SKILL))
+
+    @property
+    def symbol(self) -> str:
+        return "S" if self.unit_type == UnitType.SCOUT else "B"
+
+
+class PlayerView:
+    __slots__ = ("player_id", "units")
+
+    def __init__(self, player_id: str, units: List[UnitView]):
+        self.player_id = player_id
+        self.units = units
+
+
+class CompactRoom:
+    """Array-backed GameRoom: clone copies one int array, apply/undo use a change journal.
+
+    Rules match GameRoom exactly (actions resolve in submission order, dead units
+    are removed at end of turn), so it can stand in for search and what-if simulation.
+    """
+
+    __slots__ = (
+        "room_id",
+        "player_ids",
+        "width",
+        "height",
+        "max_turns",
+        "target_score",
+        "control_points",
+        "moves",
+        "pending_actions",
+        "event_log",
+        "_owner",
+        "_uid",
+        "_kind",
+        "_attack",
+        "_move_range",
+        "_state",
+        "_journal",
+        "_frames",
+        "_influence",
+    )
+
+    def __init__(self, room_id: str, player_a: str, player_b: str):
+        self._init_from(GameRoom(room_id, player_a, player_b))
+
+    @classmethod
+    def from_room(cls, room: GameRoom) -> "CompactRoom":
+        compact = cls.__new__(cls)
+        compact._init_from(room)
+        return compact
+
+    def _init_from(self, room: GameRoom) -> None:
+        self.room_id = room.room_id
+        self.player_ids: Tuple[str, ...] = tuple(room.players)
+        self.width = room.width
+        self.height = room.height
+        self.max_turns = room.max_turns
+        self.target_score = room.target_score
+        self.control_points: List[Tuple[int, int]] = list(room.control_points)
+        self.moves: MoveTable = room.moves
+        self.pending_actions: Dict[str, PlayerAction] = dict(room.pending_actions)
+        self.event_log: EventLog = type(room.event_log)(self.player_ids)
+
+        units: List[Tuple[int, Unit]] = [
+            (p, u) for p, pid in enumerate(self.player_ids) for u in room.players[pid].units
+        ]
+        self._owner = array("b", [p for p, _ in units])
+        self._uid = array("i", [u.uid for _, u in units])
+        self._kind = array("b", [UNIT_KINDS.index(u.unit_type) for _, u in units])
+        self._attack = array("i", [u.attack for _, u in units])
+        self._move_range = array("i", [u.move_range for _, u in units])
+
+        state = array("i", [room.turn] + [room.score[pid] for pid in self.player_ids])
+        for _, u in units:
+            state.extend((u.hp, u.x, u.y, int(u.skill_used), 1))
+        self._state = state
+        self._journal: List[int] = []
+        self._frames: List[int] = []
+        self._influence: Dict[str, InfluenceMap] = {}
+
+    def clone(self) -> "CompactRoom":
+        """Copy mutable state only; static unit stats are shared with the source room."""
+        other = CompactRoom.__new__(CompactRoom)
+        other.room_id = self.room_id
+        other.player_ids = self.player_ids
+        other.width = self.width
+        other.height = self.height
+        other.max_turns = self.max_turns
+        other.target_score = self.target_score
+        other.control_points = self.control_points
+        other.moves = self.moves
+        other.pending_actions = dict(self.pending_actions)
+        other.event_log = NullEventLog(self.player_ids)
+        other._owner = self._owner
+        other._uid = self._uid
+        other._kind = self._kind
+        other._attack = self._attack
+        other._move_range = self._move_range
+        other._state = array("i", self._state)
+        other._journal = []
+        other._frames = []
+        other._influence = self._influence
+        return other
+
+    # --- GameRoom-compatible API ---
+
+    @property
+    def turn(self) -> int:
+        return self._state[TURN]
+
+    @property
+    def score(self) -> Dict[str, int]:
+        return {pid: self._state[SCORE + p] for p, pid in enumerate(self.player_ids)}
+
+    @property
+    def players(self) -> Dict[str, PlayerView]:
+        return {
+            pid: PlayerView(pid, [UnitView(self, s) for s in self._slots_of(p)])
+            for p, pid in enumerate(self.player_ids)
+        }
+
+    def influence(self, player_id: str) -> InfluenceMap:
+        cached = self._influence.get(player_id)
+        if cached is None:
+            cached = self._influence[player_id] = InfluenceMap.build(self, player_id)
+        return cached
+
+    def submit_action(self, action: PlayerAction) -> None:
+        if action.player_id not in self.player_ids:
+            raise ValueError("unknown player")
+        if action.unit_index < 0:
+            raise ValueError("unit index must be >= 0")
+        self.pending_actions[action.player_id] = action
+
+    def ready_to_resolve(self) -> bool:
+        return len(self.pending_actions) == len(self.player_ids)
+
+    def resolve_turn(self) -> TurnResult:
+        if not self.ready_to_resolve():
+            raise RuntimeError("all players must submit action")
+
+        # a committed turn cannot be undone, so drop any search journal
+        self._journal.clear()
+        self._frames.clear()
+        log = self.event_log
+        mark = log.mark()
+        log.emit(EventCode.TURN, self.turn)
+        winner = self._step(list(self.pending_actions.values()), log)
+        self.pending_actions.clear()
+        self._influence = {}
+        return TurnResult(events=log.since(mark), winner=winner)
+
+    def legal_moves(self, player_id: str, unit_index: int) -> List[Tuple[int, int]]:
+        slot = self._slot_for(self.player_ids.index(player_id), unit_index)
+        if slot < 0:
+            raise IndexError("list index out of range")
+        base = UNIT_BASE + slot * STRIDE
+        return list(self.moves.reachable(self._state[base + X], self._state[base + Y], self._move_range[slot]))
+
+    def snapshot(self) -> dict:
+        state = self._state
+        return {
+            "room_id": self.room_id,
+            "turn": self.turn,
+            "score": self.score,
+            "control_points": self.control_points,
+            "players": {
+                pid: [
+                    {
+                        "id": self._uid[s],
+                        "type": UNIT_KINDS[self._kind[s]].value,
+                        "hp": state[UNIT_BASE + s * STRIDE + HP],
+                        "atk": self._attack[s],
+                        "pos": [state[UNIT_BASE + s * STRIDE + X], state[UNIT_BASE + s * STRIDE + Y]],
+                        "skill_used": bool(state[UNIT_BASE + s * STRIDE + SKILL]),
+                    }
+                    for s in self._slots_of(p)
+                ]
+                for p, pid in enumerate(self.player_ids)
+            },
+        }
+
+    # --- apply / undo for search ---
+
+    def apply(self, actions: Sequence[PlayerAction]) -> Optional[str]:
+        """Resolve one turn in the given order without events; revert with undo(). Returns the winner."""
+        self._frames.append(len(self._journal))
+        self._influence = {}
+        return self._step(actions, _NO_EVENTS, record=True)
+
+    def undo(self) -> None:
+        if not self._frames:
+            raise RuntimeError("nothing to undo")
+        mark = self._frames.pop()
+        self._influence = {}
+        journal = self._journal
+        state = self._state
+        while len(journal) > mark:
+            old = journal.pop()
+            state[journal.pop()] = old
+
+    # --- internals ---
+
+    def _slots_of(self, player: int) -> List[int]:
+        state = self._state
+        return [
+            s for s in range(len(self._owner))
+            if self._owner[s] == player and state[UNIT_BASE + s * STRIDE + ALIVE]
+        ]
+
+    def _slot_for(self, player: int, unit_index: int) -> int:
+        state = self._state
+        owner = self._owner
+        k = unit_index
+        for s in range(len(owner)):
+            if owner[s] == player and state[UNIT_BASE + s * STRIDE + ALIVE]:
+                if k == 0:
+                    return s
+                k -= 1
+        return -1
+
+    def _set(self, offset: int, value: int, record: bool) -> None:
+        if record:
+            self._journal.append(offset)
+            self._journal.append(self._state[offset])
+        self._state[offset] = value
+
+    def _unit_at(self, player: int, x: int, y: int) -> int:
+        state = self._state
+        owner = self._owner
+        for s in range(len(owner)):
+            base = UNIT_BASE + s * STRIDE
+            if owner[s] == player and state[base + ALIVE] and state[base + X] == x and state[base + Y] == y:
+                return s
+        return -1
+
+    def _step(
+        self, actions: Sequence[PlayerAction], log: EventLog, record: bool = False
+    ) -> Optional[str]:
+        state = self._state
+        for action in actions:
+            p = self.player_ids.index(action.player_id)
+            slot = self._slot_for(p, action.unit_index)
+            if slot < 0:
+                log.emit(EventCode.SKIPPED, p)
+                continue
+
+            base = UNIT_BASE + slot * STRIDE
+            tx, ty = action.target_x, action.target_y
+            dist = abs(state[base + X] - tx) + abs(state[base + Y] - ty)
+            if dist <= self._move_range[slot] and 0 <= tx < self.width and 0 <= ty < self.height:
+                self._set(base + X, tx, record)
+                self._set(base + Y, ty, record)
+                log.emit(EventCode.MOVED, p, self._kind[slot], tx, ty)
+            else:
+                log.emit(EventCode.FAILED_MOVE, p)
+
+            target = self._unit_at(1 - p, state[base + X], state[base + Y])
+            if target >= 0:
+                bonus = 1 if action.use_skill and not state[base + SKILL] else 0
+                damage = self._attack[slot] + bonus
+                hp_off = UNIT_BASE + target * STRIDE + HP
+                self._set(hp_off, state[hp_off] - damage, record)
+                if bonus:
+                    self._set(base + SKILL, 1, record)
+                log.emit(EventCode.HIT, p, damage)
+
+        self._cleanup_dead_units(log, record)
+        self._score_control_points(log, record)
+        winner = self._winner()
+        self._set(TURN, state[TURN] + 1, record)
+        return winner
+
+    def _cleanup_dead_units(self, log: EventLog, record: bool) -> None:
+        state = self._state
+        for p in range(len(self.player_ids)):
+            lost = 0
+            for s in range(len(self._owner)):
+                base = UNIT_BASE + s * STRIDE
+                if self._owner[s] == p and state[base + ALIVE] and state[base + HP] <= 0:
+                    self._set(base + ALIVE, 0, record)
+                    lost += 1
+            if lost:
+                log.emit(EventCode.LOST, p, lost)
+
+    def _score_control_points(self, log: EventLog, record: bool) -> None:
+        for point in self.control_points:
+            owner = -1
+            contested = False
+            for p in range(len(self.player_ids)):
+                if self._unit_at(p, point[0], point[1]) >= 0:
+                    if owner >= 0:
+                        contested = True
+                    owner = p
+            if owner >= 0 and not contested:
+                self._set(SCORE + owner, self._state[SCORE + owner] + 1, record)
+                log.emit(EventCode.CAPTURED, owner, point[0], point[1])
+
+    def _winner(self) -> Optional[str]:
+        state = self._state
+        living = [
+            pid for p, pid in enumerate(self.player_ids)
+            if any(state[UNIT_BASE + s * STRIDE + ALIVE] for s in range(len(self._owner)) if self._owner[s] == p)
+        ]
+        if len(living) == 1:
+            return living[0]
+        for p, pid in enumerate(self.player_ids):
+            if state[SCORE + p] >= self.target_score:
+                return pid
+        if state[TURN] >= self.max_turns:
+            score = self.score
+            return max(score, key=score.get)
+        return None
@@ -4,12 +4,18 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Optional, Tuple
 
+from .events import EventCode, EventLog, NullEventLog
+from .influence import InfluenceMap
+
 
 class UnitType(str, Enum):
     SCOUT = "scout"
     BRUISER = "bruiser"
 
 
+UNIT_KINDS: Tuple[UnitType, ...] = tuple(UnitType)
+
+
 @dataclass
 class Unit:
     owner_id: str
@@ -20,6 +26,8 @@ class Unit:
     x: int
     y: int
     skill_used: bool = False
+    uid: int = 0
+    changed_turn: int = 0
 
     @property
     def symbol(self) -> str:
@@ -49,37 +57,106 @@ class PlayerState:
 
 @dataclass
 class TurnResult:
-    events: List[str]
+    events: EventLog
     winner: Optional[str]
 
 
+Cell = Tuple[int, int]
+
+
+class MoveTable:
+    """Reachable cells per (position, move_range), built lazily once per board size."""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self._moves: Dict[Tuple[int, int, int], Tuple[Cell, ...]] = {}
+
+    def reachable(self, x: int, y: int, move_range: int) -> Tuple[Cell, ...]:
+        key = (x, y, move_range)
+        moves = self._moves.get(key)
+        if moves is None:
+            moves = tuple(
+                (tx, ty)
+                for tx in range(self.width)
+                for ty in range(self.height)
+                if abs(x - tx) + abs(y - ty) <= move_range
+            )
+            self._moves[key] = moves
+        return moves
+
+
+_MOVE_TABLES: Dict[Tuple[int, int], MoveTable] = {}
+
+
+def move_table(width: int, height: int) -> MoveTable:
+    table = _MOVE_TABLES.get((width, height))
+    if table is None:
+        table = _MOVE_TABLES[(width, height)] = MoveTable(width, height)
+    return table
+
+
 class GameRoom:
     """Prototype B: asynchronous board raid room (2 players)."""
 
-    width: int = 5
-    height: int = 5
     max_turns: int = 12
     target_score: int = 6
-
-    def __init__(self, room_id: str, player_a: str, player_b: str):
+    default_control_points: Tuple[Cell, ...] = ((2, 2), (1, 3), (3, 1))
+
+    def __init__(
+        self,
+        room_id: str,
+        player_a: str,
+        player_b: str,
+        width: int = 5,
+        height: int = 5,
+        control_points: Optional[List[Cell]] = None,
+        record_events: bool = True,
+    ):
+        if width < 2 or height < 2:
+            raise ValueError(f"board must be at least 2x2, got {width}x{height}")
         self.room_id = room_id
+        self.width = width
+        self.height = height
+        self.moves = move_table(width, height)
         self.turn = 1
         self.players: Dict[str, PlayerState] = {
             player_a: PlayerState(player_id=player_a),
             player_b: PlayerState(player_id=player_b),
         }
         self.pending_actions: Dict[str, PlayerAction] = {}
-        self.control_points: List[Tuple[int, int]] = [(2, 2), (1, 3), (3, 1)]
+        self._index = {player_a: 0, player_b: 1}
+        self.event_log = EventLog((player_a, player_b)) if record_events else NullEventLog((player_a, player_b))
+        if control_points is None:
+            control_points = list(self.default_control_points)
+        for cx, cy in control_points:
+            if not (0 <= cx < width and 0 <= cy < height):
+                raise ValueError(f"control point {(cx, cy)} is off the {width}x{height} board")
+        self.control_points: List[Cell] = control_points
         self.score: Dict[str, int] = {player_a: 0, player_b: 0}
+        self.removed_units: List[Tuple[int, int]] = []  # (turn, uid)
 
+        # opposite corners: A from the top-left, B from the bottom-right
         self.players[player_a].units = [
             Unit.spawn(player_a, UnitType.SCOUT, 0, 0),
             Unit.spawn(player_a, UnitType.BRUISER, 0, 1),
         ]
         self.players[player_b].units = [
-            Unit.spawn(player_b, UnitType.SCOUT, 4, 4),
-            Unit.spawn(player_b, UnitType.BRUISER, 4, 3),
+            Unit.spawn(player_b, UnitType.SCOUT, width - 1, height - 1),
+            Unit.spawn(player_b, UnitType.BRUISER, width - 1, height - 2),
         ]
+        for uid, unit in enumerate(u for state in self.players.values() for u in state.units):
+            unit.uid = uid
+        self.rebuild_occupancy()
+
+    def rebuild_occupancy(self) -> None:
+        """Re-derive the position index; call after replacing or moving units directly."""
+        self._influence: Dict[str, InfluenceMap] = {}
+        self._occupancy: Dict[str, Dict[Cell, List[Unit]]] = {pid: {} for pid in self.players}
+        for player_id, state in self.players.items():
+            cells = self._occupancy[player_id]
+            for unit in state.units:
+                cells.setdefault((unit.x, unit.y), []).append(unit)
 
     def submit_action(self, action: PlayerAction) -> None:
         if action.player_id not in self.players:
@@ -95,20 +172,23 @@ class GameRoom:
         if not self.ready_to_resolve():
             raise RuntimeError("all players must submit action")
 
-        events: List[str] = [f"turn {self.turn} resolve"]
+        log = self.event_log
+        mark = log.mark()
+        log.emit(EventCode.TURN, self.turn)
         for player_id, action in self.pending_actions.items():
             actor = self.players[player_id]
+            p = self._index[player_id]
             if action.unit_index >= len(actor.units):
-                events.append(f"{player_id} invalid unit index, skipped")
+                log.emit(EventCode.SKIPPED, p)
                 continue
 
             unit = actor.units[action.unit_index]
             dist = abs(unit.x - action.target_x) + abs(unit.y - action.target_y)
             if dist <= unit.move_range and self._inside(action.target_x, action.target_y):
-                unit.x, unit.y = action.target_x, action.target_y
-                events.append(f"{player_id} moved {unit.unit_type.value} to {(unit.x, unit.y)}")
+                self._relocate(player_id, unit, action.target_x, action.target_y)
+                log.emit(EventCode.MOVED, p, UNIT_KINDS.index(unit.unit_type), unit.x, unit.y)
             else:
-                events.append(f"{player_id} failed move")
+                log.emit(EventCode.FAILED_MOVE, p)
 
             enemy_id = self._enemy_player(player_id)
             target = self._unit_at(enemy_id, unit.x, unit.y)
@@ -116,26 +196,31 @@ class GameRoom:
                 bonus = 1 if action.use_skill and not unit.skill_used else 0
                 damage = unit.attack + bonus
                 target.hp -= damage
+                target.changed_turn = self.turn
                 if bonus:
                     unit.skill_used = True
-                events.append(f"{player_id} hit enemy for {damage} damage")
+                    unit.changed_turn = self.turn
+                log.emit(EventCode.HIT, p, damage)
 
-        self._cleanup_dead_units(events)
-        self._score_control_points(events)
+        self._cleanup_dead_units()
+        self._score_control_points()
         winner = self._winner()
         self.turn += 1
         self.pending_actions.clear()
+        self._influence.clear()
 
-        return TurnResult(events=events, winner=winner)
+        return TurnResult(events=log.since(mark), winner=winner)
 
     def legal_moves(self, player_id: str, unit_index: int) -> List[Tuple[int, int]]:
         unit = self.players[player_id].units[unit_index]
-        moves: List[Tuple[int, int]] = []
-        for x in range(self.width):
-            for y in range(self.height):
-                if abs(unit.x - x) + abs(unit.y - y) <= unit.move_range:
-                    moves.append((x, y))
-        return moves
+        return list(self.moves.reachable(unit.x, unit.y, unit.move_range))
+
+    def influence(self, player_id: str) -> InfluenceMap:
+        """Evaluation maps for `player_id`, built once per turn and shared by all bots."""
+        cached = self._influence.get(player_id)
+        if cached is None:
+            cached = self._influence[player_id] = InfluenceMap.build(self, player_id)
+        return cached
 
     def _inside(self, x: int, y: int) -> bool:
         return 0 <= x < self.width and 0 <= y < self.height
@@ -144,27 +229,48 @@ class GameRoom:
         return next(pid for pid in self.players if pid != player_id)
 
     def _unit_at(self, player_id: str, x: int, y: int) -> Optional[Unit]:
-        for unit in self.players[player_id].units:
-            if unit.x == x and unit.y == y:
-                return unit
-        return None
-
-    def _cleanup_dead_units(self, events: List[str]) -> None:
+        cell = self._occupancy[player_id].get((x, y))
+        if not cell:
+            return None
+        if len(cell) == 1:
+            return cell[0]
+        # stacked units: keep the old list-order semantics
+        order = {id(u): i for i, u in enumerate(self.players[player_id].units)}
+        return min(cell, key=lambda u: order[id(u)])
+
+    def _relocate(self, player_id: str, unit: Unit, x: int, y: int) -> None:
+        self._unindex(player_id, unit)
+        unit.x, unit.y = x, y
+        unit.changed_turn = self.turn
+        self._occupancy[player_id].setdefault((x, y), []).append(unit)
+
+    def _unindex(self, player_id: str, unit: Unit) -> None:
+        cells = self._occupancy[player_id]
+        key = (unit.x, unit.y)
+        cell = cells[key]
+        if len(cell) == 1:
+            del cells[key]
+        else:
+            cell[:] = [u for u in cell if u is not unit]
+
+    def _cleanup_dead_units(self) -> None:
         for player_id, state in self.players.items():
             before = len(state.units)
-            state.units = [u for u in state.units if u.hp > 0]
-            if len(state.units) < before:
-                events.append(f"{player_id} lost {before - len(state.units)} unit(s)")
-
-    def _score_control_points(self, events: List[str]) -> None:
+            alive = [u for u in state.units if u.hp > 0]
+            if len(alive) < before:
+                for u in state.units:
+                    if u.hp <= 0:
+                        self._unindex(player_id, u)
+                        self.removed_units.append((self.turn, u.uid))
+                state.units = alive
+                self.event_log.emit(EventCode.LOST, self._index[player_id], before - len(state.units))
+
+    def _score_control_points(self) -> None:
         for point in self.control_points:
-            owners: List[str] = []
-            for player_id, state in self.players.items():
-                if any((u.x, u.y) == point for u in state.units):
-                    owners.append(player_id)
+            owners = [pid for pid, cells in self._occupancy.items() if point in cells]
             if len(owners) == 1:
                 self.score[owners[0]] += 1
-                events.append(f"{owners[0]} captured point {point} (+1)")
+                self.event_log.emit(EventCode.CAPTURED, self._index[owners[0]], point[0], point[1])
 
     def _winner(self) -> Optional[str]:
         living = [pid for pid, s in self.players.items() if s.units]
@@ -186,6 +292,7 @@ class GameRoom:
             "players": {
                 pid: [
                     {
+                        "id": u.uid,
                         "type": u.unit_type.value,
                         "hp": u.hp,
                         "atk": u.attack,
@@ -197,3 +304,19 @@ class GameRoom:
                 for pid, state in self.players.items()
             },
         }
+
+    def snapshot_delta(self, since_turn: int) -> dict:
+        """Changes made while resolving turns >= since_turn (pair with a snapshot taken at that turn)."""
+        return {
+            "room_id": self.room_id,
+            "turn": self.turn,
+            "since": since_turn,
+            "score": dict(self.score),
+            "units": [
+                {"id": u.uid, "hp": u.hp, "pos": [u.x, u.y], "skill_used": u.skill_used}
+                for state in self.players.values()
+                for u in state.units
+                if u.changed_turn >= since_turn
+            ],
+            "removed": [uid for turn, uid in self.removed_units if turn >= since_turn],
+        }
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from array import array
+from enum import IntEnum
+from typing import Iterator, List, NamedTuple, Sequence, Tuple
+
+
+class EventCode(IntEnum):
+    TURN = 0  # (turn,)
+    SKIPPED = 1  # (player,)
+    MOVED = 2  # (player, unit_kind, x, y)
+    FAILED_MOVE = 3  # (player,)
+    HIT = 4  # (player, damage)
+    LOST = 5  # (player, count)
+    CAPTURED = 6  # (player, x, y)
+
+
+# code + up to four int payload slots per event
+STRIDE = 5
+
+
+class Event(NamedTuple):
+    code: EventCode
+    payload: Tuple[int, ...]
+
+
+def format_event(event: Event, player_ids: Sequence[str]) -> str:
+    from .engine import UNIT_KINDS
+
+    code, p = event
+    if code == EventCode.TURN:
+        return f"turn {p[0]} resolve"
+    pid = player_ids[p[0]]
+    if code == EventCode.SKIPPED:
+        return f"{pid} invalid unit index, skipped"
+    if code == EventCode.MOVED:
+        return f"{pid} moved {UNIT_KINDS[p[1]].value} to {(p[2], p[3])}"
+    if code == EventCode.FAILED_MOVE:
+        return f"{pid} failed move"
+    if code == EventCode.HIT:
+        return f"{pid} hit enemy for {p[1]} damage"
+    if code == EventCode.LOST:
+        return f"{pid} lost {p[1]} unit(s)"
+    if code == EventCode.CAPTURED:
+        return f"{pid} captured point {(p[1], p[2])} (+1)"
+    raise ValueError(f"unknown event code {code}")
+
+
+_ARITY = {
+    EventCode.TURN: 1,
+    EventCode.SKIPPED: 1,
+    EventCode.MOVED: 4,
+    EventCode.FAILED_MOVE: 1,
+    EventCode.HIT: 2,
+    EventCode.LOST: 2,
+    EventCode.CAPTURED: 3,
+}
+
+
+class EventLog:
+    """Fixed-stride int buffer of events; text is only built by lines()/format_event.
+
+    Players are stored as their index in `player_ids`.
+    """
+
+    enabled = True
+
+    def __init__(self, player_ids: Sequence[str], data: "array | None" = None):
+        self.player_ids: Tuple[str, ...] = tuple(player_ids)
+        self.data = array("i") if data is None else data
+
+    def emit(self, code: int, a: int = 0, b: int = 0, c: int = 0, d: int = 0) -> None:
+        self.data.extend((code, a, b, c, d))
+
+    def mark(self) -> int:
+        return len(self.data)
+
+    def since(self, mark: int) -> "EventLog":
+        return EventLog(self.player_ids, self.data[mark:])
+
+    def clear(self) -> None:
+        del self.data[:]
+
+    def __len__(self) -> int:
+        return len(self.data) // STRIDE
+
+    def __iter__(self) -> Iterator[Event]:
+        data = self.data
+        for i in range(0, len(data), STRIDE):
+            code = EventCode(data[i])
+            yield Event(code, tuple(data[i + 1 : i + 1 + _ARITY[code]]))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EventLog):
+            return NotImplemented
+        return self.player_ids == other.player_ids and self.data == other.data
+
+    def lines(self) -> List[str]:
+        return [format_event(e, self.player_ids) for e in self]
+
+    def to_bytes(self) -> bytes:
+        return self.data.tobytes()
+
+    @classmethod
+    def from_bytes(cls, player_ids: Sequence[str], raw: bytes) -> "EventLog":
+        data = array("i")
+        data.frombytes(raw)
+        return cls(player_ids, data)
+
+
+class NullEventLog(EventLog):
+    """Headless mode: drops every event."""
+
+    enabled = False
+
+    def emit(self, code: int, a: int = 0, b: int = 0, c: int = 0, d: int = 0) -> None:
+        pass
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .ai import BotPolicy
+from .engine import GameRoom, PlayerAction, TurnResult
+from .wal import WriteAheadLog
+
+ResultHook = Callable[[str, TurnResult], None]
+
+
+class RoomBusy(RuntimeError):
+    """Raised by submit_nowait when a room's inbox is full."""
+
+
+@dataclass
+class HostedRoom:
+    room: GameRoom
+    inbox: "asyncio.Queue[Tuple[Optional[PlayerAction], Optional[asyncio.Future]]]"
+    bots: Dict[str, BotPolicy] = field(default_factory=dict)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    waiters: List[asyncio.Future] = field(default_factory=list)
+    task: Optional[asyncio.Task] = None
+    finished: bool = False
+
+
+class RoomHost:
+    """Runs many GameRooms on one event loop.
+
+    Every room is a small actor: a bounded inbox drained by one task, so actions for a
+    room are applied in arrival order while rooms progress independently. Bot moves are
+    computed in an executor so a slow policy never blocks the loop.
+    """
+
+    def __init__(
+        self,
+        inbox_size: int = 4,
+        executor: Optional[Executor] = None,
+        on_result: Optional[ResultHook] = None,
+        wal: Optional[WriteAheadLog] = None,
+    ):
+        self.inbox_size = inbox_size
+        self.wal = wal
+        self._own_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=4, thread_name_prefix="bot")
+        self.on_result = on_result
+        self.rooms: Dict[str, HostedRoom] = {}
+        self._closing = False
+
+    def open_room(self, room_id: str, player_a: str, player_b: str, bots: Sequence[str] = ()) -> GameRoom:
+        room = self.adopt(GameRoom(room_id, player_a, player_b), bots)
+        # adopt() has validated the room; its actor cannot run (and log) before we yield
+        if self.wal is not None:
+            self.wal.log_open(room)
+        return room
+
+    def adopt(self, room: GameRoom, bots: Sequence[str] = ()) -> GameRoom:
+        """Host an existing room, e.g. one rebuilt by wal.recover() after a restart."""
+        if self._closing:
+            raise RuntimeError("host is shutting down")
+        if room.room_id in self.rooms:
+            raise ValueError("room already open")
+        hosted = HostedRoom(
+            room=room,
+            inbox=asyncio.Queue(maxsize=self.inbox_size),
+            bots={pid: BotPolicy(pid) for pid in bots},
+        )
+        hosted.task = asyncio.get_running_loop().create_task(self._run(hosted))
+        self.rooms[room.room_id] = hosted
+        if len(hosted.bots) == len(room.players):
+            hosted.inbox.put_nowait((None, None))
+        return room
+
+    async def submit_action(self, room_id: str, action: PlayerAction) -> "asyncio.Future[TurnResult]":
+        """Queue an action, waiting while the room's inbox is full.
+
+        The returned future resolves with the TurnResult of the turn that consumed the action.
+        """
+        hosted, fut = self._accept(room_id)
+        await hosted.inbox.put((action, fut))
+        # the put may have waited past the room's last inbox read; nobody would drain it
+        if not fut.done() and (hosted.finished or (hosted.task is not None and hosted.task.done())):
+            fut.set_exception(RuntimeError("game is over" if hosted.finished else "host is shutting down"))
+        return fut
+
+    def submit_nowait(self, room_id: str, action: PlayerAction) -> "asyncio.Future[TurnResult]":
+        hosted, fut = self._accept(room_id)
+        try:
+            hosted.inbox.put_nowait((action, fut))
+        except asyncio.QueueFull:
+            raise RoomBusy(f"room {room_id} inbox is full") from None
+        return fut
+
+    async def shutdown(self, drain: bool = True) -> None:
+        """Stop accepting actions, optionally let queued ones finish, then stop every room."""
+        self._closing = True
+        rooms = list(self.rooms.values())
+        if drain:
+            await asyncio.gather(*(h.inbox.join() for h in rooms))
+        for hosted in rooms:
+            if hosted.task is not None:
+                hosted.task.cancel()
+        await asyncio.gather(*(h.task for h in rooms if h.task is not None), return_exceptions=True)
+        for hosted in rooms:
+            for fut in hosted.waiters:
+                fut.cancel()
+            hosted.waiters.clear()
+            # frees blocked submit_action puts, which then fail their own futures
+            while not hosted.inbox.empty():
+                _, fut = hosted.inbox.get_nowait()
+                if fut is not None:
+                    fut.cancel()
+        self.rooms.clear()
+        if self._own_executor:
+            self.executor.shutdown(wait=True)
+
+    async def checkpoint(self) -> Path:
+        """WAL checkpoint of every hosted room, with all rooms paused.
+
+        Each room's lock is taken (every room mutation happens under it), then the
+        snapshot is written on the loop thread so no room can be opened meanwhile either.
+        Rooms whose game is decided are left out; their CLOSE record is already logged.
+        """
+        if self.wal is None:
+            raise RuntimeError("host has no write-ahead log")
+        rooms = sorted(self.rooms.values(), key=lambda h: h.room.room_id)
+        async with contextlib.AsyncExitStack() as stack:
+            for hosted in rooms:
+                await stack.enter_async_context(hosted.lock)
+            return self.wal.checkpoint(h.room for h in self.rooms.values() if not h.finished)
+
+    def _accept(self, room_id: str) -> Tuple[HostedRoom, asyncio.Future]:
+        if self._closing:
+            raise RuntimeError("host is shutting down")
+        hosted = self.rooms.get(room_id)
+        if hosted is None:
+            raise KeyError(f"unknown room {room_id}")
+        return hosted, asyncio.get_running_loop().create_future()
+
+    async def _run(self, hosted: HostedRoom) -> None:
+        while not hosted.finished:
+            action, fut = await hosted.inbox.get()
+            try:
+                await self._handle(hosted, action, fut)
+            except asyncio.CancelledError:
+                if fut is not None:
+                    fut.cancel()
+                raise
+            except Exception as err:  # noqa: BLE001
+                self._fail_waiters(hosted, err)
+            finally:
+                hosted.inbox.task_done()
+
+        # actions that arrived after the deciding turn
+        while not hosted.inbox.empty():
+            _, fut = hosted.inbox.get_nowait()
+            if fut is not None and not fut.done():
+                fut.set_exception(RuntimeError("game is over"))
+            hosted.inbox.task_done()
+
+    async def _handle(self, hosted: HostedRoom, action: Optional[PlayerAction], fut: Optional[asyncio.Future]) -> None:
+        room = hosted.room
+        if action is not None:
+            async with hosted.lock:
+                try:
+                    room.submit_action(action)
+                except ValueError as err:
+                    if fut is not None and not fut.done():
+                        fut.set_exception(err)
+                    return
+                if self.wal is not None:
+                    self.wal.log_action(room.room_id, action)
+            if fut is not None:
+                hosted.waiters.append(fut)
+
+        loop = asyncio.get_running_loop()
+        for pid, bot in hosted.bots.items():
+            if pid not in room.pending_actions:
+                bot_action = await loop.run_in_executor(self.executor, bot.choose_action, room)
+                async with hosted.lock:
+                    room.submit_action(bot_action)
+                    if self.wal is not None:
+                        self.wal.log_action(room.room_id, bot_action)
+
+        if room.ready_to_resolve():
+            await self._resolve(hosted)
+
+    async def _resolve(self, hosted: HostedRoom) -> None:
+        async with hosted.lock:
+            room = hosted.room
+            if not room.ready_to_resolve():
+                return
+            lsn = self.wal.log_resolve(room.room_id, room.turn) if self.wal is not None else 0
+            result = room.resolve_turn()
+            if result.winner:
+                # finished before the lock drops, so a checkpoint never snapshots a closed room
+                hosted.finished = True
+                if self.wal is not None:
+                    lsn = self.wal.log_close(room.room_id)
+
+        if self.wal is not None:
+            # nobody hears about the turn until its record is on disk
+            await self.wal.durable(lsn)
+        waiters, hosted.waiters = hosted.waiters, []
+        for fut in waiters:
+            if not fut.done():
+                fut.set_result(result)
+        if self.on_result is not None:
+            self.on_result(room.room_id, result)
+
+        if result.winner:
+            self.rooms.pop(room.room_id, None)
+        elif len(hosted.bots) == len(room.players) and not hosted.inbox.full():
+            hosted.inbox.put_nowait((None, None))
+
+    @staticmethod
+    def _fail_waiters(hosted: HostedRoom, err: BaseException) -> None:
+        waiters, hosted.waiters = hosted.waiters, []
+        for fut in waiters:
+            if not fut.done():
+                fut.set_exception(err)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .engine import GameRoom
+
+Cell = Tuple[int, int]
+
+NO_ENEMY = 1 << 16
+
+# control point contest state, from the viewing player's side
+FREE = 0
+HELD = 1
+LOST = 2
+CONTESTED = 3
+
+
+@dataclass
+class InfluenceMap:
+    """Per-player evaluation tables for one turn, indexed by x * height + y.
+
+    - move_score: BotPolicy's move heuristic (control point +6, enemy on cell +7, +3 - distance per enemy)
+    - nearest_enemy: Manhattan distance to the closest enemy unit
+    - threat: damage enemies could deal on that cell next turn (attack + unused skill)
+    - contest: FREE / HELD / LOST / CONTESTED per control point, in room order
+    """
+
+    width: int
+    height: int
+    move_score: array
+    nearest_enemy: array
+    threat: array
+    contest: List[int]
+
+    def score(self, x: int, y: int) -> int:
+        return self.move_score[x * self.height + y]
+
+    @classmethod
+    def build(cls, room: "GameRoom", player_id: str) -> "InfluenceMap":
+        width, height = room.width, room.height
+        enemy_id = next(pid for pid in room.players if pid != player_id)
+        enemies = room.players[enemy_id].units
+        enemy_cells = [(e.x, e.y) for e in enemies]
+
+        nearest = array("i", [NO_ENEMY] * (width * height))
+        threat = array("i", [0] * (width * height))
+        for e in enemies:
+            damage = e.attack + (0 if e.skill_used else 1)
+            for x in range(width):
+                for y in range(height):
+                    dist = abs(e.x - x) + abs(e.y - y)
+                    i = x * height + y
+                    if dist < nearest[i]:
+                        nearest[i] = dist
+                    if dist <= e.move_range:
+                        threat[i] += damage
+
+        own = {(u.x, u.y) for u in room.players[player_id].units}
+        theirs = set(enemy_cells)
+        contest = [(HELD if p in own else FREE) | (LOST if p in theirs else FREE) for p in room.control_points]
+        return cls(
+            width=width,
+            height=height,
+            move_score=score_grid(width, height, room.control_points, enemy_cells),
+            nearest_enemy=nearest,
+            threat=threat,
+            contest=contest,
+        )
+
+
+def score_grid(width: int, height: int, control_points: Sequence[Cell], enemy_cells: Sequence[Cell]) -> array:
+    """BotPolicy's move score for every cell, indexed by x * height + y."""
+    grid = array("i", [0] * (width * height))
+    for cx, cy in set(control_points):
+        if 0 <= cx < width and 0 <= cy < height:
+            grid[cx * height + cy] += 6
+    for ex, ey in enemy_cells:
+        if 0 <= ex < width and 0 <= ey < height:
+            grid[ex * height + ey] += 7
+        for x in range(max(0, ex - 2), min(width, ex + 3)):
+            for y in range(max(0, ey - 2), min(height, ey + 3)):
+                grid[x * height + y] += max(0, 3 - abs(ex - x) - abs(ey - y))
+    return grid
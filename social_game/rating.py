@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import math
+from typing import MutableSequence, Sequence
 
 
 @dataclass
@@ -20,6 +21,21 @@ class EloRating:
         new_rb = rb + self.k * ((1 - score_a) - (1 - expected_a))
         return new_ra, new_rb
 
+    def update_batch(
+        self, ratings: MutableSequence[float], a_idx: Sequence[int], b_idx: Sequence[int], scores: Sequence[float]
+    ) -> None:
+        """update() for every match in order, in place on `ratings` (e.g. an array('d') indexed by player).
+
+        Same arithmetic as update(), so results are identical; a player who appears twice
+        sees the first match's result in the second.
+        """
+        k = self.k
+        for a, b, score_a in zip(a_idx, b_idx, scores):
+            ra, rb = ratings[a], ratings[b]
+            expected_a = 1.0 / (1 + 10 ** ((rb - ra) / 400))
+            ratings[a] = ra + k * (score_a - expected_a)
+            ratings[b] = rb + k * ((1 - score_a) - (1 - expected_a))
+
 
 class TrueSkillLite:
     """Lightweight approximation suitable for MVP leaderboard without third-party deps."""
@@ -45,3 +61,25 @@ class TrueSkillLite:
             sigma=max(1.0, b.sigma * 0.97),
         )
         return new_a, new_b
+
+    def update_1v1_batch(
+        self,
+        mu: MutableSequence[float],
+        sigma: MutableSequence[float],
+        a_idx: Sequence[int],
+        b_idx: Sequence[int],
+        a_wins: Sequence[bool],
+    ) -> None:
+        """update_1v1() for every match in order, in place on per-player `mu`/`sigma` columns."""
+        beta2 = 2 * self.beta**2
+        tau2 = self.tau**2
+        exp, sqrt = math.exp, math.sqrt
+        for a, b, won in zip(a_idx, b_idx, a_wins):
+            sa, sb = sigma[a], sigma[b]
+            c = sqrt(beta2 + sa**2 + sb**2)
+            expected = 1 / (1 + exp(-(mu[a] - mu[b]) / c))
+            outcome = 1.0 if won else 0.0
+            mu[a] += (sa**2 + tau2) / c * (outcome - expected)
+            mu[b] += (sb**2 + tau2) / c * ((1 - outcome) - (1 - expected))
+            sigma[a] = max(1.0, sa * 0.97)
+            sigma[b] = max(1.0, sb * 0.97)
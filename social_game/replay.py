@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .engine import GameRoom, PlayerAction, TurnResult
+from .wal import dump_room, load_room
+
+# one submitted action: player_id, unit_index, target_x, target_y, use_skill
+ActionRecord = Tuple[str, int, int, int, bool]
+
+
+@dataclass
+class Replay:
+    """Actions per turn plus a full room state every `keyframe_interval` turns.
+
+    `keyframes[t]` is the room at the start of turn t (nothing submitted yet); the
+    first turn is always a keyframe so the whole match can be re-simulated.
+    """
+
+    room_id: str
+    keyframe_interval: int
+    first_turn: int = 1
+    turns: List[List[ActionRecord]] = field(default_factory=list)
+    keyframes: Dict[int, dict] = field(default_factory=dict)
+    winner: Optional[str] = None
+
+    @property
+    def last_turn(self) -> int:
+        """Turn number the room is at after the last recorded resolution."""
+        return self.first_turn + len(self.turns)
+
+    def seek(self, turn: int) -> GameRoom:
+        """Room at the start of `turn`: nearest keyframe, then at most keyframe_interval - 1 turns."""
+        if not self.first_turn <= turn <= self.last_turn:
+            raise ValueError(f"turn {turn} outside replay ({self.first_turn}..{self.last_turn})")
+        start = max(t for t in self.keyframes if t <= turn)
+        room = load_room(self.keyframes[start])
+        for actions in self.turns[start - self.first_turn : turn - self.first_turn]:
+            _play(room, actions)
+        return room
+
+    def to_dict(self) -> dict:
+        return {
+            "room_id": self.room_id,
+            "keyframe_interval": self.keyframe_interval,
+            "first_turn": self.first_turn,
+            "turns": [[list(a) for a in actions] for actions in self.turns],
+            "keyframes": {str(t): k for t, k in self.keyframes.items()},
+            "winner": self.winner,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Replay":
+        return cls(
+            room_id=data["room_id"],
+            keyframe_interval=data["keyframe_interval"],
+            first_turn=data["first_turn"],
+            turns=[[tuple(a) for a in actions] for actions in data["turns"]],
+            keyframes={int(t): k for t, k in data["keyframes"].items()},
+            winner=data["winner"],
+        )
+
+
+class ReplayRecorder:
+    """Wraps a room's resolve_turn to capture a seekable Replay."""
+
+    def __init__(self, room: GameRoom, keyframe_interval: int = 4):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be >= 1")
+        if room.pending_actions:
+            raise ValueError("start recording between turns")
+        self.room = room
+        self.replay = Replay(room.room_id, keyframe_interval, first_turn=room.turn)
+        self.replay.keyframes[room.turn] = dump_room(room)
+
+    def resolve_turn(self) -> TurnResult:
+        room = self.room
+        actions = [
+            (a.player_id, a.unit_index, a.target_x, a.target_y, a.use_skill) for a in room.pending_actions.values()
+        ]
+        result = room.resolve_turn()
+        replay = self.replay
+        replay.turns.append(actions)
+        if result.winner:
+            replay.winner = result.winner
+        elif (room.turn - replay.first_turn) % replay.keyframe_interval == 0:
+            replay.keyframes[room.turn] = dump_room(room)
+        return result
+
+
+@dataclass
+class VerifyResult:
+    room_id: str
+    ok: bool
+    winner: Optional[str]
+    reason: str = ""
+
+
+def verify_replay(replay: Replay, opening: Optional[dict] = None) -> VerifyResult:
+    """Re-simulate from the first keyframe; every later keyframe and the winner must match.
+
+    The first keyframe must equal `opening` (a trusted dump_room of the start position);
+    without one, a replay starting at turn 1 is checked against a fresh default GameRoom
+    and a replay starting later is rejected.
+    """
+    first = replay.keyframes.get(replay.first_turn)
+    if first is None:
+        return VerifyResult(replay.room_id, False, None, "missing opening keyframe")
+    if opening is None and replay.first_turn == 1:
+        opening = dump_room(GameRoom(replay.room_id, *first["players"]))
+    if opening is None:
+        return VerifyResult(replay.room_id, False, None, f"no trusted opening for turn {replay.first_turn}")
+    if first != opening:
+        return VerifyResult(replay.room_id, False, None, "opening keyframe does not match the trusted opening")
+    room = load_room(first)
+    winner: Optional[str] = None
+    for actions in replay.turns:
+        if winner:
+            return VerifyResult(replay.room_id, False, winner, f"actions recorded after game ended at turn {room.turn}")
+        winner = _play(room, actions).winner
+        keyframe = replay.keyframes.get(room.turn)
+        if keyframe is not None and keyframe != dump_room(room):
+            return VerifyResult(replay.room_id, False, winner, f"keyframe mismatch at turn {room.turn}")
+    if winner != replay.winner:
+        return VerifyResult(replay.room_id, False, winner, f"recorded winner {replay.winner!r}, simulated {winner!r}")
+    return VerifyResult(replay.room_id, True, winner)
+
+
+def verify_replays(replays: Iterable[Replay], workers: Optional[int] = None, chunksize: int = 64) -> List[VerifyResult]:
+    """Verify archived replays in parallel across processes (anti-cheat audits)."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(verify_replay, replays, chunksize=chunksize))
+
+
+def _play(room: GameRoom, actions: List[ActionRecord]) -> TurnResult:
+    for pid, index, tx, ty, skill in actions:
+        room.submit_action(PlayerAction(pid, index, tx, ty, use_skill=skill))
+    return room.resolve_turn()
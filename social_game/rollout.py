@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from .ai import BotPolicy
+from .engine import GameRoom, PlayerAction
+from .wal import dump_room, load_room
+
+# (unit_index, target_x, target_y, use_skill)
+Move = Tuple[int, int, int, bool]
+# (candidate index, move, first rollout number, rollout count)
+Job = Tuple[int, Move, int, int]
+
+DIFFICULTY: Dict[str, Dict[str, float]] = {
+    "easy": {"rollouts": 4, "time_budget": 0.05},
+    "normal": {"rollouts": 16, "time_budget": 0.2},
+    "hard": {"rollouts": 64, "time_budget": 1.0},
+}
+
+
+@dataclass
+class RolloutBot:
+    """Monte Carlo bot: plays `rollouts` games per candidate move and picks the best win rate.
+
+    Rollouts use an epsilon-greedy BotPolicy for both sides. With `workers` > 0 they run
+    on a process pool, submitted as batches of up to `batch_size` rollouts that share one
+    pickled room state. Each rollout's RNG is derived from (seed, turn, candidate,
+    rollout number), so results do not depend on scheduling; a `time_budget` stops
+    submitting new batches once spent, which trades that reproducibility for latency.
+    """
+
+    player_id: str
+    rollouts: int = 16
+    time_budget: Optional[float] = None
+    workers: int = 0
+    batch_size: int = 32
+    epsilon: float = 0.2
+    seed: int = 0
+    _pool: Optional[ProcessPoolExecutor] = field(init=False, default=None, repr=False)
+
+    @classmethod
+    def for_difficulty(cls, player_id: str, level: str, **kwargs) -> "RolloutBot":
+        preset = DIFFICULTY[level]
+        return cls(player_id, rollouts=int(preset["rollouts"]), time_budget=preset["time_budget"], **kwargs)
+
+    def choose_action(self, room: GameRoom) -> PlayerAction:
+        moves = candidate_moves(room, self.player_id)
+        if not moves:
+            return PlayerAction(self.player_id, 0, 0, 0)
+        state = dump_room(room)
+        state["pending"] = []
+        wins = [0.0] * len(moves)
+        played = [0] * len(moves)
+        for cand, won, n in self._run(state, room.turn, self._jobs(moves)):
+            wins[cand] += won
+            played[cand] += n
+
+        best = max(range(len(moves)), key=lambda i: (wins[i] / played[i] if played[i] else -1.0, -i))
+        unit_index, tx, ty, use_skill = moves[best]
+        return PlayerAction(self.player_id, unit_index, tx, ty, use_skill=use_skill)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _jobs(self, moves: List[Move]) -> List[List[Job]]:
+        """Split rollouts into batches; rounds over all candidates so a time cut stays fair."""
+        batches: List[List[Job]] = []
+        current: List[Job] = []
+        size = 0
+        per_round = max(1, self.batch_size // len(moves))
+        for start in range(0, self.rollouts, per_round):
+            count = min(per_round, self.rollouts - start)
+            for cand, move in enumerate(moves):
+                current.append((cand, move, start, count))
+                size += count
+                if size >= self.batch_size:
+                    batches.append(current)
+                    current, size = [], 0
+        if current:
+            batches.append(current)
+        return batches
+
+    def _run(self, state: dict, turn: int, batches: List[List[Job]]) -> List[Tuple[int, float, int]]:
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        args = (state, self.player_id, f"{self.seed}:{turn}", self.epsilon)
+        results: List[Tuple[int, float, int]] = []
+
+        if self.workers <= 0:
+            for batch in batches:
+                if deadline is not None and results and time.perf_counter() > deadline:
+                    break
+                results.extend(run_batch(*args, batch))
+            return results
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        pending: Set[Future] = set()
+        queue = iter(batches)
+        # keep two batches per worker in flight so no worker idles between round trips
+        for batch in queue:
+            pending.add(self._pool.submit(run_batch, *args, batch))
+            if len(pending) >= 2 * self.workers:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                results.extend(fut.result())
+            if deadline is not None and time.perf_counter() > deadline:
+                continue
+            for batch in queue:
+                pending.add(self._pool.submit(run_batch, *args, batch))
+                if len(pending) >= 2 * self.workers:
+                    break
+        return results
+
+
+def candidate_moves(room: GameRoom, player_id: str) -> List[Move]:
+    """Every legal destination per unit; the skill is only spent when the move lands on an enemy."""
+    enemy_id = next(pid for pid in room.players if pid != player_id)
+    enemy_cells = {(u.x, u.y) for u in room.players[enemy_id].units}
+    moves: List[Move] = []
+    for i, unit in enumerate(room.players[player_id].units):
+        for tx, ty in room.legal_moves(player_id, i):
+            moves.append((i, tx, ty, (tx, ty) in enemy_cells and not unit.skill_used))
+    return moves
+
+
+def run_batch(state: dict, player_id: str, seed: str, epsilon: float, jobs: List[Job]) -> List[Tuple[int, float, int]]:
+    """Worker entry point: play each job's rollouts from `state`, counting wins.
+
+    Rollout k of candidate c is seeded with the string "seed:c:k", which is distinct for
+    every (seed, turn, candidate, rollout) and hashed by Random, so streams never collide.
+    """
+    out: List[Tuple[int, float, int]] = []
+    for cand, move, first, count in jobs:
+        won = 0.0
+        for k in range(first, first + count):
+            rng = random.Random(f"{seed}:{cand}:{k}")
+            if _playout(load_room(state, record_events=False), player_id, move, rng, epsilon) == player_id:
+                won += 1.0
+        out.append((cand, won, count))
+    return out
+
+
+def _playout(room: GameRoom, player_id: str, move: Move, rng: random.Random, epsilon: float) -> str:
+    """Play to the end; GameRoom always names a winner by max_turns."""
+    bots = {pid: BotPolicy(pid) for pid in room.players}
+    first = True
+    while True:
+        for pid in room.players:
+            if first and pid == player_id:
+                room.submit_action(PlayerAction(pid, move[0], move[1], move[2], use_skill=move[3]))
+            else:
+                room.submit_action(_policy_action(room, bots[pid], rng, epsilon))
+        first = False
+        winner = room.resolve_turn().winner
+        if winner:
+            return winner
+
+
+def _policy_action(room: GameRoom, bot: BotPolicy, rng: random.Random, epsilon: float) -> PlayerAction:
+    units = room.players[bot.player_id].units
+    if units and rng.random() < epsilon:
+        i = rng.randrange(len(units))
+        tx, ty = rng.choice(room.legal_moves(bot.player_id, i))
+        return PlayerAction(bot.player_id, i, tx, ty, use_skill=rng.random() < 0.5)
+    return bot.choose_action(room)
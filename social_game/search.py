@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .compact import ALIVE, HP, SCORE, SKILL, STRIDE, UNIT_BASE, X, Y, CompactRoom
+from .engine import GameRoom, PlayerAction
+
+# (unit_index, target_x, target_y, use_skill)
+Move = Tuple[int, int, int, bool]
+
+WIN_SCORE = 10_000
+
+
+class _Timeout(Exception):
+    pass
+
+
+class TranspositionTable:
+    """Fixed-size, index-addressed table; deeper results replace shallower ones in the same slot."""
+
+    def __init__(self, bits: int = 16):
+        self.mask = (1 << bits) - 1
+        self._keys: List[int] = [0] * (1 << bits)
+        self._entries: List[Optional[Tuple[int, float, Optional[Move]]]] = [None] * (1 << bits)
+
+    def get(self, key: int) -> Optional[Tuple[int, float, Optional[Move]]]:
+        i = key & self.mask
+        return self._entries[i] if self._keys[i] == key else None
+
+    def put(self, key: int, depth: int, value: float, move: Optional[Move]) -> None:
+        i = key & self.mask
+        old = self._entries[i]
+        if old is None or self._keys[i] != key or old[0] <= depth:
+            self._keys[i] = key
+            self._entries[i] = (depth, value, move)
+
+
+@dataclass
+class SearchBot:
+    """Lookahead bot for simultaneous turns.
+
+    Each ply is a matrix game between both players' candidate moves, valued by its
+    pure maximin (our best move against the opponent's best reply). Iterative deepening
+    runs until `time_budget` seconds of `clock` are spent, and the best move from the deepest
+    finished ply (or the current ply once its first move is scored) is returned;
+    `completed_depth` records that ply. Actions are modelled as resolving in room player
+    order, like a simultaneous submit.
+    """
+
+    player_id: str
+    time_budget: float = 0.05
+    max_depth: int = 4
+    max_candidates: int = 8
+    table_bits: int = 16
+    seed: int = 0
+    clock: Callable[[], float] = time.perf_counter
+    completed_depth: int = field(init=False, default=0)
+    table: TranspositionTable = field(init=False)
+    _zobrist: Dict[Tuple[int, int], int] = field(init=False, default_factory=dict)
+    _rng: random.Random = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.table = TranspositionTable(self.table_bits)
+        self._rng = random.Random(self.seed)
+
+    def choose_action(self, room: GameRoom | CompactRoom) -> PlayerAction:
+        state = room.clone() if isinstance(room, CompactRoom) else CompactRoom.from_room(room)
+        state.pending_actions.clear()
+        me = state.player_ids.index(self.player_id)
+        deadline = self.clock() + self.time_budget
+
+        best: Move = self._candidates(state, me, None)[0]
+        self.completed_depth = 0
+        for depth in range(1, self.max_depth + 1):
+            move, complete = self._search_root(state, me, depth, deadline, best)
+            if move is not None:
+                best = move
+            if not complete:
+                break
+            self.completed_depth = depth
+
+        unit_index, tx, ty, use_skill = best
+        return PlayerAction(self.player_id, unit_index, tx, ty, use_skill=use_skill)
+
+    def _search_root(
+        self, state: CompactRoom, me: int, depth: int, deadline: float, previous: Optional[Move]
+    ) -> Tuple[Optional[Move], bool]:
+        ours = self._candidates(state, me, previous)
+        theirs = self._candidates(state, 1 - me, None)
+        best_move: Optional[Move] = None
+        best_value = float("-inf")
+        try:
+            for move in ours:
+                value = self._min_reply(state, me, move, theirs, depth, best_value, deadline)
+                if value > best_value:
+                    best_value, best_move = value, move
+        except _Timeout:
+            return best_move, False
+        self.table.put(self._hash(state), depth, best_value, best_move)
+        return best_move, True
+
+    def _value(self, state: CompactRoom, me: int, depth: int, deadline: float) -> float:
+        key = self._hash(state)
+        hit = self.table.get(key)
+        if hit is not None and hit[0] >= depth:
+            return hit[1]
+        if depth == 0:
+            return self._evaluate(state, me)
+
+        ours = self._candidates(state, me, hit[2] if hit else None)
+        theirs = self._candidates(state, 1 - me, None)
+        best_move: Optional[Move] = None
+        best_value = float("-inf")
+        for move in ours:
+            value = self._min_reply(state, me, move, theirs, depth, best_value, deadline)
+            if value > best_value:
+                best_value, best_move = value, move
+        self.table.put(key, depth, best_value, best_move)
+        return best_value
+
+    def _min_reply(
+        self, state: CompactRoom, me: int, move: Move, replies: List[Move], depth: int, alpha: float, deadline: float
+    ) -> float:
+        worst = float("inf")
+        for reply in replies:
+            if self.clock() > deadline:
+                raise _Timeout
+            winner = state.apply(self._actions(state, me, move, reply))
+            try:
+                if winner is not None:
+                    value = WIN_SCORE if winner == self.player_id else -WIN_SCORE
+                else:
+                    value = self._value(state, me, depth - 1, deadline)
+            finally:
+                state.undo()
+            if value < worst:
+                worst = value
+                if worst <= alpha:
+                    break
+        return worst
+
+    def _actions(self, state: CompactRoom, me: int, move: Move, reply: Move) -> List[PlayerAction]:
+        pids = state.player_ids
+        ours = PlayerAction(pids[me], move[0], move[1], move[2], use_skill=move[3])
+        theirs = PlayerAction(pids[1 - me], reply[0], reply[1], reply[2], use_skill=reply[3])
+        return [ours, theirs] if me == 0 else [theirs, ours]
+
+    def _candidates(self, state: CompactRoom, player: int, first: Optional[Move]) -> List[Move]:
+        """Moves ordered by the greedy BotPolicy score, capped at max_candidates."""
+        s = state._state
+        enemies = [
+            (s[UNIT_BASE + e * STRIDE + X], s[UNIT_BASE + e * STRIDE + Y])
+            for e in range(len(state._owner))
+            if state._owner[e] != player and s[UNIT_BASE + e * STRIDE + ALIVE]
+        ]
+        points = state.control_points
+        scored: List[Tuple[int, Move]] = []
+        for i, slot in enumerate(state._slots_of(player)):
+            base = UNIT_BASE + slot * STRIDE
+            has_skill = not s[base + SKILL]
+            for tx, ty in state.moves.reachable(s[base + X], s[base + Y], state._move_range[slot]):
+                score = 6 if (tx, ty) in points else 0
+                hits = False
+                for ex, ey in enemies:
+                    if ex == tx and ey == ty:
+                        score += 7
+                        hits = True
+                    score += max(0, 3 - abs(ex - tx) - abs(ey - ty))
+                scored.append((score, (i, tx, ty, hits and has_skill)))
+        if not scored:
+            return [(0, 0, 0, False)]
+        scored.sort(key=lambda item: -item[0])
+        moves = [m for _, m in scored[: self.max_candidates]]
+        if first is not None and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def _evaluate(self, state: CompactRoom, me: int) -> float:
+        s = state._state
+        value = 10.0 * (s[SCORE + me] - s[SCORE + 1 - me])
+        for slot in range(len(state._owner)):
+            base = UNIT_BASE + slot * STRIDE
+            if s[base + ALIVE] and s[base + HP] > 0:
+                value += s[base + HP] if state._owner[slot] == me else -s[base + HP]
+        return value
+
+    def _hash(self, state: CompactRoom) -> int:
+        key = 0
+        zobrist = self._zobrist
+        for offset, v in enumerate(state._state):
+            code = zobrist.get((offset, v))
+            if code is None:
+                code = zobrist[(offset, v)] = self._rng.getrandbits(64)
+            key ^= code
+        return key
@@ -3,6 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict, List
 
+from .engine import GameRoom
+from .replay import Replay
+
 
 @dataclass
 class Guild:
@@ -17,6 +20,7 @@ class SocialHub:
         self.friends: Dict[str, set[str]] = {}
         self.guilds: Dict[str, Guild] = {}
         self.replays: Dict[str, List[str]] = {}
+        self.match_replays: Dict[str, Replay] = {}
 
     def add_friend(self, user_id: str, other_id: str) -> None:
         self.friends.setdefault(user_id, set()).add(other_id)
@@ -34,3 +38,9 @@ class SocialHub:
 
     def save_replay_event(self, room_id: str, event: str) -> None:
         self.replays.setdefault(room_id, []).append(event)
+
+    def save_replay(self, replay: Replay) -> None:
+        self.match_replays[replay.room_id] = replay
+
+    def seek_replay(self, room_id: str, turn: int) -> GameRoom:
+        return self.match_replays[room_id].seek(turn)
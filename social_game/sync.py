@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import struct
+from typing import Dict, List, Tuple
+
+from .engine import UNIT_KINDS
+
+# little-endian, fixed-width records; strings are length-prefixed utf-8.
+# Limits: unit id, type, attack, x, y, every count and string length 0..255; hp -32768..32767;
+# turn and score 0..65535. Encoding anything outside them raises ValueError.
+_SNAPSHOT = b"S"
+_DELTA = b"D"
+_HEADER = struct.Struct("<cHH")  # kind, turn, since (0 for full snapshots)
+_PLAYER = struct.Struct("<HB")  # score, unit count
+_UNIT = struct.Struct("<BBhBBBB")  # id, type, hp, atk, x, y, skill_used
+_UNIT_DELTA = struct.Struct("<BhBBB")  # id, hp, x, y, skill_used
+_CELL = struct.Struct("<BB")
+_SCORE = struct.Struct("<H")
+
+
+def apply_delta(snapshot: dict, delta: dict) -> dict:
+    """Rebuild the current snapshot from an older one plus snapshot_delta(snapshot["turn"])."""
+    if delta["since"] > snapshot["turn"]:
+        raise ValueError("delta starts after snapshot")
+    changed = {u["id"]: u for u in delta["units"]}
+    removed = set(delta["removed"])
+    players: Dict[str, List[dict]] = {}
+    for pid, units in snapshot["players"].items():
+        players[pid] = [
+            {**u, **changed[u["id"]]} if u["id"] in changed else u
+            for u in units
+            if u["id"] not in removed
+        ]
+    return {
+        **snapshot,
+        "turn": delta["turn"],
+        "score": dict(delta["score"]),
+        "players": players,
+    }
+
+
+def encode_snapshot(snapshot: dict) -> bytes:
+    out = bytearray(_pack(_HEADER, "header", _SNAPSHOT, snapshot["turn"], 0))
+    _put_str(out, snapshot["room_id"])
+    _put_count(out, len(snapshot["control_points"]), "control points")
+    for x, y in snapshot["control_points"]:
+        out += _pack(_CELL, "control point", x, y)
+    _put_count(out, len(snapshot["players"]), "players")
+    for pid, units in snapshot["players"].items():
+        _put_str(out, pid)
+        out += _pack(_PLAYER, f"player {pid!r}", snapshot["score"][pid], len(units))
+        for u in units:
+            kind = next(i for i, k in enumerate(UNIT_KINDS) if k.value == u["type"])
+            out += _pack(_UNIT, f"unit {u['id']}", u["id"], kind, u["hp"], u["atk"], *u["pos"], u["skill_used"])
+    return bytes(out)
+
+
+def decode_snapshot(raw: bytes) -> dict:
+    kind, turn, _ = _HEADER.unpack_from(raw, 0)
+    if kind != _SNAPSHOT:
+        raise ValueError("not a snapshot")
+    room_id, off = _get_str(raw, _HEADER.size)
+    control_points: List[Tuple[int, int]] = []
+    n_points = raw[off]
+    off += 1
+    for _ in range(n_points):
+        control_points.append(_CELL.unpack_from(raw, off))
+        off += _CELL.size
+    score: Dict[str, int] = {}
+    players: Dict[str, List[dict]] = {}
+    n_players = raw[off]
+    off += 1
+    for _ in range(n_players):
+        pid, off = _get_str(raw, off)
+        score[pid], n_units = _PLAYER.unpack_from(raw, off)
+        off += _PLAYER.size
+        units = []
+        for _ in range(n_units):
+            uid, k, hp, atk, x, y, skill = _UNIT.unpack_from(raw, off)
+            off += _UNIT.size
+            units.append(
+                {"id": uid, "type": UNIT_KINDS[k].value, "hp": hp, "atk": atk, "pos": [x, y], "skill_used": bool(skill)}
+            )
+        players[pid] = units
+    return {
+        "room_id": room_id,
+        "turn": turn,
+        "score": score,
+        "control_points": control_points,
+        "players": players,
+    }
+
+
+def encode_delta(delta: dict) -> bytes:
+    out = bytearray(_pack(_HEADER, "header", _DELTA, delta["turn"], delta["since"]))
+    _put_str(out, delta["room_id"])
+    _put_count(out, len(delta["score"]), "players")
+    for pid, points in delta["score"].items():
+        _put_str(out, pid)
+        out += _pack(_SCORE, f"score of {pid!r}", points)
+    _put_count(out, len(delta["units"]), "changed units")
+    for u in delta["units"]:
+        out += _pack(_UNIT_DELTA, f"unit {u['id']}", u["id"], u["hp"], *u["pos"], u["skill_used"])
+    _put_count(out, len(delta["removed"]), "removed units")
+    for uid in delta["removed"]:
+        _put_count(out, uid, "removed unit id")
+    return bytes(out)
+
+
+def decode_delta(raw: bytes) -> dict:
+    kind, turn, since = _HEADER.unpack_from(raw, 0)
+    if kind != _DELTA:
+        raise ValueError("not a delta")
+    room_id, off = _get_str(raw, _HEADER.size)
+    score: Dict[str, int] = {}
+    n_players = raw[off]
+    off += 1
+    for _ in range(n_players):
+        pid, off = _get_str(raw, off)
+        (score[pid],) = _SCORE.unpack_from(raw, off)
+        off += _SCORE.size
+    units = []
+    n_units = raw[off]
+    off += 1
+    for _ in range(n_units):
+        uid, hp, x, y, skill = _UNIT_DELTA.unpack_from(raw, off)
+        off += _UNIT_DELTA.size
+        units.append({"id": uid, "hp": hp, "pos": [x, y], "skill_used": bool(skill)})
+    n_removed = raw[off]
+    removed = list(raw[off + 1 : off + 1 + n_removed])
+    return {"room_id": room_id, "turn": turn, "since": since, "score": score, "units": units, "removed": removed}
+
+
+def _pack(record: struct.Struct, what: str, *values) -> bytes:
+    try:
+        return record.pack(*values)
+    except struct.error as err:
+        raise ValueError(f"{what} does not fit the wire format: {err}") from None
+
+
+def _put_count(out: bytearray, n: int, what: str) -> None:
+    if not 0 <= n <= 255:
+        raise ValueError(f"{what}: {n} does not fit in one byte")
+    out.append(n)
+
+
+def _put_str(out: bytearray, value: str) -> None:
+    data = value.encode("utf-8")
+    _put_count(out, len(data), f"length of string {value[:16]!r}")
+    out += data
+
+
+def _get_str(raw: bytes, off: int) -> Tuple[str, int]:
+    n = raw[off]
+    return raw[off + 1 : off + 1 + n].decode("utf-8"), off + 1 + n
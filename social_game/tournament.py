@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import csv
+import itertools
+import math
+import os
+import random
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .ai import BotPolicy
+from .engine import GameRoom, PlayerAction, Unit, UnitType
+from .rollout import RolloutBot
+from .search import SearchBot
+
+FIELDS = ["game_id", "policy_a", "policy_b", "layout", "seed", "winner", "turns", "score_a", "score_b", "units"]
+
+
+class RandomPolicy:
+    def __init__(self, player_id: str, rng: random.Random):
+        self.player_id = player_id
+        self.rng = rng
+
+    def choose_action(self, room: GameRoom) -> PlayerAction:
+        units = room.players[self.player_id].units
+        if not units:
+            return PlayerAction(self.player_id, 0, 0, 0)
+        i = self.rng.randrange(len(units))
+        tx, ty = self.rng.choice(room.legal_moves(self.player_id, i))
+        return PlayerAction(self.player_id, i, tx, ty, use_skill=self.rng.random() < 0.5)
+
+
+def make_policy(name: str, player_id: str, rng: random.Random):
+    if name == "greedy":
+        return BotPolicy(player_id)
+    if name == "random":
+        return RandomPolicy(player_id, rng)
+    if name == "search":
+        # depth-capped rather than time-capped so results do not depend on machine load
+        return SearchBot(player_id, time_budget=10.0, max_depth=2, seed=rng.randrange(1 << 30))
+    if name == "rollout":
+        return RolloutBot(player_id, rollouts=4, seed=rng.randrange(1 << 30))
+    raise ValueError(f"unknown policy {name!r}")
+
+
+POLICIES = ("greedy", "random", "search", "rollout")
+LAYOUTS = ("standard", "flipped", "random")
+
+
+def make_room(game_id: int, layout: str, rng: random.Random) -> GameRoom:
+    room = GameRoom(f"t{game_id}", "a", "b", record_events=False)
+    if layout == "standard":
+        return room
+    units = [u for state in room.players.values() for u in state.units]
+    if layout == "flipped":
+        for u in units:
+            u.x, u.y = room.width - 1 - u.x, room.height - 1 - u.y
+    elif layout == "random":
+        cells = rng.sample([(x, y) for x in range(room.width) for y in range(room.height)], len(units))
+        for u, (x, y) in zip(units, cells):
+            u.x, u.y = x, y
+    else:
+        raise ValueError(f"unknown layout {layout!r}")
+    room.rebuild_occupancy()
+    return room
+
+
+@dataclass
+class GameSpec:
+    game_id: int
+    policy_a: str
+    policy_b: str
+    layout: str
+    seed: int
+
+
+def play_game(spec: GameSpec) -> dict:
+    """Play one headless game; returns a results row (see FIELDS)."""
+    rng = random.Random(spec.seed)
+    room = make_room(spec.game_id, spec.layout, rng)
+    bots = [make_policy(spec.policy_a, "a", rng), make_policy(spec.policy_b, "b", rng)]
+    while True:
+        for bot in bots:
+            room.submit_action(bot.choose_action(room))
+        result = room.resolve_turn()
+        if result.winner:
+            break
+    return {
+        "game_id": spec.game_id,
+        "policy_a": spec.policy_a,
+        "policy_b": spec.policy_b,
+        "layout": spec.layout,
+        "seed": spec.seed,
+        "winner": result.winner,
+        "turns": room.turn - 1,
+        "score_a": room.score["a"],
+        "score_b": room.score["b"],
+        "units": _unit_stats(room),
+    }
+
+
+def _unit_stats(room: GameRoom) -> str:
+    """uid:type:hp:skill per unit; dead units report hp 0."""
+    alive: Dict[int, Unit] = {u.uid: u for state in room.players.values() for u in state.units}
+    removed = {uid for _, uid in room.removed_units}
+    stats = []
+    for uid in sorted(alive.keys() | removed):
+        u = alive.get(uid)
+        if u is None:
+            stats.append(f"{uid}:-:0:-")
+        else:
+            stats.append(f"{uid}:{'s' if u.unit_type == UnitType.SCOUT else 'b'}:{u.hp}:{int(u.skill_used)}")
+    return ";".join(stats)
+
+
+def schedule(games: int, policies: Sequence[str], layouts: Sequence[str], seed: int) -> Iterator[GameSpec]:
+    """Round-robin over ordered policy pairs and layouts (both seats for every pairing)."""
+    pairings = list(itertools.product(policies, policies, layouts))
+    for game_id in range(games):
+        policy_a, policy_b, layout = pairings[game_id % len(pairings)]
+        yield GameSpec(game_id, policy_a, policy_b, layout, seed * 1_000_003 + game_id)
+
+
+def play_games(specs: List[GameSpec]) -> List[dict]:
+    return [play_game(spec) for spec in specs]
+
+
+def iter_results(specs: Iterable[GameSpec], workers: int = 1, chunksize: int = 16) -> Iterator[dict]:
+    """Play games in order-preserving batches; at most 2 batches per worker are in flight,
+    so memory stays flat however long the schedule is."""
+    if workers <= 1:
+        yield from map(play_game, specs)
+        return
+    it = iter(specs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window: Deque[Future] = deque()
+        while True:
+            batch = list(itertools.islice(it, chunksize))
+            if batch:
+                window.append(pool.submit(play_games, batch))
+            if window and (not batch or len(window) >= 2 * workers):
+                yield from window.popleft().result()
+            if not batch and not window:
+                return
+
+
+def run_tournament(
+    specs: Iterable[GameSpec],
+    out_path: str,
+    workers: Optional[int] = None,
+    chunksize: int = 16,
+) -> Tuple[int, float]:
+    """Stream results to a CSV file as games finish. Returns (games, seconds)."""
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    count = 0
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in iter_results(specs, workers, chunksize):
+            writer.writerow(row)
+            count += 1
+    return count, time.perf_counter() - start
+
+
+def measure_scaling(
+    games: int, policies: Sequence[str], layouts: Sequence[str], seed: int, max_workers: int
+) -> List[Tuple[int, float]]:
+    """Games/s for 1, 2, 4, ... workers on the same schedule."""
+    out: List[Tuple[int, float]] = []
+    workers = 1
+    with tempfile.TemporaryDirectory() as tmp:
+        while workers <= max_workers:
+            n, seconds = run_tournament(
+                schedule(games, policies, layouts, seed), os.path.join(tmp, "scaling.csv"), workers
+            )
+            out.append((workers, n / seconds))
+            workers *= 2
+    return out
+
+
+@dataclass
+class WinRate:
+    policy: str
+    opponent: str
+    games: int
+    wins: int
+
+    @property
+    def rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    def interval(self, z: float = 1.96) -> Tuple[float, float]:
+        """Wilson score interval."""
+        if not self.games:
+            return 0.0, 1.0
+        n, p = self.games, self.rate
+        denom = 1 + z * z / n
+        centre = (p + z * z / (2 * n)) / denom
+        margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+        return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def aggregate(path: str) -> List[WinRate]:
+    """Win rate of each policy against each opponent, from both seats, reading rows lazily.
+
+    A mirror game (same policy in both seats) counts once, as a win when seat a won, so
+    the policy-vs-itself row measures seat advantage without doubling n.
+    """
+    table: Dict[Tuple[str, str], List[int]] = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            seats = [("a", row["policy_a"], row["policy_b"]), ("b", row["policy_b"], row["policy_a"])]
+            if row["policy_a"] == row["policy_b"]:
+                del seats[1]
+            for seat, policy, opponent in seats:
+                cell = table.setdefault((policy, opponent), [0, 0])
+                cell[0] += 1
+                cell[1] += row["winner"] == seat
+    return [WinRate(p, o, games, wins) for (p, o), (games, wins) in sorted(table.items())]
+
+
+def format_report(rates: Sequence[WinRate], games: int, seconds: float, workers: int) -> str:
+    lines = [f"games={games} time={seconds:.2f}s {games / seconds:,.1f} games/s ({games / seconds / workers:,.1f}/core)"]
+    for r in rates:
+        lo, hi = r.interval()
+        lines.append(f"  {r.policy:>8} vs {r.opponent:<8} {r.rate:6.1%}  95% CI [{lo:.1%}, {hi:.1%}]  n={r.games}")
+    return "\n".join(lines)
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .engine import UNIT_KINDS, GameRoom, PlayerAction, PlayerState, Unit
+
+# record frame: payload length, crc32(payload), then compact JSON payload
+_FRAME = struct.Struct("<II")
+
+OPEN = "O"
+ACTION = "A"
+RESOLVE = "R"
+CLOSE = "C"
+
+
+def dump_room(room: GameRoom) -> dict:
+    """Everything needed to rebuild a room exactly (the event log is not kept)."""
+    return {
+        "room_id": room.room_id,
+        "players": list(room.players),
+        "width": room.width,
+        "height": room.height,
+        "control_points": [list(p) for p in room.control_points],
+        "turn": room.turn,
+        "score": dict(room.score),
+        "removed": [list(r) for r in room.removed_units],
+        "pending": [
+            [a.player_id, a.unit_index, a.target_x, a.target_y, a.use_skill] for a in room.pending_actions.values()
+        ],
+        "units": {
+            pid: [
+                [UNIT_KINDS.index(u.unit_type), u.hp, u.attack, u.move_range, u.x, u.y, u.skill_used, u.uid, u.changed_turn]
+                for u in state.units
+            ]
+            for pid, state in room.players.items()
+        },
+    }
+
+
+def load_room(data: dict, record_events: bool = True) -> GameRoom:
+    player_a, player_b = data["players"]
+    room = GameRoom(
+        data["room_id"],
+        player_a,
+        player_b,
+        width=data["width"],
+        height=data["height"],
+        control_points=[tuple(p) for p in data["control_points"]],
+        record_events=record_events,
+    )
+    room.turn = data["turn"]
+    room.score = dict(data["score"])
+    room.removed_units = [tuple(r) for r in data["removed"]]
+    for pid, units in data["units"].items():
+        room.players[pid] = PlayerState(
+            player_id=pid,
+            units=[
+                Unit(pid, UNIT_KINDS[k], hp, atk, move, x, y, skill, uid, changed)
+                for k, hp, atk, move, x, y, skill, uid, changed in units
+            ],
+        )
+    room.rebuild_occupancy()
+    for pid, index, tx, ty, skill in data["pending"]:
+        room.submit_action(PlayerAction(pid, index, tx, ty, use_skill=skill))
+    return room
+
+
+class WriteAheadLog:
+    """Append-only log of room opens, submitted actions, turn resolutions and room closes.
+
+    Appends only buffer; a background thread writes and fsyncs the buffer every
+    `commit_interval` seconds (group commit), so thousands of rooms share one fsync.
+    Callers that must not acknowledge before the record is durable use wait_durable(),
+    or await durable() on an event loop, which holds no thread while it waits.
+    checkpoint() writes a compacted snapshot of all rooms and drops older segments.
+    """
+
+    def __init__(self, directory: str | Path, commit_interval: float = 0.005):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.commit_interval = commit_interval
+        self.segment = max(_segments(self.directory), default=0) + 1
+        self._file = open(self._segment_path(self.segment), "ab")
+        self._buffer = bytearray()
+        self._lsn = 0
+        self._durable_lsn = 0
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        # (lsn, tiebreak, loop, future) for durable(), resolved by whichever thread commits
+        self._async_waiters: List[Tuple[int, int, asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._waiter_seq = itertools.count()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_loop, name="wal-flush", daemon=True)
+        self._flusher.start()
+
+    @property
+    def last_lsn(self) -> int:
+        return self._lsn
+
+    def log_open(self, room: GameRoom) -> int:
+        return self.append([OPEN, room.room_id, *room.players])
+
+    def log_action(self, room_id: str, action: PlayerAction) -> int:
+        return self.append(
+            [ACTION, room_id, action.player_id, action.unit_index, action.target_x, action.target_y, action.use_skill]
+        )
+
+    def log_resolve(self, room_id: str, turn: int) -> int:
+        return self.append([RESOLVE, room_id, turn])
+
+    def log_close(self, room_id: str) -> int:
+        """The room's game is decided; recovery drops it."""
+        return self.append([CLOSE, room_id])
+
+    def append(self, record: list) -> int:
+        payload = json.dumps(record, separators=(",", ":")).encode("utf-8")
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("log is closed")
+            self._buffer += _FRAME.pack(len(payload), zlib.crc32(payload))
+            self._buffer += payload
+            self._lsn += 1
+            return self._lsn
+
+    def wait_durable(self, lsn: int) -> None:
+        with self._cond:
+            while self._durable_lsn < lsn:
+                self._cond.wait()
+
+    def durable(self, lsn: int) -> "asyncio.Future[None]":
+        """A future on the running loop that completes once `lsn` is on disk."""
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        with self._cond:
+            if self._durable_lsn >= lsn:
+                fut.set_result(None)
+            else:
+                heapq.heappush(self._async_waiters, (lsn, next(self._waiter_seq), loop, fut))
+        return fut
+
+    def sync(self) -> None:
+        """Commit everything appended so far without waiting for the flusher."""
+        self._commit()
+
+    def checkpoint(self, rooms: Iterable[GameRoom]) -> Path:
+        """Snapshot `rooms` and start a new segment; the caller must not mutate rooms meanwhile
+        (RoomHost.checkpoint pauses its rooms for this)."""
+        with self._io_lock:
+            self._commit_unlocked()
+            self._file.close()
+            self.segment += 1
+            self._file = open(self._segment_path(self.segment), "ab")
+
+        path = self.directory / f"checkpoint-{self.segment:08d}.json"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"segment": self.segment, "rooms": [dump_room(r) for r in rooms]}, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(self.directory)
+
+        for old in self.directory.glob("checkpoint-*.json"):
+            if old != path:
+                old.unlink()
+        for seq in _segments(self.directory):
+            if seq < self.segment:
+                self._segment_path(seq).unlink()
+        return path
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join()
+        self._commit()
+        self._file.close()
+
+    def _segment_path(self, seq: int) -> Path:
+        return self.directory / f"wal-{seq:08d}.log"
+
+    def _commit(self) -> None:
+        with self._io_lock:
+            self._commit_unlocked()
+
+    def _commit_unlocked(self) -> None:
+        # swap the buffer under the condition, write and fsync outside it so appends never wait on disk
+        with self._cond:
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            lsn = self._lsn
+        if data:
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        ready = []
+        with self._cond:
+            self._durable_lsn = max(self._durable_lsn, lsn)
+            self._cond.notify_all()
+            waiters = self._async_waiters
+            while waiters and waiters[0][0] <= self._durable_lsn:
+                ready.append(heapq.heappop(waiters))
+        for _, _, loop, fut in ready:
+            try:
+                loop.call_soon_threadsafe(_set_durable, fut)
+            except RuntimeError:  # the waiter's loop is already closed
+                pass
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait(self.commit_interval)
+                if self._closed:
+                    return
+            self._commit()
+
+
+def _set_durable(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+def read_records(path: Path) -> Iterator[list]:
+    """Yield records up to the first torn or corrupt frame (a crash mid-write)."""
+    data = path.read_bytes()
+    off = 0
+    while off + _FRAME.size <= len(data):
+        length, crc = _FRAME.unpack_from(data, off)
+        payload = data[off + _FRAME.size : off + _FRAME.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return
+        yield json.loads(payload)
+        off += _FRAME.size + length
+
+
+def recover(directory: str | Path) -> Dict[str, GameRoom]:
+    """Rebuild every room from the latest checkpoint plus the log segments after it."""
+    directory = Path(directory)
+    rooms: Dict[str, GameRoom] = {}
+    start = 0
+    checkpoints = sorted(directory.glob("checkpoint-*.json"))
+    if checkpoints:
+        with open(checkpoints[-1], encoding="utf-8") as f:
+            data = json.load(f)
+        start = data["segment"]
+        for room_data in data["rooms"]:
+            room = load_room(room_data)
+            rooms[room.room_id] = room
+
+    for seq in _segments(directory):
+        if seq < start:
+            continue
+        for record in read_records(directory / f"wal-{seq:08d}.log"):
+            _replay(rooms, record)
+    return rooms
+
+
+def _replay(rooms: Dict[str, GameRoom], record: list) -> None:
+    kind, room_id = record[0], record[1]
+    if kind == OPEN:
+        rooms[room_id] = GameRoom(room_id, record[2], record[3])
+    elif kind == ACTION:
+        pid, index, tx, ty, skill = record[2:]
+        rooms[room_id].submit_action(PlayerAction(pid, index, tx, ty, use_skill=skill))
+    elif kind == RESOLVE:
+        room = rooms[room_id]
+        if room.turn != record[2]:
+            raise ValueError(f"room {room_id}: log resolves turn {record[2]} but room is at {room.turn}")
+        room.resolve_turn()
+    elif kind == CLOSE:
+        del rooms[room_id]
+    else:
+        raise ValueError(f"unknown record kind {kind!r}")
+
+
+def _segments(directory: Path) -> List[int]:
+    return sorted(int(p.stem.split("-")[1]) for p in directory.glob("wal-*.log"))
+
+
+def _fsync_dir(directory: Path) -> None:
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 
 Position = Tuple[int, int]
@@ -46,27 +46,117 @@ class GameState:
     winner: Optional[str] = None
     units: Dict[str, Unit] = field(default_factory=dict)
     turn_log: List[str] = field(default_factory=list)
+    # indexes over `units`, built by reindex(); keep them current by changing units
+    # through move_unit/set_hp, or call reindex() after editing units directly
+    turn_order: List[str] = field(default_factory=list, init=False, compare=False)
+    _by_pos: Dict[Position, Unit] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _alive: Dict[str, Dict[str, Unit]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _roster: Dict[str, List[Unit]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _cooling: Dict[str, Dict[str, Unit]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _order_index: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _indexed: bool = field(default=False, init=False, repr=False, compare=False)
+
+    def reindex(self) -> None:
+        self.turn_order = sorted({u.player_id for u in self.units.values()})
+        self._order_index = {pid: i for i, pid in enumerate(self.turn_order)}
+        self._alive = {pid: {} for pid in self.turn_order}
+        self._roster = {pid: [] for pid in self.turn_order}
+        self._cooling = {pid: {} for pid in self.turn_order}
+        self._by_pos = {}
+        for unit in self.units.values():
+            self._roster[unit.player_id].append(unit)
+            if unit.alive:
+                self._by_pos.setdefault(unit.position, unit)
+                self._alive[unit.player_id][unit.unit_id] = unit
+                if unit.cooldown > 0:
+                    self._cooling[unit.player_id][unit.unit_id] = unit
+        self._indexed = True
 
     def unit_at(self, pos: Position) -> Optional[Unit]:
-        for unit in self.units.values():
-            if unit.alive and unit.position == pos:
-                return unit
-        return None
+        if not self._indexed:
+            self.reindex()
+        return self._by_pos.get(pos)
 
     def enemy_units(self, player_id: str) -> List[Unit]:
-        return [u for u in self.units.values() if u.player_id != player_id and u.alive]
+        if not self._indexed:
+            self.reindex()
+        return [u for pid, units in self._alive.items() if pid != player_id for u in units.values()]
 
     def friend_units(self, player_id: str) -> List[Unit]:
-        return [u for u in self.units.values() if u.player_id == player_id and u.alive]
+        if not self._indexed:
+            self.reindex()
+        return list(self._alive.get(player_id, {}).values())
+
+    def alive_players(self) -> List[str]:
+        return [pid for pid, units in self._alive.items() if units]
+
+    def next_player(self, player_id: str) -> str:
+        return self.turn_order[(self._order_index[player_id] + 1) % len(self.turn_order)]
+
+    def move_unit(self, unit: Unit, target: Position) -> None:
+        if self._by_pos.get(unit.position) is unit:
+            del self._by_pos[unit.position]
+        unit.position = target
+        if unit.alive:
+            self._by_pos.setdefault(target, unit)
+
+    def set_hp(self, unit: Unit, hp: int) -> None:
+        was_alive = unit.alive
+        unit.hp = hp
+        if was_alive and not unit.alive:
+            if self._by_pos.get(unit.position) is unit:
+                del self._by_pos[unit.position]
+            self._alive[unit.player_id].pop(unit.unit_id, None)
+            self._cooling[unit.player_id].pop(unit.unit_id, None)
+        elif unit.alive and not was_alive:
+            self._by_pos.setdefault(unit.position, unit)
+            # rebuild rather than append so friend_units keeps its order across unmake
+            self._alive[unit.player_id] = {u.unit_id: u for u in self._roster[unit.player_id] if u.alive}
+            if unit.cooldown > 0:
+                self._cooling[unit.player_id][unit.unit_id] = unit
+
+    def set_cooldown(self, unit: Unit, cooldown: int) -> None:
+        unit.cooldown = cooldown
+        cooling = self._cooling[unit.player_id]
+        if cooldown > 0 and unit.alive:
+            cooling[unit.unit_id] = unit
+        else:
+            cooling.pop(unit.unit_id, None)
+
+    def tick_cooldowns(self, player_id: str) -> List[Unit]:
+        """Count down the player's alive units on cooldown; returns the units ticked."""
+        cooling = self._cooling[player_id]
+        ticked = list(cooling.values())
+        for unit in ticked:
+            unit.cooldown -= 1
+            if unit.cooldown <= 0:
+                del cooling[unit.unit_id]
+        return ticked
 
 
 class RuleError(ValueError):
     pass
 
 
+class UndoToken(NamedTuple):
+    """Everything make() changed, for unmake()."""
+
+    unit: Unit
+    position: Position
+    cooldown: int
+    enemy: Optional[Unit]
+    enemy_hp: int
+    ticked: List[Unit]
+    turn: int
+    current_player: str
+    winner: Optional[str]
+    log_length: int
+
+
 class BoardGameEngine:
     def __init__(self, state: GameState):
         self.state = state
+        state.reindex()
 
     def _in_bounds(self, pos: Position) -> bool:
         x, y = pos
@@ -76,77 +166,137 @@ class BoardGameEngine:
         return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
     def submit_action(self, player_id: str, action: Action) -> None:
-        if self.state.winner:
-            raise RuleError("game is over")
-        if player_id != self.state.current_player:
-            raise RuleError("not your turn")
-        if action.unit_id not in self.state.units:
-            raise RuleError("unknown unit")
-
-        unit = self.state.units[action.unit_id]
+        error = self.validate(player_id, action)
+        if error:
+            raise RuleError(error)
+        self.make(action, log=True)
+
+    def validate(self, player_id: str, action: Action) -> Optional[str]:
+        """Why `action` is illegal for `player_id`, or None if it is legal. Never raises."""
+        state = self.state
+        if state.winner:
+            return "game is over"
+        if player_id != state.current_player:
+            return "not your turn"
+        unit = state.units.get(action.unit_id)
+        if unit is None:
+            return "unknown unit"
         if unit.player_id != player_id:
-            raise RuleError("cannot control enemy unit")
+            return "cannot control enemy unit"
         if not unit.alive:
-            raise RuleError("unit is dead")
+            return "unit is dead"
         if not self._in_bounds(action.target):
-            raise RuleError("target out of bounds")
+            return "target out of bounds"
 
+        target = state.unit_at(action.target)
+        distance = self._distance(unit.position, action.target)
         if action.action_type == ActionType.MOVE:
-            self._apply_move(unit, action.target)
+            if target:
+                return "target tile occupied"
+            if distance > unit.move_range:
+                return "move too far"
         elif action.action_type == ActionType.ATTACK:
-            self._apply_attack(unit, action.target)
+            if not target or target.player_id == unit.player_id:
+                return "no enemy at target"
+            if distance > 1:
+                return "attack out of range"
         elif action.action_type == ActionType.SKILL:
-            self._apply_skill(unit, action.target)
+            if unit.cooldown > 0:
+                return "skill on cooldown"
+            if not target or target.player_id == unit.player_id:
+                return "no enemy at target"
+            if distance > 2:
+                return "skill out of range"
+        else:
+            return "unsupported action"
+        return None
+
+    def legal_actions(self, player_id: str) -> Iterator[Action]:
+        """Every legal action for `player_id`: per unit, moves then attacks then skills."""
+        state = self.state
+        if state.winner or player_id != state.current_player:
+            return
+        for unit in state.friend_units(player_id):
+            x, y = unit.position
+            r = unit.move_range
+            for tx in range(max(0, x - r), min(state.width, x + r + 1)):
+                dy = r - abs(tx - x)
+                for ty in range(max(0, y - dy), min(state.height, y + dy + 1)):
+                    if state.unit_at((tx, ty)) is None:
+                        yield Action(unit.unit_id, ActionType.MOVE, (tx, ty))
+            for action_type, reach in ((ActionType.ATTACK, 1), (ActionType.SKILL, 2)):
+                if action_type == ActionType.SKILL and unit.cooldown > 0:
+                    continue
+                for tx in range(max(0, x - reach), min(state.width, x + reach + 1)):
+                    dy = reach - abs(tx - x)
+                    for ty in range(max(0, y - dy), min(state.height, y + dy + 1)):
+                        enemy = state.unit_at((tx, ty))
+                        if enemy is not None and enemy.player_id != player_id:
+                            yield Action(unit.unit_id, action_type, (tx, ty))
+
+    def make(self, action: Action, log: bool = False) -> UndoToken:
+        """Apply a legal action for the current player (not re-checked; see validate).
+
+        The turn log is only written with `log=True`; unmake() restores it either way.
+        """
+        state = self.state
+        unit = state.units[action.unit_id]
+        enemy = None if action.action_type == ActionType.MOVE else state.unit_at(action.target)
+        token = UndoToken(
+            unit,
+            unit.position,
+            unit.cooldown,
+            enemy,
+            enemy.hp if enemy else 0,
+            [],
+            state.turn,
+            state.current_player,
+            state.winner,
+            len(state.turn_log),
+        )
+
+        if action.action_type == ActionType.MOVE:
+            state.move_unit(unit, action.target)
+            if log:
+                state.turn_log.append(f"{unit.unit_id} move {token.position}->{action.target}")
+        elif action.action_type == ActionType.ATTACK:
+            state.set_hp(enemy, enemy.hp - unit.attack)
+            if log:
+                state.turn_log.append(f"{unit.unit_id} attack {enemy.unit_id} dmg={unit.attack}")
         else:
-            raise RuleError("unsupported action")
+            state.set_hp(enemy, enemy.hp - unit.skill_damage)
+            state.set_cooldown(unit, 2)
+            if log:
+                state.turn_log.append(f"{unit.unit_id} skill {enemy.unit_id} dmg={unit.skill_damage}")
 
-        self._tick_cooldown(player_id)
+        token.ticked.extend(self._tick_cooldown(state.current_player))
         self._next_turn()
         self._check_winner()
-
-    def _apply_move(self, unit: Unit, target: Position) -> None:
-        if self.state.unit_at(target):
-            raise RuleError("target tile occupied")
-        if self._distance(unit.position, target) > unit.move_range:
-            raise RuleError("move too far")
-        old = unit.position
-        unit.position = target
-        self.state.turn_log.append(f"{unit.unit_id} move {old}->{target}")
-
-    def _apply_attack(self, unit: Unit, target: Position) -> None:
-        enemy = self.state.unit_at(target)
-        if not enemy or enemy.player_id == unit.player_id:
-            raise RuleError("no enemy at target")
-        if self._distance(unit.position, target) > 1:
-            raise RuleError("attack out of range")
-        enemy.hp -= unit.attack
-        self.state.turn_log.append(f"{unit.unit_id} attack {enemy.unit_id} dmg={unit.attack}")
-
-    def _apply_skill(self, unit: Unit, target: Position) -> None:
-        if unit.cooldown > 0:
-            raise RuleError("skill on cooldown")
-        enemy = self.state.unit_at(target)
-        if not enemy or enemy.player_id == unit.player_id:
-            raise RuleError("no enemy at target")
-        if self._distance(unit.position, target) > 2:
-            raise RuleError("skill out of range")
-        enemy.hp -= unit.skill_damage
-        unit.cooldown = 2
-        self.state.turn_log.append(f"{unit.unit_id} skill {enemy.unit_id} dmg={unit.skill_damage}")
-
-    def _tick_cooldown(self, player_id: str) -> None:
-        for u in self.state.friend_units(player_id):
-            if u.cooldown > 0:
-                u.cooldown -= 1
+        return token
+
+    def unmake(self, token: UndoToken) -> None:
+        """Revert the make() that returned `token`; tokens must be undone newest first."""
+        state = self.state
+        state.winner = token.winner
+        state.current_player = token.current_player
+        state.turn = token.turn
+        del state.turn_log[token.log_length :]
+        for unit in token.ticked:
+            state.set_cooldown(unit, unit.cooldown + 1)
+        state.set_cooldown(token.unit, token.cooldown)
+        if token.enemy is not None:
+            state.set_hp(token.enemy, token.enemy_hp)
+        state.move_unit(token.unit, token.position)
+
+    def _tick_cooldown(self, player_id: str) -> List[Unit]:
+        return self.state.tick_cooldowns(player_id)
 
     def _next_turn(self) -> None:
-        players = sorted({u.player_id for u in self.state.units.values()})
-        idx = players.index(self.state.current_player)
-        self.state.current_player = players[(idx + 1) % len(players)]
+        self.state.current_player = self.state.next_player(self.state.current_player)
         self.state.turn += 1
 
     def _check_winner(self) -> None:
-        alive_players = sorted({u.player_id for u in self.state.units.values() if u.alive})
+        alive_players = self.state.alive_players()
         if len(alive_players) == 1:
             self.state.winner = alive_players[0]
 
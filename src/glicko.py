@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .rating import LadderProfile
+
+SCALE = 173.7178  # Glicko rating points per Glicko-2 unit
+CENTRE = 1500.0
+
+# one result: player a, player b, score for a (1 win, 0.5 draw, 0 loss)
+Result = Tuple[str, str, float]
+# one match log row: rating period number, then a Result
+LogRecord = Tuple[int, str, str, float]
+
+
+@dataclass
+class Glicko2:
+    """Glicko-2 (Glickman) over rating periods, on LadderProfile.rating / rd / volatility.
+
+    Every result in a period is scored against the opponents' ratings as they stood at
+    the start of the period; each player then gets one volatility and RD update.
+    Players without games in a period only have their RD inflated.
+    """
+
+    tau: float = 0.5
+    default_rd: float = 350.0
+    default_volatility: float = 0.06
+    max_rd: float = 350.0
+    epsilon: float = 1e-6
+
+    def update_1v1(self, a: float, b: float, result_for_a: float) -> Tuple[float, float]:
+        """RatingSystem compatibility: one game as its own period between two default-RD players.
+
+        The scalar interface carries no RD, so use rate_period() to get real Glicko-2 behaviour.
+        """
+        profiles = {
+            "a": LadderProfile("a", a, self.default_rd, volatility=self.default_volatility),
+            "b": LadderProfile("b", b, self.default_rd, volatility=self.default_volatility),
+        }
+        self.rate_period(profiles, [("a", "b", result_for_a)])
+        return profiles["a"].rating, profiles["b"].rating
+
+    def rate_period(self, profiles: Dict[str, LadderProfile], results: Iterable[Result]) -> None:
+        """One rating period in place on `profiles`; unknown players are added with defaults."""
+        period = RatingPeriod(self, profiles)
+        for a, b, score in results:
+            period.add(a, b, score)
+        period.close()
+
+    def rate_stream(self, profiles: Dict[str, LadderProfile], records: Iterable[LogRecord]) -> int:
+        """Rate a match log ordered by period, one record at a time. Returns periods rated.
+
+        Only per-player sums are kept while a period is open, so memory follows the number
+        of players, not the length of the log. Skipped period numbers still inflate RDs.
+        """
+        period = None
+        current = 0
+        rated = 0
+        for number, a, b, score in records:
+            if period is None or number != current:
+                if period is not None:
+                    if number < current:
+                        raise ValueError(f"match log goes back from period {current} to {number}")
+                    period.close()
+                    rated += 1
+                    for _ in range(number - current - 1):
+                        self.rate_period(profiles, ())
+                        rated += 1
+                period = RatingPeriod(self, profiles)
+                current = number
+            period.add(a, b, score)
+        if period is not None:
+            period.close()
+            rated += 1
+        return rated
+
+    def volatility(self, phi: float, sigma: float, v: float, delta: float) -> float:
+        """New volatility by the Illinois iteration of Glickman's step 5 (Glicko-2 scale)."""
+        a = math.log(sigma * sigma)
+        tau2 = self.tau * self.tau
+        d2, p2 = delta * delta, phi * phi
+
+        def f(x: float) -> float:
+            ex = math.exp(x)
+            return ex * (d2 - p2 - v - ex) / (2 * (p2 + v + ex) ** 2) - (x - a) / tau2
+
+        lo = a
+        if d2 > p2 + v:
+            hi = math.log(d2 - p2 - v)
+        else:
+            k = 1
+            while f(a - k * self.tau) < 0:
+                k += 1
+            hi = a - k * self.tau
+        f_lo, f_hi = f(lo), f(hi)
+        while abs(hi - lo) > self.epsilon:
+            mid = lo + (lo - hi) * f_lo / (f_hi - f_lo)
+            f_mid = f(mid)
+            if f_mid * f_hi <= 0:
+                lo, f_lo = hi, f_hi
+            else:
+                f_lo /= 2
+            hi, f_hi = mid, f_mid
+        return math.exp(lo / 2)
+
+
+class RatingPeriod:
+    """Accumulates one period's results per player against a snapshot of start-of-period ratings."""
+
+    def __init__(self, system: Glicko2, profiles: Dict[str, LadderProfile]):
+        self.system = system
+        self.profiles = profiles
+        self._index: Dict[str, int] = {}
+        self._players: List[LadderProfile] = []
+        self._mu = array("d")
+        self._phi = array("d")
+        self._g = array("d")
+        self._v_inv = array("d")  # sum of g^2 E (1 - E)
+        self._delta = array("d")  # sum of g (s - E)
+        self._games = array("l")
+        for profile in profiles.values():
+            self._track(profile)
+
+    def add(self, a: str, b: str, score_for_a: float) -> None:
+        i, j = self._slot(a), self._slot(b)
+        mu, g = self._mu, self._g
+        e_a = 1.0 / (1.0 + math.exp(-g[j] * (mu[i] - mu[j])))
+        e_b = 1.0 / (1.0 + math.exp(-g[i] * (mu[j] - mu[i])))
+        self._v_inv[i] += g[j] * g[j] * e_a * (1.0 - e_a)
+        self._v_inv[j] += g[i] * g[i] * e_b * (1.0 - e_b)
+        self._delta[i] += g[j] * (score_for_a - e_a)
+        self._delta[j] += g[i] * ((1.0 - score_for_a) - e_b)
+        self._games[i] += 1
+        self._games[j] += 1
+
+    def close(self) -> None:
+        """Write the period's new rating, RD and volatility back to every profile."""
+        system = self.system
+        max_phi = system.max_rd / SCALE
+        for i, profile in enumerate(self._players):
+            phi = self._phi[i]
+            sigma = profile.volatility
+            if not self._games[i]:
+                profile.rd = min(math.sqrt(phi * phi + sigma * sigma), max_phi) * SCALE
+                continue
+            v = 1.0 / self._v_inv[i]
+            sigma = system.volatility(phi, sigma, v, v * self._delta[i])
+            phi_star = min(math.sqrt(phi * phi + sigma * sigma), max_phi)
+            new_phi = 1.0 / math.sqrt(1.0 / (phi_star * phi_star) + 1.0 / v)
+            profile.rating = (self._mu[i] + new_phi * new_phi * self._delta[i]) * SCALE + CENTRE
+            profile.rd = new_phi * SCALE
+            profile.volatility = sigma
+            profile.games += self._games[i]
+
+    def _slot(self, player_id: str) -> int:
+        i = self._index.get(player_id)
+        if i is None:
+            system = self.system
+            profile = LadderProfile(player_id, rd=system.default_rd, volatility=system.default_volatility)
+            self.profiles[player_id] = profile
+            i = self._track(profile)
+        return i
+
+    def _track(self, profile: LadderProfile) -> int:
+        i = len(self._players)
+        self._index[profile.player_id] = i
+        self._players.append(profile)
+        phi = profile.rd / SCALE
+        self._mu.append((profile.rating - CENTRE) / SCALE)
+        self._phi.append(phi)
+        self._g.append(1.0 / math.sqrt(1.0 + 3.0 * phi * phi / (math.pi * math.pi)))
+        self._v_inv.append(0.0)
+        self._delta.append(0.0)
+        self._games.append(0)
+        return i
+
+
+def read_match_log(path: str) -> Iterator[LogRecord]:
+    """Lazily read `period,player_a,player_b,score_a` CSV rows (no header)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if row:
+                yield int(row[0]), row[1], row[2], float(row[3])
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Glicko-2 ratings from a period-ordered match log (CSV)")
+    p.add_argument("path", help="rows of period,player_a,player_b,score_a")
+    p.add_argument("--tau", type=float, default=0.5)
+    p.add_argument("--out", default="glicko_ratings.csv")
+    args = p.parse_args()
+
+    profiles: Dict[str, LadderProfile] = {}
+    periods = Glicko2(tau=args.tau).rate_stream(profiles, read_match_log(args.path))
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["player_id", "rating", "rd", "volatility", "games"])
+        for prof in sorted(profiles.values(), key=lambda x: -x.rating):
+            writer.writerow([prof.player_id, f"{prof.rating:.2f}", f"{prof.rd:.2f}", f"{prof.volatility:.6f}", prof.games])
+    print(f"periods={periods} players={len(profiles)} -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
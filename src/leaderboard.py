@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .rating import LadderProfile
+
+# (player_id, rating)
+Entry = Tuple[str, float]
+
+
+class Leaderboard:
+    """Players by rating, highest first; equal ratings rank by player_id.
+
+    Keys (-rating, player_id) live in sorted blocks of at most 2 * LOAD keys, and a
+    Fenwick tree over the block sizes turns a block number into the count of players
+    ahead of it, so rank and select cost O(log n) plus one bisect in a block.
+    Ranks are 1-based.
+    """
+
+    LOAD = 256
+
+    def __init__(self) -> None:
+        self._blocks: List[list] = []
+        self._maxes: list = []
+        self._tree: List[int] = [0]
+        self._ratings: Dict[str, float] = {}
+
+    @classmethod
+    def from_ratings(cls, table: Iterable[Entry]) -> "Leaderboard":
+        """Bulk build from (player_id, rating) rows with one sort; a later row for a player wins."""
+        board = cls()
+        board._ratings = dict(table)
+        keys = sorted((-rating, pid) for pid, rating in board._ratings.items())
+        board._blocks = [keys[i : i + cls.LOAD] for i in range(0, len(keys), cls.LOAD)]
+        board._maxes = [block[-1] for block in board._blocks]
+        board._rebuild_tree()
+        return board
+
+    def __len__(self) -> int:
+        return len(self._ratings)
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._ratings
+
+    def rating(self, player_id: str) -> Optional[float]:
+        return self._ratings.get(player_id)
+
+    def observe(self, profile: LadderProfile) -> None:
+        """Rating observer hook for settle_match_1v1 / settle_matches_1v1."""
+        self.update(profile.player_id, profile.rating)
+
+    def update(self, player_id: str, rating: float) -> None:
+        old = self._ratings.get(player_id)
+        if old == rating:
+            return
+        if old is not None:
+            self._discard((-old, player_id))
+        self._ratings[player_id] = rating
+        self._insert((-rating, player_id))
+
+    def remove(self, player_id: str) -> bool:
+        rating = self._ratings.pop(player_id, None)
+        if rating is None:
+            return False
+        self._discard((-rating, player_id))
+        return True
+
+    def rank(self, player_id: str) -> Optional[int]:
+        rating = self._ratings.get(player_id)
+        if rating is None:
+            return None
+        key = (-rating, player_id)
+        i = bisect_left(self._maxes, key)
+        return self._prefix(i) + bisect_left(self._blocks[i], key) + 1
+
+    def at(self, rank: int) -> Entry:
+        """The player holding `rank`."""
+        if not 1 <= rank <= len(self._ratings):
+            raise IndexError(f"rank {rank} out of range 1..{len(self._ratings)}")
+        i, j = self._locate(rank - 1)
+        neg, pid = self._blocks[i][j]
+        return pid, -neg
+
+    def top(self, k: int) -> List[Entry]:
+        return self.page(1, k)
+
+    def page(self, first_rank: int, size: int) -> List[Entry]:
+        """Up to `size` players starting at `first_rank`."""
+        out: List[Entry] = []
+        if size <= 0 or not 1 <= first_rank <= len(self._ratings):
+            return out
+        i, j = self._locate(first_rank - 1)
+        blocks = self._blocks
+        while i < len(blocks) and len(out) < size:
+            for neg, pid in blocks[i][j : j + size - len(out)]:
+                out.append((pid, -neg))
+            i, j = i + 1, 0
+        return out
+
+    def around(self, player_id: str, radius: int = 5) -> Tuple[int, List[Entry]]:
+        """The page of up to `radius` players either side of `player_id`; returns (first rank, entries)."""
+        rank = self.rank(player_id)
+        if rank is None:
+            raise KeyError(player_id)
+        first = max(1, rank - radius)
+        return first, self.page(first, rank + radius - first + 1)
+
+    def percentile(self, player_id: str) -> Optional[float]:
+        """Share of the board (0..100] at or below this player's place; the leader is at 100."""
+        rank = self.rank(player_id)
+        if rank is None:
+            return None
+        n = len(self._ratings)
+        return 100.0 * (n - rank + 1) / n
+
+    def cutoff(self, top_share: float) -> Optional[float]:
+        """Lowest rating still inside the top `top_share` (0..1] of the board, e.g. a tier line."""
+        n = len(self._ratings)
+        if not n or top_share <= 0:
+            return None
+        return self.at(max(1, min(n, int(top_share * n))))[1]
+
+    def _insert(self, key: tuple) -> None:
+        blocks, maxes = self._blocks, self._maxes
+        if not blocks:
+            blocks.append([key])
+            maxes.append(key)
+            self._rebuild_tree()
+            return
+        i = min(bisect_left(maxes, key), len(blocks) - 1)
+        block = blocks[i]
+        block.insert(bisect_left(block, key), key)
+        maxes[i] = block[-1]
+        if len(block) > 2 * self.LOAD:
+            blocks.insert(i + 1, block[self.LOAD :])
+            del block[self.LOAD :]
+            maxes[i] = block[-1]
+            maxes.insert(i + 1, blocks[i + 1][-1])
+            self._rebuild_tree()
+        else:
+            self._add(i, 1)
+
+    def _discard(self, key: tuple) -> None:
+        i = bisect_left(self._maxes, key)
+        block = self._blocks[i]
+        del block[bisect_left(block, key)]
+        if block:
+            self._maxes[i] = block[-1]
+            self._add(i, -1)
+        else:
+            del self._blocks[i]
+            del self._maxes[i]
+            self._rebuild_tree()
+
+    # Fenwick tree over block sizes, 1-based internally
+
+    def _rebuild_tree(self) -> None:
+        tree = [0] + [len(block) for block in self._blocks]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _add(self, block: int, delta: int) -> None:
+        tree = self._tree
+        i = block + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, block: int) -> int:
+        """Players in blocks before `block`."""
+        tree = self._tree
+        total = 0
+        i = block
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        """(block, offset) of the 0-based `index`-th key, by Fenwick descent."""
+        tree = self._tree
+        pos = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(tree) and tree[nxt] <= index:
+                pos = nxt
+                index -= tree[nxt]
+            step >>= 1
+        return pos, index
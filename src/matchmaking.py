@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import time
+from bisect import bisect_left
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from heapq import heapify, heappop, heappush
+from itertools import chain, combinations
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+Clock = Callable[[], float]
 
 
 @dataclass
@@ -9,66 +15,582 @@ class PlayerTicket:
     player_id: str
     rating: int
     newbie_games: int
-    wait_seconds: int = 0
+    wait_seconds: float = 0  # time waited so far; refreshed whenever the queue hands the ticket out
+    enqueued_at: Optional[float] = None  # set by the queue, backdated by wait_seconds
+
+
+class ManualClock:
+    """Fake clock for tests and simulations: time only moves on advance()."""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class _SortedKeys:
+    """Sorted list kept in blocks of at most 2 * LOAD keys: bisect to find, then edit one block."""
+
+    LOAD = 256
+
+    def __init__(self) -> None:
+        self._blocks: List[list] = []
+        self._maxes: list = []
+
+    def __bool__(self) -> bool:
+        return bool(self._blocks)
+
+    def __iter__(self):
+        for block in self._blocks:
+            yield from block
+
+    def first(self) -> tuple:
+        return self._blocks[0][0]
+
+    def last(self) -> tuple:
+        return self._maxes[-1]
+
+    def add(self, key) -> Tuple[Optional[tuple], Optional[tuple]]:
+        """Insert `key`; returns its (predecessor, successor)."""
+        blocks, maxes = self._blocks, self._maxes
+        if not blocks:
+            blocks.append([key])
+            maxes.append(key)
+            return None, None
+        i = min(bisect_left(maxes, key), len(blocks) - 1)
+        block = blocks[i]
+        j = bisect_left(block, key)
+        block.insert(j, key)
+        maxes[i] = block[-1]
+        if len(block) > 2 * self.LOAD:
+            blocks.insert(i + 1, block[self.LOAD :])
+            del block[self.LOAD :]
+            maxes[i] = block[-1]
+            maxes.insert(i + 1, blocks[i + 1][-1])
+            if j >= self.LOAD:
+                i, j = i + 1, j - self.LOAD
+        return self._neighbours(i, j)
+
+    def remove(self, key) -> None:
+        i = bisect_left(self._maxes, key)
+        block = self._blocks[i]
+        del block[bisect_left(block, key)]
+        if block:
+            self._maxes[i] = block[-1]
+        else:
+            del self._blocks[i]
+            del self._maxes[i]
+
+    def _neighbours(self, i: int, j: int) -> Tuple[Optional[tuple], Optional[tuple]]:
+        blocks = self._blocks
+        block = blocks[i]
+        if j > 0:
+            pred = block[j - 1]
+        else:
+            pred = blocks[i - 1][-1] if i > 0 else None
+        if j + 1 < len(block):
+            succ = block[j + 1]
+        else:
+            succ = blocks[i + 1][0] if i + 1 < len(blocks) else None
+        return pred, succ
+
+
+class _LevelIndex:
+    """Tickets of one pool at window level >= m, rating-sorted and linked, with a heap of adjacent gaps.
+
+    Keys are (rating, seq). Heap entries are (gap, lower seq, higher seq, left key, right key) and go
+    stale when the two keys stop being neighbours; stale entries are dropped when they surface.
+    """
+
+    def __init__(self) -> None:
+        self.keys = _SortedKeys()
+        self.prev: Dict[int, tuple] = {}
+        self.next: Dict[int, tuple] = {}
+        self.gaps: list = []
+
+    def add(self, key: tuple) -> None:
+        pred, succ = self.keys.add(key)
+        if pred is not None:
+            self._link(pred, key)
+        if succ is not None:
+            self._link(key, succ)
+
+    def remove(self, key: tuple) -> None:
+        self.keys.remove(key)
+        pred = self.prev.pop(key[1], None)
+        succ = self.next.pop(key[1], None)
+        if pred is not None:
+            del self.next[pred[1]]
+        if succ is not None:
+            del self.prev[succ[1]]
+        if pred is not None and succ is not None:
+            self._link(pred, succ)
+
+    def best(self) -> Optional[tuple]:
+        gaps = self.gaps
+        while gaps:
+            top = gaps[0]
+            if self.next.get(top[3][1]) == top[4]:
+                return top
+            heappop(gaps)
+        return None
+
+    def _link(self, left: tuple, right: tuple) -> None:
+        self.next[left[1]] = right
+        self.prev[right[1]] = left
+        lo, hi = (left[1], right[1]) if left[1] < right[1] else (right[1], left[1])
+        heappush(self.gaps, (right[0] - left[0], lo, hi, left, right))
+        if len(self.gaps) > 4 * len(self.next) + 64:
+            self._compact()
+
+    def _compact(self) -> None:
+        self.gaps = [e for e in self.gaps if self.next.get(e[3][1]) == e[4]]
+        heapify(self.gaps)
+
+
+@dataclass
+class _Entry:
+    ticket: PlayerTicket
+    newbie: bool
+    level: int
 
 
 @dataclass
 class MatchmakingQueue:
+    """1v1 queue; pop_match returns the closest-rated pair whose window allows it.
+
+    The window of a pair is base_window + 20 per 5 seconds the shorter waiter has queued
+    (its "level"). Waits are read off `clock` rather than counted, and a heap of
+    "ticket reaches level L at time T" events moves tickets up as time passes, so
+    nothing walks the whole queue. Each pool keeps one _LevelIndex per level m holding the tickets at
+    level >= m; every pair in it is allowed once their gap fits window(m), so the best
+    pair is the smallest adjacent gap over all levels. Ties go to the earliest enqueued
+    pair, as when scanning the queue in order.
+
+    Levels stop at the pool's cap, the first level whose window covers the pool's whole
+    rating span: past it every pair is allowed anyway, so a ticket sits in at most
+    cap + 1 indexes however long it waits. The cap only grows while the pool is non-empty;
+    tickets held back by it are promoted as soon as it does.
+    """
+
     base_window: int = 80
     newbie_limit: int = 10
-    queue: List[PlayerTicket] = field(default_factory=list)
+    clock: Clock = time.monotonic
+    _entries: Dict[int, _Entry] = field(default_factory=dict, init=False, repr=False)
+    _seq_of: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _level_ups: List[Tuple[float, int]] = field(default_factory=list, init=False, repr=False)
+    _skew: float = field(default=0.0, init=False, repr=False)
+    _pools: Dict[bool, List[_LevelIndex]] = field(default_factory=dict, init=False, repr=False)
+    _caps: Dict[bool, int] = field(default_factory=dict, init=False, repr=False)
+    _capped: Dict[bool, set] = field(default_factory=dict, init=False, repr=False)
+    _seq: int = field(default=0, init=False, repr=False)
+
+    @property
+    def queue(self) -> List[PlayerTicket]:
+        """Waiting tickets in enqueue order, with wait_seconds brought up to date."""
+        now = self.now()
+        out = []
+        for e in self._entries.values():
+            e.ticket.wait_seconds = now - e.ticket.enqueued_at
+            out.append(e.ticket)
+        return out
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def now(self) -> float:
+        return self.clock() + self._skew
+
+    def wait_seconds(self, ticket: PlayerTicket) -> float:
+        """Time `ticket` has waited; also stores it in ticket.wait_seconds."""
+        ticket.wait_seconds = self.now() - ticket.enqueued_at
+        return ticket.wait_seconds
+
+    def window_of(self, ticket: PlayerTicket) -> int:
+        """Widest rating gap the ticket accepts right now (a pair uses the smaller of the two)."""
+        return self._window(self._level(ticket))
 
     def enqueue(self, ticket: PlayerTicket) -> None:
-        self.queue.append(ticket)
+        seq = self._seq
+        self._seq += 1
+        ticket.enqueued_at = self.now() - ticket.wait_seconds
+        entry = _Entry(ticket, ticket.newbie_games < self.newbie_limit, -1)
+        self._entries[seq] = entry
+        self._seq_of[ticket.player_id] = seq
+        self._promote(seq, entry, self._level(ticket))
+        self._schedule_level_up(seq, entry)
+
+    def cancel(self, player_id: str) -> Optional[PlayerTicket]:
+        """Take a player out of the queue; returns their ticket, or None if not queued."""
+        seq = self._seq_of.get(player_id)
+        if seq is None:
+            return None
+        ticket = self._entries[seq].ticket
+        self.wait_seconds(ticket)
+        self._remove(seq)
+        return ticket
 
     def tick(self, seconds: int = 1) -> None:
-        for t in self.queue:
-            t.wait_seconds += seconds
+        """Act as if `seconds` more had passed on the clock (O(1); used without a fake clock)."""
+        self._skew += seconds
 
     def pop_match(self) -> Optional[Tuple[PlayerTicket, PlayerTicket]]:
-        if len(self.queue) < 2:
+        self._apply_level_ups()
+        best: Optional[tuple] = None
+        for levels in self._pools.values():
+            for m, index in enumerate(levels):
+                top = index.best()
+                if top is not None and top[0] <= self._window(m) and (best is None or top[:3] < best[:3]):
+                    best = top
+        if best is None:
             return None
+        _, lo, hi, _, _ = best
+        a, b = self._entries[lo].ticket, self._entries[hi].ticket
+        self.wait_seconds(a)
+        self.wait_seconds(b)
+        self._remove(lo)
+        self._remove(hi)
+        return a, b
+
+    def match_all(self, lookback: int = 3) -> List[Tuple[PlayerTicket, PlayerTicket]]:
+        """Pair tickets per pool, most pairs first, then least total rating gap.
+
+        One pass of a dynamic program over each pool's rating order: a ticket is paired with
+        one of the `lookback` tickets before it (those between stay unmatched) or left over,
+        and pairs never cross. When every ticket in a pool has the same window this is exact
+        for any lookback >= 1, since the optimum then pairs rating neighbours. With mixed
+        windows it is a heuristic with no optimality bound: a pair that must skip more than
+        `lookback` short-window tickets, or cross another pair, is not considered.
+        lookback=3 lets a long waiter reach past a couple of new arrivals at O(3n) cost.
+        """
+        self._apply_level_ups()
+        matched: List[Tuple[int, int]] = []
+        for levels in self._pools.values():
+            if levels:
+                matched.extend(self._match_pool(list(levels[0].keys), lookback))
+        out = []
+        for lo, hi in matched:
+            a, b = self._entries[lo].ticket, self._entries[hi].ticket
+            self.wait_seconds(a)
+            self.wait_seconds(b)
+            out.append((a, b))
+            self._remove(lo)
+            self._remove(hi)
+        return out
 
-        best_pair: Optional[Tuple[int, int, int]] = None  # i, j, diff
-        for i in range(len(self.queue)):
-            for j in range(i + 1, len(self.queue)):
-                a, b = self.queue[i], self.queue[j]
-                if not self._same_pool(a, b):
+    def _match_pool(self, keys: List[tuple], lookback: int) -> List[Tuple[int, int]]:
+        entries = [self._entries[seq] for _, seq in keys]
+        n = len(keys)
+        # over keys[:i]: most pairs, least total gap, and the partner index of keys[i - 1] (-1 = unmatched)
+        pairs = [0] * (n + 1)
+        cost = [0] * (n + 1)
+        partner = [-1] * (n + 1)
+        for i in range(1, n + 1):
+            pairs[i], cost[i] = pairs[i - 1], cost[i - 1]
+            rating, level = keys[i - 1][0], entries[i - 1].level
+            for j in range(max(0, i - 1 - lookback), i - 1):
+                gap = rating - keys[j][0]
+                if gap > self._window(min(level, entries[j].level)):
                     continue
-                diff = abs(a.rating - b.rating)
-                win = self._window_for(a, b)
-                if diff <= win:
-                    if not best_pair or diff < best_pair[2]:
-                        best_pair = (i, j, diff)
+                p, c = pairs[j] + 1, cost[j] + gap
+                if p > pairs[i] or (p == pairs[i] and c < cost[i]):
+                    pairs[i], cost[i], partner[i] = p, c, j
 
-        if not best_pair:
-            return None
+        out = []
+        i = n
+        while i > 0:
+            j = partner[i]
+            if j < 0:
+                i -= 1
+                continue
+            a, b = keys[j][1], keys[i - 1][1]
+            out.append((a, b) if a < b else (b, a))
+            i = j
+        out.reverse()
+        return out
+
+    def _apply_level_ups(self) -> None:
+        now = self.now()
+        events = self._level_ups
+        while events and events[0][0] <= now:
+            _, seq = heappop(events)
+            entry = self._entries.get(seq)
+            if entry is None:
+                continue
+            # the event time has passed, so at least one level up even if float rounding disagrees
+            self._promote(seq, entry, max(entry.level + 1, self._level(entry.ticket, now)))
+            self._schedule_level_up(seq, entry)
+
+    def _schedule_level_up(self, seq: int, entry: _Entry) -> None:
+        # capped tickets wait for _raise_cap instead
+        if seq not in self._capped[entry.newbie]:
+            heappush(self._level_ups, (entry.ticket.enqueued_at + (entry.level + 1) * 5, seq))
+
+    def _promote(self, seq: int, entry: _Entry, level: int) -> None:
+        pool = entry.newbie
+        levels = self._pools.setdefault(pool, [])
+        key = (entry.ticket.rating, seq)
+        if entry.level < 0:
+            if not levels:
+                levels.append(_LevelIndex())
+            levels[0].add(key)
+            entry.level = 0
+            self._raise_cap(pool)
+        capped = self._capped.setdefault(pool, set())
+        if level > self._caps[pool]:
+            level = self._caps[pool]
+            capped.add(seq)
+        else:
+            capped.discard(seq)
+        while len(levels) <= level:
+            levels.append(_LevelIndex())
+        for m in range(entry.level + 1, level + 1):
+            levels[m].add(key)
+        entry.level = level
+
+    def _raise_cap(self, pool: bool) -> None:
+        keys = self._pools[pool][0].keys
+        span = keys.last()[0] - keys.first()[0]
+        cap = max(0, -(-(span - self.base_window) // 20))
+        if cap <= self._caps.get(pool, -1):
+            return
+        self._caps[pool] = cap
+        now = self.now()
+        for seq in list(self._capped.get(pool, ())):
+            entry = self._entries[seq]
+            self._promote(seq, entry, self._level(entry.ticket, now))
+            self._schedule_level_up(seq, entry)
+
+    def _remove(self, seq: int) -> None:
+        entry = self._entries.pop(seq)
+        if self._seq_of.get(entry.ticket.player_id) == seq:
+            del self._seq_of[entry.ticket.player_id]
+        levels = self._pools[entry.newbie]
+        key = (entry.ticket.rating, seq)
+        for m in range(entry.level + 1):
+            levels[m].remove(key)
+        while levels and not levels[-1].keys:
+            levels.pop()
+        self._capped[entry.newbie].discard(seq)
+        if not levels:
+            del self._caps[entry.newbie]
+
+    def _level(self, t: PlayerTicket, now: Optional[float] = None) -> int:
+        return int(((self.now() if now is None else now) - t.enqueued_at) // 5)
+
+    def _window(self, level: int) -> int:
+        return self.base_window + level * 20
+
+
+def _pair_key(i: int, j: int) -> int:
+    return (i << 32) | j if i < j else (j << 32) | i
 
-        i, j, _ = best_pair
-        b = self.queue.pop(j)
-        a = self.queue.pop(i)
-        return a, b
 
-    def _same_pool(self, a: PlayerTicket, b: PlayerTicket) -> bool:
-        a_newbie = a.newbie_games < self.newbie_limit
-        b_newbie = b.newbie_games < self.newbie_limit
-        return a_newbie == b_newbie
+class _PairSynergyView(Mapping):
+    """Read-only {(p1, p2): synergy} view (ids sorted, as keys used to be stored) over a record."""
 
-    def _window_for(self, a: PlayerTicket, b: PlayerTicket) -> int:
-        extra = min(a.wait_seconds, b.wait_seconds) // 5 * 20
-        return self.base_window + extra
+    def __init__(self, record: "TeamSynergyRecord"):
+        self._record = record
+
+    def __getitem__(self, key: Tuple[str, str]) -> float:
+        ids = self._record.ids
+        i, j = ids.get(key[0]), ids.get(key[1])
+        if i is None or j is None or key[0] > key[1]:
+            raise KeyError(key)
+        try:
+            return self._record._pairs[_pair_key(i, j)]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        names = list(self._record.ids)
+        for key in self._record._pairs:
+            yield tuple(sorted((names[key >> 32], names[key & 0xFFFFFFFF])))
+
+    def __len__(self) -> int:
+        return len(self._record._pairs)
 
 
 @dataclass
 class TeamSynergyRecord:
-    """2v2 组队协同因子，越高代表固定队默契越高。"""
+    """2v2 组队协同因子，越高代表固定队默契越高。
+
+    Player IDs are interned to ints and each pair is one int key (low id << 32 | high id)
+    in a flat dict, so a lookup hashes one int rather than a tuple of strings.
+    """
+
+    ids: Dict[str, int] = field(default_factory=dict)
+    _pairs: Dict[int, float] = field(default_factory=dict, repr=False)
 
-    pair_synergy: Dict[Tuple[str, str], float] = field(default_factory=dict)
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    @property
+    def pair_synergy(self) -> Mapping[Tuple[str, str], float]:
+        """Read-only view keyed by the sorted pair of player ids."""
+        return _PairSynergyView(self)
+
+    def intern(self, player_id: str) -> int:
+        i = self.ids.get(player_id)
+        if i is None:
+            i = self.ids[player_id] = len(self.ids)
+        return i
 
     def get(self, p1: str, p2: str) -> float:
-        key = tuple(sorted((p1, p2)))
-        return self.pair_synergy.get(key, 0.0)
+        i, j = self.ids.get(p1), self.ids.get(p2)
+        if i is None or j is None:
+            return 0.0
+        return self._pairs.get(_pair_key(i, j), 0.0)
+
+    def get_ids(self, i: int, j: int) -> float:
+        return self._pairs.get(_pair_key(i, j), 0.0)
 
     def record_win(self, p1: str, p2: str) -> None:
-        key = tuple(sorted((p1, p2)))
-        self.pair_synergy[key] = self.pair_synergy.get(key, 0.0) + 0.1
+        key = _pair_key(self.intern(p1), self.intern(p2))
+        self._pairs[key] = self._pairs.get(key, 0.0) + 0.1
+
+
+@dataclass
+class TeamMatch:
+    team_a: Tuple[PlayerTicket, PlayerTicket]
+    team_b: Tuple[PlayerTicket, PlayerTicket]
+    gap: float  # team strength difference
+
+
+@dataclass
+class _Party:
+    players: Tuple[PlayerTicket, ...]
+    ids: Tuple[int, ...]
+    rating: float
+    newbie: bool
+    enqueued_at: float
+
+
+@dataclass
+class TeamQueue:
+    """2v2 queue of solo tickets and premade duos.
+
+    A team's strength is its mean rating plus synergy_weight times the pair's synergy.
+    form_matches() takes parties oldest first; for each it only looks at the nearest
+    `search_width` parties on either side in rating order that its window can reach,
+    and picks the 4-player combination and team split with the smallest strength gap
+    (or the first within `good_enough`).
+    Windows grow with waiting as in MatchmakingQueue, using the shortest waiter.
+    """
+
+    synergy: TeamSynergyRecord = field(default_factory=TeamSynergyRecord)
+    base_window: int = 80
+    newbie_limit: int = 10
+    synergy_weight: float = 100.0
+    search_width: int = 4
+    good_enough: float = 2.0  # stop searching an anchor once a split is this close
+    clock: Clock = time.monotonic
+    _parties: Dict[int, _Party] = field(default_factory=dict, init=False, repr=False)
+    _seq: int = field(default=0, init=False, repr=False)
+
+    def __len__(self) -> int:
+        return sum(len(p.players) for p in self._parties.values())
+
+    def enqueue(self, *players: PlayerTicket) -> None:
+        """Queue a solo player or a premade duo."""
+        if len(players) not in (1, 2):
+            raise ValueError("a party is one or two players")
+        now = self.clock()
+        self._parties[self._seq] = _Party(
+            players,
+            tuple(self.synergy.intern(p.player_id) for p in players),
+            sum(p.rating for p in players) / len(players),
+            any(p.newbie_games < self.newbie_limit for p in players),
+            min(now - p.wait_seconds for p in players),
+        )
+        self._seq += 1
+
+    def form_matches(self) -> List[TeamMatch]:
+        now = self.clock()
+        order = sorted(self._parties, key=lambda seq: (self._parties[seq].rating, seq))
+        position = {seq: i for i, seq in enumerate(order)}
+        used: set = set()
+        matches: List[TeamMatch] = []
+        for seq, anchor in self._parties.items():
+            if seq in used:
+                continue
+            near = self._neighbours(order, position[seq], anchor, used, now)
+            best = self._best_match(anchor, near, now)
+            if best is not None:
+                gap, combo, team_a, team_b = best
+                used.add(seq)
+                used.update(combo)
+                matches.append(TeamMatch(team_a, team_b, gap))
+        for seq in used:
+            del self._parties[seq]
+        return matches
+
+    def _window(self, enqueued_at: float, now: float) -> float:
+        return self.base_window + int((now - enqueued_at) // 5) * 20
+
+    def _neighbours(self, order: List[int], i: int, anchor: _Party, used: set, now: float) -> List[int]:
+        reach = self._window(anchor.enqueued_at, now)
+        out: List[int] = []
+        for step in (-1, 1):
+            found = 0
+            j = i + step
+            while 0 <= j < len(order) and found < self.search_width:
+                party = self._parties[order[j]]
+                if abs(party.rating - anchor.rating) > reach:
+                    break
+                if order[j] not in used and party.newbie == anchor.newbie:
+                    out.append(order[j])
+                    found += 1
+                j += step
+        return out
+
+    def _best_match(self, anchor: _Party, near: List[int], now: float):
+        """Smallest-gap (gap, combo, team_a, team_b) for `anchor`, or None; stops early at good_enough."""
+        solos = [s for s in near if len(self._parties[s].players) == 1]
+        duos = [s for s in near if len(self._parties[s].players) == 2]
+        if len(anchor.players) == 2:
+            combos = chain(((d,) for d in duos), combinations(solos, 2))
+        else:
+            combos = chain(((d, s) for d in duos for s in solos), combinations(solos, 3))
+
+        best = None
+        for combo in combos:
+            parties = [anchor] + [self._parties[s] for s in combo]
+            # individual ratings, so a 1200/1800 duo does not pass as a 1500 player
+            ratings = [t.rating for p in parties for t in p.players]
+            window = self._window(max(p.enqueued_at for p in parties), now)
+            if max(ratings) - min(ratings) > window:
+                continue
+            for team_a, team_b in self._splits(parties):
+                gap = abs(self._strength(team_a) - self._strength(team_b))
+                if gap <= window and (best is None or gap < best[0]):
+                    best = (gap, combo, team_a, team_b)
+            if best is not None and best[0] <= self.good_enough:
+                break
+        if best is None:
+            return None
+        gap, combo, team_a, team_b = best
+        return gap, combo, tuple(p for p, _ in team_a), tuple(p for p, _ in team_b)
+
+    def _splits(self, parties: List[_Party]):
+        """Team splits keeping duos together; the anchor's side comes first."""
+        members = [list(zip(p.players, p.ids)) for p in parties]
+        duos = [m for m in members if len(m) == 2]
+        solos = [m[0] for m in members if len(m) == 1]
+        if len(duos) == 2:
+            yield duos[0], duos[1]
+        elif len(duos) == 1:
+            yield (duos[0], solos) if len(members[0]) == 2 else (solos, duos[0])
+        else:
+            a, b, c, d = solos
+            yield [a, b], [c, d]
+            yield [a, c], [b, d]
+            yield [a, d], [b, c]
+
+    def _strength(self, team) -> float:
+        (p, i), (q, j) = team
+        return (p.rating + q.rating) / 2 + self.synergy_weight * self.synergy.get_ids(i, j)
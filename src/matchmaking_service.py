@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .matchmaking import Clock, MatchmakingQueue, PlayerTicket
+
+# (newbie pool, rating band)
+ShardKey = Tuple[bool, int]
+Match = Tuple[PlayerTicket, PlayerTicket]
+
+ENQUEUE = "enqueue"
+CANCEL = "cancel"
+ROUND = "round"
+
+
+class LocalTransport:
+    """In-process stand-in for the link between the service and its shard workers.
+
+    Messages are tuples; request() appends a future the shard resolves with its reply.
+    """
+
+    def __init__(self) -> None:
+        self._inboxes: Dict[ShardKey, asyncio.Queue] = {}
+
+    def register(self, key: ShardKey) -> asyncio.Queue:
+        return self._inboxes.setdefault(key, asyncio.Queue())
+
+    async def send(self, key: ShardKey, message: tuple) -> None:
+        await self._inboxes[key].put(message)
+
+    async def request(self, key: ShardKey, message: tuple):
+        fut = asyncio.get_running_loop().create_future()
+        await self.send(key, (*message, fut))
+        return await fut
+
+
+class Shard:
+    """One pool and rating band: a MatchmakingQueue fed by messages from its inbox."""
+
+    def __init__(self, key: ShardKey, queue: MatchmakingQueue, band_width: int):
+        self.key = key
+        self.queue = queue
+        self.lo = key[1] * band_width
+        self.hi = self.lo + band_width
+
+    async def run(self, inbox: asyncio.Queue) -> None:
+        while True:
+            kind, *args = await inbox.get()
+            if kind == ENQUEUE:
+                self.queue.enqueue(args[0])
+            elif kind == CANCEL:
+                args[1].set_result(self.queue.cancel(args[0]))
+            elif kind == ROUND:
+                args[0].set_result(self.round())
+
+    def round(self) -> Tuple[List[Match], List[PlayerTicket], List[PlayerTicket]]:
+        """Pair locally; returns the pairs plus leftovers whose window reaches below / above the band."""
+        pairs = self.queue.match_all()
+        low: List[PlayerTicket] = []
+        high: List[PlayerTicket] = []
+        for t in self.queue.queue:
+            window = self.queue.window_of(t)
+            if t.rating - window < self.lo:
+                low.append(t)
+            if t.rating + window >= self.hi:
+                high.append(t)
+        return pairs, low, high
+
+
+class MatchmakingService:
+    """Sharded 1v1 matchmaking on one event loop.
+
+    Tickets go to the shard for their pool and rating band (rating // band_width). Every
+    `round_interval` seconds each shard pairs its own queue with match_all(); leftovers
+    whose window reaches outside their band are then matched, per pool, in one border
+    round across all bands, and taken from their home shards by cancel. A pair is only
+    allowed when both windows cover the gap, so each side is a border ticket of its shard.
+    """
+
+    def __init__(
+        self,
+        band_width: int = 200,
+        round_interval: float = 1.0,
+        base_window: int = 80,
+        newbie_limit: int = 10,
+        clock: Clock = time.monotonic,
+        transport: Optional[LocalTransport] = None,
+        on_match: Optional[Callable[[PlayerTicket, PlayerTicket], None]] = None,
+    ):
+        self.band_width = band_width
+        self.round_interval = round_interval
+        self.base_window = base_window
+        self.newbie_limit = newbie_limit
+        self.clock = clock
+        self.transport = transport or LocalTransport()
+        self.on_match = on_match
+        self.shards: Dict[ShardKey, Shard] = {}
+        self.matched = 0
+        self._tickets: Dict[str, PlayerTicket] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._cadence: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def shard_key(self, ticket: PlayerTicket) -> ShardKey:
+        return ticket.newbie_games < self.newbie_limit, int(ticket.rating // self.band_width)
+
+    def start(self) -> None:
+        """Run match rounds every round_interval seconds until stop()."""
+        if self._cadence is None:
+            self._cadence = asyncio.get_running_loop().create_task(self._cadence_loop())
+
+    async def stop(self) -> None:
+        tasks = self._tasks + ([self._cadence] if self._cadence else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._cadence = None
+
+    async def enqueue(self, ticket: PlayerTicket) -> None:
+        """Queue a player; queuing again replaces their previous ticket."""
+        if ticket.player_id in self._tickets:
+            await self.cancel(ticket.player_id)
+        self._tickets[ticket.player_id] = ticket
+        await self.transport.send(self._shard(ticket), (ENQUEUE, ticket))
+
+    async def cancel(self, player_id: str) -> bool:
+        ticket = self._tickets.pop(player_id, None)
+        if ticket is None:
+            return False
+        return await self.transport.request(self.shard_key(ticket), (CANCEL, player_id)) is ticket
+
+    async def requeue(self, ticket: PlayerTicket) -> None:
+        """Put a ticket back (e.g. its match fell through) keeping the time it already waited."""
+        if ticket.enqueued_at is not None:
+            ticket.wait_seconds = self.clock() - ticket.enqueued_at
+        await self.enqueue(ticket)
+
+    def ticket(self, player_id: str) -> Optional[PlayerTicket]:
+        return self._tickets.get(player_id)
+
+    async def run_round(self) -> List[Match]:
+        keys = sorted(self.shards)
+        replies = await asyncio.gather(*(self.transport.request(k, (ROUND,)) for k in keys))
+        matches: List[Match] = []
+        borders: Dict[ShardKey, Tuple[List[PlayerTicket], List[PlayerTicket]]] = {}
+        for key, (pairs, low, high) in zip(keys, replies):
+            for a, b in pairs:
+                self._forget(a)
+                self._forget(b)
+                matches.append((a, b))
+            borders[key] = (low, high)
+
+        # one border round per pool over every ticket whose window leaves its band, so a
+        # window wider than band_width still reaches bands two or more away
+        for pool in (False, True):
+            edge: Dict[str, PlayerTicket] = {}
+            for (newbie, _), (low, high) in borders.items():
+                if newbie == pool:
+                    for t in low + high:
+                        edge[t.player_id] = t
+            if len(edge) >= 2:
+                matches.extend(await self._border_round(list(edge.values())))
+
+        for a, b in matches:
+            self.matched += 1
+            if self.on_match:
+                self.on_match(a, b)
+        return matches
+
+    async def _border_round(self, tickets: List[PlayerTicket]) -> List[Match]:
+        # match copies (with their waits so far) so the home shards' tickets stay untouched
+        now = self.clock()
+        scratch = MatchmakingQueue(self.base_window, self.newbie_limit, clock=self.clock)
+        originals = {}
+        for t in tickets:
+            originals[t.player_id] = t
+            scratch.enqueue(PlayerTicket(t.player_id, t.rating, t.newbie_games, wait_seconds=now - t.enqueued_at))
+
+        matches: List[Match] = []
+        for a, b in scratch.match_all():
+            a, b = originals[a.player_id], originals[b.player_id]
+            took_a = await self._take(a)
+            took_b = await self._take(b)
+            if took_a and took_b:
+                matches.append((a, b))
+            elif took_a or took_b:
+                # the partner was cancelled or matched across the other edge meanwhile
+                await self.requeue(a if took_a else b)
+        return matches
+
+    async def _take(self, ticket: PlayerTicket) -> bool:
+        if self._tickets.get(ticket.player_id) is not ticket:
+            return False
+        return await self.cancel(ticket.player_id)
+
+    def _forget(self, ticket: PlayerTicket) -> None:
+        if self._tickets.get(ticket.player_id) is ticket:
+            del self._tickets[ticket.player_id]
+
+    def _shard(self, ticket: PlayerTicket) -> ShardKey:
+        key = self.shard_key(ticket)
+        if key not in self.shards:
+            shard = Shard(key, MatchmakingQueue(self.base_window, self.newbie_limit, clock=self.clock), self.band_width)
+            self.shards[key] = shard
+            inbox = self.transport.register(key)
+            self._tasks.append(asyncio.get_running_loop().create_task(shard.run(inbox)))
+        return key
+
+    async def _cadence_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_round = loop.time()
+        while True:
+            next_round += self.round_interval
+            await asyncio.sleep(max(0.0, next_round - loop.time()))
+            await self.run_round()
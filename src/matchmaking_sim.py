@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import math
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from .matchmaking import ManualClock, MatchmakingQueue, PlayerTicket
+
+ARRIVE = 0
+ABANDON = 1
+TICK = 2
+
+
+@dataclass
+class SimConfig:
+    duration: float = 3600.0  # virtual seconds
+    arrival_rate: float = 20.0  # mean arrivals per second
+    diurnal_amplitude: float = 0.6  # rate swings between (1 - a) and (1 + a) times the mean
+    day_length: float = 3600.0  # virtual seconds per peak/off-peak cycle
+    rating_mean: float = 1500.0
+    rating_sd: float = 300.0
+    newbie_share: float = 0.2
+    patience: Optional[float] = 180.0  # players leave after this many seconds unmatched (None = never)
+    tick_interval: float = 1.0  # how often the matcher runs
+    mode: str = "pop"  # "pop": pop_match until None; "match_all": one batch per tick
+    base_window: int = 80
+    newbie_limit: int = 10
+    seed: int = 0
+
+
+@dataclass
+class SimResult:
+    config: SimConfig
+    arrivals: int = 0
+    matches: int = 0
+    abandoned: int = 0
+    still_queued: int = 0
+    waits: List[float] = field(default_factory=list)
+    gaps: List[float] = field(default_factory=list)
+    call_ns: List[int] = field(default_factory=list)  # CPU time per pop_match / match_all call
+
+    def summary(self) -> Dict[str, object]:
+        calls = self.call_ns
+        return {
+            "config": asdict(self.config),
+            "arrivals": self.arrivals,
+            "matches": self.matches,
+            "matches_per_second": self.matches / self.config.duration,
+            "abandoned": self.abandoned,
+            "still_queued": self.still_queued,
+            "wait_seconds": _percentiles(self.waits),
+            "rating_gap": {**_percentiles(self.gaps), "histogram": _histogram(self.gaps, 20)},
+            "calls": len(calls),
+            "cpu_us_per_call": {
+                "mean": sum(calls) / len(calls) / 1000 if calls else 0.0,
+                **{k: v / 1000 for k, v in _percentiles(calls).items()},
+            },
+        }
+
+
+def arrival_rate(config: SimConfig, t: float) -> float:
+    return config.arrival_rate * (1 + config.diurnal_amplitude * math.sin(2 * math.pi * t / config.day_length))
+
+
+def simulate(config: SimConfig) -> SimResult:
+    """Feed synthetic arrivals (Poisson, thinned to the diurnal rate) to a queue on a virtual clock."""
+    rng = random.Random(config.seed)
+    clock = ManualClock()
+    queue = MatchmakingQueue(config.base_window, config.newbie_limit, clock=clock)
+    result = SimResult(config)
+    events: list = []
+    seq = 0
+
+    def schedule(at: float, kind: int, payload=None) -> None:
+        nonlocal seq
+        heapq.heappush(events, (at, kind, seq, payload))
+        seq += 1
+
+    peak = config.arrival_rate * (1 + config.diurnal_amplitude)
+    schedule(rng.expovariate(peak), ARRIVE)
+    schedule(config.tick_interval, TICK)
+
+    while events:
+        at, kind, _, payload = heapq.heappop(events)
+        if at > config.duration:
+            break
+        clock.now = at
+        if kind == ARRIVE:
+            schedule(at + rng.expovariate(peak), ARRIVE)
+            if rng.random() * peak > arrival_rate(config, at):
+                continue
+            pid = f"p{result.arrivals}"
+            result.arrivals += 1
+            newbie_games = rng.randrange(config.newbie_limit) if rng.random() < config.newbie_share else 50
+            queue.enqueue(PlayerTicket(pid, round(rng.gauss(config.rating_mean, config.rating_sd)), newbie_games))
+            if config.patience is not None:
+                schedule(at + config.patience, ABANDON, pid)
+        elif kind == ABANDON:
+            if queue.cancel(payload) is not None:
+                result.abandoned += 1
+        else:
+            schedule(at + config.tick_interval, TICK)
+            _run_matcher(queue, config.mode, result)
+
+    result.still_queued = len(queue)
+    return result
+
+
+def _run_matcher(queue: MatchmakingQueue, mode: str, result: SimResult) -> None:
+    if mode == "match_all":
+        start = time.process_time_ns()
+        pairs = queue.match_all()
+        result.call_ns.append(time.process_time_ns() - start)
+    elif mode == "pop":
+        pairs = []
+        while True:
+            start = time.process_time_ns()
+            pair = queue.pop_match()
+            result.call_ns.append(time.process_time_ns() - start)
+            if pair is None:
+                break
+            pairs.append(pair)
+    else:
+        raise ValueError(f"unknown mode {mode!r}")
+
+    for a, b in pairs:
+        result.matches += 1
+        result.waits.extend((queue.wait_seconds(a), queue.wait_seconds(b)))
+        result.gaps.append(abs(a.rating - b.rating))
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    n = len(ordered)
+    out = {f"p{int(q * 100)}": ordered[min(n - 1, int(q * n))] for q in (0.50, 0.90, 0.99)}
+    out["max"] = ordered[-1]
+    return out
+
+
+def _histogram(samples: List[float], width: int) -> Dict[str, int]:
+    counts: Dict[int, int] = {}
+    for s in samples:
+        counts[int(s // width)] = counts.get(int(s // width), 0) + 1
+    return {f"{b * width}-{(b + 1) * width - 1}": counts[b] for b in sorted(counts)}
+
+
+def main() -> None:
+    defaults = SimConfig()
+    p = argparse.ArgumentParser(description="Discrete-event matchmaking simulation on a virtual clock")
+    for name, value in asdict(defaults).items():
+        flag = "--" + name.replace("_", "-")
+        if name == "patience":
+            p.add_argument(flag, type=float, default=value, help="seconds before leaving (<= 0: never)")
+        else:
+            p.add_argument(flag, type=type(value), default=value)
+    p.add_argument("--out", default="matchmaking_sim.json", help="machine-readable results (JSON)")
+    args = vars(p.parse_args())
+    out = args.pop("out")
+    if args["patience"] is not None and args["patience"] <= 0:
+        args["patience"] = None
+
+    start = time.perf_counter()
+    summary = simulate(SimConfig(**args)).summary()
+    summary["wall_seconds"] = time.perf_counter() - start
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    waits, gaps, cpu = summary["wait_seconds"], summary["rating_gap"], summary["cpu_us_per_call"]
+    print(
+        f"arrivals={summary['arrivals']} matches={summary['matches']} ({summary['matches_per_second']:.2f}/s) "
+        f"abandoned={summary['abandoned']} queued={summary['still_queued']}"
+    )
+    print(f"wait p50={waits['p50']:.1f}s p99={waits['p99']:.1f}s  gap p50={gaps['p50']:.0f} p99={gaps['p99']:.0f}")
+    print(f"cpu per {args['mode']} call: mean={cpu['mean']:.1f}us p99={cpu['p99']:.1f}us  -> {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
-from typing import Protocol, Tuple
+from typing import List, MutableSequence, Optional, Protocol, Sequence, Tuple
 
 
 class RatingSystem(Protocol):
@@ -23,18 +24,82 @@ class EloRating:
         nb = b + self.k * ((1.0 - result_for_a) - eb)
         return na, nb
 
+    def update_1v1_batch(
+        self,
+        ratings: MutableSequence[float],
+        a_idx: Sequence[int],
+        b_idx: Sequence[int],
+        results: Sequence[float],
+        ndigits: Optional[int] = None,
+    ) -> None:
+        """update_1v1 for every match in order, in place on `ratings`; `ndigits` rounds after each match."""
+        k = self.k
+        for a, b, result_for_a in zip(a_idx, b_idx, results):
+            ra, rb = ratings[a], ratings[b]
+            ea = 1.0 / (1.0 + 10 ** ((rb - ra) / 400.0))
+            na = ra + k * (result_for_a - ea)
+            nb = rb + k * ((1.0 - result_for_a) - (1.0 - ea))
+            if ndigits is not None:
+                na, nb = round(na, ndigits), round(nb, ndigits)
+            ratings[a], ratings[b] = na, nb
+
 
 @dataclass
 class LadderProfile:
     player_id: str
     rating: float = 1000.0
-    rd: float = 350.0  # 预留给 Glicko 的评分偏差
+    rd: float = 350.0  # Glicko 评分偏差
     games: int = 0
+    volatility: float = 0.06  # Glicko-2 波动率
+
+
+class RatingObserver(Protocol):
+    def observe(self, profile: LadderProfile) -> None:
+        ...
 
 
-def settle_match_1v1(winner: LadderProfile, loser: LadderProfile, system: RatingSystem) -> None:
+def settle_match_1v1(
+    winner: LadderProfile, loser: LadderProfile, system: RatingSystem, observer: Optional[RatingObserver] = None
+) -> None:
     new_winner, new_loser = system.update_1v1(winner.rating, loser.rating, 1.0)
     winner.rating = round(new_winner, 2)
     loser.rating = round(new_loser, 2)
     winner.games += 1
     loser.games += 1
+    if observer is not None:
+        observer.observe(winner)
+        observer.observe(loser)
+
+
+def settle_matches_1v1(
+    profiles: List[LadderProfile],
+    winners: Sequence[int],
+    losers: Sequence[int],
+    system: RatingSystem,
+    observer: Optional[RatingObserver] = None,
+) -> None:
+    """settle_match_1v1 for each (winners[i], losers[i]) index pair into `profiles`, in order.
+
+    Ratings are worked on as one flat array and written back once; systems with an
+    update_1v1_batch method (EloRating) run their own loop without per-match calls.
+    `observer` sees each player who played once, with their final rating.
+    """
+    ratings = array("d", (p.rating for p in profiles))
+    batch = getattr(system, "update_1v1_batch", None)
+    if batch is not None:
+        batch(ratings, winners, losers, [1.0] * len(winners), ndigits=2)
+    else:
+        update = system.update_1v1
+        for w, l in zip(winners, losers):
+            nw, nl = update(ratings[w], ratings[l], 1.0)
+            ratings[w], ratings[l] = round(nw, 2), round(nl, 2)
+    games = [0] * len(profiles)
+    for i in winners:
+        games[i] += 1
+    for i in losers:
+        games[i] += 1
+    for p, rating, played in zip(profiles, ratings, games):
+        p.rating = rating
+        p.games += played
+        if played and observer is not None:
+            observer.observe(p)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Deque, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .game import Action, ActionType, BoardGameEngine, GameState, Unit
+
+# one submitted action: player_id, unit_id, action type value, target x, target y
+ActionRecord = Tuple[str, str, str, int, int]
+
+
+def dump_opening(state: GameState) -> dict:
+    return {
+        "width": state.width,
+        "height": state.height,
+        "turn": state.turn,
+        "current_player": state.current_player,
+        "units": [
+            [u.unit_id, u.player_id, u.hp, u.attack, u.move_range, u.skill_damage, u.cooldown, *u.position]
+            for u in state.units.values()
+        ],
+    }
+
+
+def load_opening(data: dict) -> GameState:
+    state = GameState(
+        width=data["width"], height=data["height"], turn=data["turn"], current_player=data["current_player"]
+    )
+    for uid, pid, hp, atk, move, skill, cooldown, x, y in data["units"]:
+        state.units[uid] = Unit(uid, pid, hp, atk, move, skill, cooldown, (x, y))
+    return state
+
+
+def encode_game(game_id: str, opening: GameState, actions: Sequence[ActionRecord], winner: Optional[str] = None) -> str:
+    """One JSON line as read by verify_stream; `winner` is the result the client claimed."""
+    record = {"game_id": game_id, "opening": dump_opening(opening), "actions": [list(a) for a in actions]}
+    if winner is not None:
+        record["winner"] = winner
+    return json.dumps(record, separators=(",", ":"))
+
+
+@dataclass
+class GameVerdict:
+    game_id: str
+    ok: bool
+    actions: int
+    winner: Optional[str]
+    illegal_index: Optional[int] = None
+    reason: str = ""
+
+
+def verify_game(record: dict) -> GameVerdict:
+    """Replay a submitted game through the rules; stops at the first illegal action."""
+    game_id = str(record["game_id"])
+    engine = BoardGameEngine(load_opening(record["opening"]))
+    state = engine.state
+    for i, (pid, uid, kind, x, y) in enumerate(record["actions"]):
+        try:
+            action = Action(uid, ActionType(kind), (x, y))
+        except ValueError:
+            return GameVerdict(game_id, False, i, state.winner, i, "unsupported action")
+        error = engine.validate(pid, action)
+        if error:
+            return GameVerdict(game_id, False, i, state.winner, i, error)
+        engine.make(action)
+    count = len(record["actions"])
+    if "winner" in record and record["winner"] != state.winner:
+        return GameVerdict(game_id, False, count, state.winner, reason=f"claimed winner {record['winner']!r}")
+    return GameVerdict(game_id, True, count, state.winner)
+
+
+def verify_lines(lines: List[str]) -> List[GameVerdict]:
+    """Worker entry point: parsing happens here so the reader process only moves text."""
+    out = []
+    for line in lines:
+        record = None
+        try:
+            record = json.loads(line)
+            out.append(verify_game(record))
+        except (KeyError, TypeError, ValueError) as err:
+            game_id = record.get("game_id", "?") if isinstance(record, dict) else "?"
+            out.append(GameVerdict(str(game_id), False, 0, None, reason=f"malformed record: {err}"))
+    return out
+
+
+def read_lines(path: str) -> Iterator[str]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+def verify_stream(lines: Iterable[str], workers: int = 1, chunksize: int = 256) -> Iterator[GameVerdict]:
+    """Verdicts in input order; at most 2 chunks per worker are in flight, so memory stays flat."""
+    it = iter(lines)
+    if workers <= 1:
+        while True:
+            chunk = list(itertools.islice(it, chunksize))
+            if not chunk:
+                return
+            yield from verify_lines(chunk)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window: Deque[Future] = deque()
+        while True:
+            chunk = list(itertools.islice(it, chunksize))
+            if chunk:
+                window.append(pool.submit(verify_lines, chunk))
+            if window and (not chunk or len(window) >= 2 * workers):
+                yield from window.popleft().result()
+            if not chunk and not window:
+                return
+
+
+@dataclass
+class VerifyReport:
+    games: int = 0
+    illegal: int = 0
+    actions: int = 0
+    seconds: float = 0.0
+    failures: List[GameVerdict] = field(default_factory=list)
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.seconds if self.seconds else 0.0
+
+
+def verify_file(path: str, workers: Optional[int] = None, chunksize: int = 256, max_failures: int = 1000) -> VerifyReport:
+    """Verify a JSON-lines file of games; keeps the first `max_failures` failing verdicts."""
+    report = VerifyReport()
+    start = time.perf_counter()
+    for verdict in verify_stream(read_lines(path), workers or os.cpu_count() or 1, chunksize):
+        report.games += 1
+        report.actions += verdict.actions
+        if not verdict.ok:
+            report.illegal += 1
+            if len(report.failures) < max_failures:
+                report.failures.append(verdict)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Re-check submitted games (JSON lines) against the rules")
+    p.add_argument("path")
+    p.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    p.add_argument("--chunksize", type=int, default=256)
+    args = p.parse_args()
+
+    report = verify_file(args.path, args.workers, args.chunksize)
+    for v in report.failures:
+        where = f"action #{v.illegal_index}" if v.illegal_index is not None else "result"
+        print(f"{v.game_id}: {where}: {v.reason}")
+    print(
+        f"games={report.games} illegal={report.illegal} actions={report.actions} "
+        f"time={report.seconds:.2f}s {report.games_per_second:,.0f} games/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import random
+import unittest
+
+from social_game.batch import ActionBatch, BatchEngine, np
+from social_game.engine import GameRoom, PlayerAction
+
+
+# the stdlib loops always run; the NumPy steps when numpy is installed
+BACKENDS = (False, True) if np is not None else (False,)
+
+
+class BatchEngineTests(unittest.TestCase):
+    def test_matches_scalar_game_room(self):
+        for vectorized in BACKENDS:
+            with self.subTest(vectorized=vectorized):
+                self.check_matches_scalar_game_room(BatchEngine(40, vectorized=vectorized))
+
+    def check_matches_scalar_game_room(self, engine):
+        rng = random.Random(3)
+        n = engine.n
+        rooms = [GameRoom(f"batch-{r}", "p1", "p2") for r in range(n)]
+        winners = [None] * n
+
+        while engine.active():
+            running = engine.active()
+            phases = [engine.random_actions(rng, p, running) for p in (0, 1)]
+            for r in running:
+                for batch in phases:
+                    pid = engine.player_ids[batch.player[r]]
+                    rooms[r].submit_action(
+                        PlayerAction(
+                            pid,
+                            max(batch.unit_index[r], 0),
+                            batch.target_x[r],
+                            batch.target_y[r],
+                            use_skill=bool(batch.use_skill[r]),
+                        )
+                    )
+                winners[r] = rooms[r].resolve_turn().winner
+            engine.resolve_turn(phases)
+
+            for r in running:
+                self.assertEqual(engine.to_room(r).snapshot()["players"], rooms[r].snapshot()["players"])
+                self.assertEqual(engine.to_room(r).score, rooms[r].score)
+                expected = -1 if winners[r] is None else engine.player_ids.index(winners[r])
+                self.assertEqual(engine.winner[r], expected)
+
+    def test_finished_rooms_are_frozen(self):
+        for vectorized in BACKENDS:
+            with self.subTest(vectorized=vectorized):
+                engine = BatchEngine(2, vectorized=vectorized)
+                engine.winner[0] = 1
+                batch = ActionBatch.from_actions([PlayerAction("p1", 0, 1, 0)] * 2, engine.player_ids)
+                engine.resolve_turn([batch])
+                self.assertEqual(engine.turn[0], 1)
+                self.assertEqual(engine.turn[1], 2)
+                self.assertEqual(engine.x[0], 0)
+                self.assertEqual(engine.x[engine.units_per_room], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from social_game.ai import BotPolicy
+from social_game.compact import CompactRoom
+from social_game.engine import GameRoom, PlayerAction
+from social_game.render import render_board
+
+
+def random_action(rng: random.Random, room, player_id: str) -> PlayerAction:
+    units = room.players[player_id].units
+    if not units:
+        return PlayerAction(player_id, 0, 0, 0)
+    i = rng.randrange(len(units))
+    tx, ty = rng.choice(room.legal_moves(player_id, i))
+    return PlayerAction(player_id, i, tx, ty, use_skill=rng.random() < 0.5)
+
+
+class CompactRoomTests(unittest.TestCase):
+    def test_matches_game_room_over_random_games(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            room = GameRoom("r1", "p1", "p2")
+            compact = CompactRoom("r1", "p1", "p2")
+            while True:
+                order = ["p1", "p2"] if rng.random() < 0.5 else ["p2", "p1"]
+                for pid in order:
+                    action = random_action(rng, room, pid)
+                    room.submit_action(action)
+                    compact.submit_action(action)
+                for i in range(len(room.players["p1"].units)):
+                    self.assertEqual(room.legal_moves("p1", i), compact.legal_moves("p1", i))
+                expected = room.resolve_turn()
+                actual = compact.resolve_turn()
+                self.assertEqual(expected, actual)
+                self.assertEqual(room.snapshot(), compact.snapshot())
+                if expected.winner:
+                    break
+
+    def test_apply_undo_restores_state(self):
+        room = CompactRoom("r1", "p1", "p2")
+        before = room.snapshot()
+        room.apply([PlayerAction("p1", 0, 2, 0), PlayerAction("p2", 0, 2, 4)])
+        room.apply([PlayerAction("p1", 0, 2, 2), PlayerAction("p2", 0, 2, 2, use_skill=True)])
+        self.assertEqual(room.turn, 3)
+        room.undo()
+        room.undo()
+        self.assertEqual(room.snapshot(), before)
+        with self.assertRaises(RuntimeError):
+            room.undo()
+
+    def test_clone_is_independent(self):
+        room = CompactRoom("r1", "p1", "p2")
+        copy = room.clone()
+        copy.apply([PlayerAction("p1", 0, 1, 1), PlayerAction("p2", 0, 3, 3)])
+        self.assertEqual(room.turn, 1)
+        self.assertEqual(copy.turn, 2)
+
+    def test_bot_and_renderer_accept_compact_room(self):
+        room = GameRoom("r1", "p1", "p2")
+        compact = CompactRoom.from_room(room)
+        self.assertEqual(BotPolicy("p2").choose_action(compact), BotPolicy("p2").choose_action(room))
+        self.assertEqual(render_board(compact, "p1", "p2"), render_board(room, "p1", "p2"))
+
+
+if __name__ == "__main__":
+    unittest.main()
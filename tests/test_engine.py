@@ -1,6 +1,7 @@
+import random
 import unittest
 
-from social_game.ai import BotPolicy
+from social_game.ai import BotPolicy, choose_actions_batch
 from social_game.engine import GameRoom, PlayerAction
 from social_game.render import render_board
 
@@ -15,6 +16,30 @@ class EngineTests(unittest.TestCase):
         self.assertEqual(room.turn, 2)
         self.assertTrue(result.events)
 
+    def test_room_board_is_configurable(self):
+        room = GameRoom("r1", "p1", "p2", width=9, height=7, control_points=[(4, 3)])
+        self.assertEqual(room.snapshot()["control_points"], [(4, 3)])
+        self.assertIn((2, 0), room.legal_moves("p1", 0))
+        self.assertIn("0 1 2 3 4 5 6 7 8", render_board(room, "p1", "p2"))
+        self.assertEqual([(u.x, u.y) for u in room.players["p2"].units], [(8, 6), (8, 5)])
+        with self.assertRaises(ValueError):
+            GameRoom("r2", "p1", "p2", width=3, height=3)  # default control point (1, 3) is off the board
+        with self.assertRaises(ValueError):
+            GameRoom("r3", "p1", "p2", width=1, height=5, control_points=[])
+
+    def test_occupancy_tracks_moves_and_deaths(self):
+        room = GameRoom("r1", "p1", "p2")
+        room.players["p2"].units[0].hp = 1
+        room.players["p2"].units[0].x, room.players["p2"].units[0].y = 1, 0
+        room.rebuild_occupancy()
+        room.submit_action(PlayerAction("p1", 0, 1, 0))
+        room.submit_action(PlayerAction("p2", 1, 4, 2))
+        result = room.resolve_turn()
+
+        self.assertIn("p2 lost 1 unit(s)", result.events.lines())
+        self.assertIsNone(room._unit_at("p2", 1, 0))
+        self.assertIs(room._unit_at("p2", 4, 2), room.players["p2"].units[0])
+
     def test_snapshot_contains_players_and_score(self):
         room = GameRoom("r1", "p1", "p2")
         snap = room.snapshot()
@@ -29,6 +54,29 @@ class EngineTests(unittest.TestCase):
         self.assertEqual(action.player_id, "p2")
         self.assertGreaterEqual(action.unit_index, 0)
 
+    def test_batch_bot_matches_scalar_bot(self):
+        rng = random.Random(5)
+        rooms = []
+        for i in range(60):
+            room = GameRoom(f"r{i}", "p1", "p2")
+            for state in room.players.values():
+                for unit in state.units:
+                    unit.x, unit.y = rng.randrange(5), rng.randrange(5)
+                    unit.skill_used = rng.random() < 0.3
+                state.units = state.units[: rng.randrange(3)]
+            room.rebuild_occupancy()
+            rooms.append(room)
+        player_ids = [rng.choice(["p1", "p2"]) for _ in rooms]
+
+        # duplicate layouts so some score grids are shared across rooms
+        rooms += [GameRoom(f"d{i}", "p1", "p2") for i in range(10)]
+        player_ids += ["p1"] * 10
+        batched = choose_actions_batch(rooms, player_ids)
+        # the batched path scores from its own shared grids, not each room's influence map
+        self.assertTrue(all(not room._influence for room in rooms))
+        expected = [BotPolicy(pid).choose_action(room) for room, pid in zip(rooms, player_ids)]
+        self.assertEqual(batched, expected)
+
     def test_render_board_has_coordinates(self):
         room = GameRoom("r1", "p1", "p2")
         board = render_board(room, "p1", "p2")
@@ -0,0 +1,51 @@
+import unittest
+
+from social_game.engine import GameRoom, PlayerAction
+from social_game.events import Event, EventCode, EventLog
+from social_game.wal import dump_room, load_room
+
+
+def play_opening(room: GameRoom):
+    room.submit_action(PlayerAction("p1", 0, 2, 0))
+    room.submit_action(PlayerAction("p2", 5, 0, 0))
+    return room.resolve_turn()
+
+
+class EventLogTests(unittest.TestCase):
+    def test_events_are_typed_and_format_lazily(self):
+        result = play_opening(GameRoom("r1", "p1", "p2"))
+        self.assertEqual(
+            list(result.events),
+            [
+                Event(EventCode.TURN, (1,)),
+                Event(EventCode.MOVED, (0, 0, 2, 0)),
+                Event(EventCode.SKIPPED, (1,)),
+            ],
+        )
+        self.assertEqual(
+            result.events.lines(),
+            ["turn 1 resolve", "p1 moved scout to (2, 0)", "p2 invalid unit index, skipped"],
+        )
+
+    def test_room_log_keeps_whole_match_and_round_trips(self):
+        room = GameRoom("r1", "p1", "p2")
+        play_opening(room)
+        play_opening(room)
+        self.assertEqual(len(room.event_log), 6)
+        restored = EventLog.from_bytes(("p1", "p2"), room.event_log.to_bytes())
+        self.assertEqual(restored, room.event_log)
+
+    def test_headless_room_records_nothing(self):
+        room = GameRoom("r1", "p1", "p2", record_events=False)
+        result = play_opening(room)
+        self.assertEqual(len(result.events), 0)
+        self.assertEqual(len(room.event_log), 0)
+        self.assertEqual(room.turn, 2)
+
+        reloaded = load_room(dump_room(room), record_events=False)
+        self.assertEqual(len(play_opening(reloaded).events), 0)
+        self.assertEqual(reloaded.snapshot()["turn"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
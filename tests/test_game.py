@@ -1,6 +1,7 @@
+import random
 import unittest
 
-from src.game import Action, ActionType, BoardGameEngine, RuleError, create_mirror_opening
+from src.game import Action, ActionType, BoardGameEngine, GameState, RuleError, Unit, create_mirror_opening
 
 
 class TestGameEngine(unittest.TestCase):
@@ -25,6 +26,77 @@ class TestGameEngine(unittest.TestCase):
         engine.submit_action("p1", Action("p1_u2", ActionType.SKILL, (2, 3)))
         self.assertEqual(state.units["p1_u2"].cooldown, 1)
 
+    def test_indexes_track_random_three_player_game(self):
+        rng = random.Random(7)
+        state = GameState(width=6, height=6)
+        cells = rng.sample([(x, y) for x in range(6) for y in range(6)], 9)
+        for i, pos in enumerate(cells):
+            pid = f"p{i % 3 + 1}"
+            state.units[f"{pid}_u{i}"] = Unit(f"{pid}_u{i}", pid, hp=4, attack=2, move_range=2, skill_damage=3, position=pos)
+        engine = BoardGameEngine(state)
+        self.assertEqual(state.turn_order, ["p1", "p2", "p3"])
+
+        for _ in range(2000):
+            if state.winner:
+                break
+            pid = state.current_player
+            try:
+                unit = rng.choice(state.friend_units(pid) or list(state.units.values()))
+                target = (unit.position[0] + rng.randint(-2, 2), unit.position[1] + rng.randint(-2, 2))
+                engine.submit_action(pid, Action(unit.unit_id, rng.choice(list(ActionType)), target))
+            except RuleError:
+                continue
+            alive = [u for u in state.units.values() if u.alive]
+            for x in range(6):
+                for y in range(6):
+                    expected = next((u for u in alive if u.position == (x, y)), None)
+                    self.assertIs(state.unit_at((x, y)), expected)
+            for p in state.turn_order:
+                self.assertEqual({u.unit_id for u in state.friend_units(p)}, {u.unit_id for u in alive if u.player_id == p})
+            alive_players = {u.player_id for u in alive}
+            self.assertEqual(state.winner, alive_players.pop() if len(alive_players) == 1 else None)
+
+    def test_legal_actions_match_validate(self):
+        state = create_mirror_opening()
+        state.units["p1_u2"].position = (2, 1)
+        state.units["p2_u2"].position = (2, 3)
+        state.units["p2_u1"].position = (2, 2)
+        engine = BoardGameEngine(state)
+        for pid in ("p1", "p2"):
+            brute = [
+                (a.unit_id, a.action_type, a.target)
+                for uid in state.units
+                for kind in ActionType
+                for a in [Action(uid, kind, (x, y)) for x in range(5) for y in range(5)]
+                if engine.validate(pid, a) is None
+            ]
+            legal = [(a.unit_id, a.action_type, a.target) for a in engine.legal_actions(pid)]
+            self.assertEqual(sorted(legal), sorted(brute))
+        self.assertEqual(engine.validate("p1", Action("p2_u1", ActionType.MOVE, (3, 2))), "cannot control enemy unit")
+
+    def test_make_unmake_restores_state(self):
+        rng = random.Random(3)
+        state = create_mirror_opening()
+        engine = BoardGameEngine(state)
+
+        def fingerprint():
+            units = tuple((u.unit_id, u.hp, u.cooldown, u.position) for u in state.units.values())
+            index = tuple((x, y, getattr(state.unit_at((x, y)), "unit_id", None)) for x in range(5) for y in range(5))
+            friends = tuple(tuple(u.unit_id for u in state.friend_units(p)) for p in state.turn_order)
+            return units, index, friends, state.turn, state.current_player, state.winner, len(state.turn_log)
+
+        for _ in range(50):
+            before = fingerprint()
+            tokens = []
+            while len(tokens) < 12 and not state.winner:
+                tokens.append(engine.make(rng.choice(list(engine.legal_actions(state.current_player)))))
+            for token in reversed(tokens):
+                engine.unmake(token)
+            self.assertEqual(fingerprint(), before)
+            if state.winner:
+                break
+            engine.submit_action(state.current_player, rng.choice(list(engine.legal_actions(state.current_player))))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,60 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.glicko import Glicko2, read_match_log
+from src.rating import LadderProfile
+
+
+class Glicko2Tests(unittest.TestCase):
+    def test_glickman_worked_example(self):
+        profiles = {
+            "p": LadderProfile("p", 1500, 200),
+            "o1": LadderProfile("o1", 1400, 30),
+            "o2": LadderProfile("o2", 1550, 100),
+            "o3": LadderProfile("o3", 1700, 300),
+        }
+        Glicko2().rate_period(profiles, [("p", "o1", 1.0), ("p", "o2", 0.0), ("p", "o3", 0.0)])
+        p = profiles["p"]
+        self.assertAlmostEqual(p.rating, 1464.06, places=1)
+        self.assertAlmostEqual(p.rd, 151.52, places=1)
+        self.assertAlmostEqual(p.volatility, 0.059996, places=6)
+        self.assertEqual(p.games, 3)
+
+    def test_idle_players_inflate_rd_up_to_cap(self):
+        profiles = {"idle": LadderProfile("idle", 1600, 50), "new": LadderProfile("new", 1500, 349.9)}
+        Glicko2().rate_period(profiles, [])
+        self.assertEqual(profiles["idle"].rating, 1600)
+        self.assertGreater(profiles["idle"].rd, 50)
+        self.assertAlmostEqual(profiles["idle"].rd, (50**2 + (0.06 * 173.7178) ** 2) ** 0.5, places=6)
+        self.assertEqual(profiles["new"].rd, 350.0)
+
+    def test_stream_matches_batch_periods_and_skips_gaps(self):
+        rng = random.Random(5)
+        players = [f"p{i}" for i in range(12)]
+        log = []
+        for period in (1, 2, 4):
+            for _ in range(30):
+                a, b = rng.sample(players, 2)
+                log.append((period, a, b, rng.choice((0.0, 0.5, 1.0))))
+
+        system = Glicko2()
+        batch = {}
+        for period in (1, 2, 3, 4):
+            system.rate_period(batch, [(a, b, s) for n, a, b, s in log if n == period])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "log.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(f"{n},{a},{b},{s}\n" for n, a, b, s in log)
+            streamed = {}
+            self.assertEqual(system.rate_stream(streamed, read_match_log(path)), 4)
+
+        self.assertEqual(streamed, batch)
+        with self.assertRaises(ValueError):
+            system.rate_stream({}, [(2, "a", "b", 1.0), (1, "a", "b", 1.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
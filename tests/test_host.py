@@ -0,0 +1,73 @@
+import asyncio
+import unittest
+
+from social_game.engine import PlayerAction
+from social_game.host import RoomBusy, RoomHost
+
+
+class RoomHostTests(unittest.TestCase):
+    def test_bot_fills_turn_and_resolves_once(self):
+        async def scenario():
+            results = []
+            host = RoomHost(on_result=lambda room_id, result: results.append((room_id, result)))
+            room = host.open_room("r1", "you", "bot", bots=["bot"])
+            fut = await host.submit_action("r1", PlayerAction("you", 0, 1, 0))
+            result = await fut
+            await host.shutdown()
+            return room, results, result
+
+        room, results, result = asyncio.run(scenario())
+        self.assertEqual(room.turn, 2)
+        self.assertEqual(len(results), 1)
+        self.assertIs(results[0][1], result)
+        self.assertEqual(result.events.lines()[0], "turn 1 resolve")
+
+    def test_bot_only_rooms_play_to_completion(self):
+        async def scenario():
+            winners = []
+            host = RoomHost(on_result=lambda room_id, r: r.winner and winners.append(room_id))
+            for i in range(20):
+                host.open_room(f"r{i}", "a", "b", bots=["a", "b"])
+            while host.rooms:
+                await asyncio.sleep(0.01)
+            await host.shutdown()
+            return winners
+
+        self.assertEqual(sorted(asyncio.run(scenario())), sorted(f"r{i}" for i in range(20)))
+
+    def test_full_inbox_applies_backpressure(self):
+        async def scenario():
+            host = RoomHost(inbox_size=1)
+            host.open_room("r1", "a", "b")
+            host.submit_nowait("r1", PlayerAction("a", 0, 1, 0))
+            with self.assertRaises(RoomBusy):
+                host.submit_nowait("r1", PlayerAction("a", 0, 1, 0))
+            await host.shutdown()
+            with self.assertRaises(RuntimeError):
+                await host.submit_action("r1", PlayerAction("a", 0, 1, 0))
+
+        asyncio.run(scenario())
+
+    def test_blocked_submit_fails_when_host_stops(self):
+        async def scenario():
+            host = RoomHost(inbox_size=1)
+            host.open_room("r1", "a", "b")
+            lock = host.rooms["r1"].lock
+            await lock.acquire()  # stall the room's actor on its first action
+            first = host.submit_nowait("r1", PlayerAction("a", 0, 1, 0))
+            await asyncio.sleep(0)
+            queued = host.submit_nowait("r1", PlayerAction("a", 0, 1, 0))
+            blocked = asyncio.ensure_future(host.submit_action("r1", PlayerAction("a", 0, 1, 0)))
+            await asyncio.sleep(0)
+            self.assertFalse(blocked.done())
+            await host.shutdown(drain=False)
+            fut = await asyncio.wait_for(blocked, 1)
+            with self.assertRaises(RuntimeError):
+                await asyncio.wait_for(fut, 1)
+            self.assertTrue(first.cancelled() and queued.cancelled())
+
+        asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from social_game.compact import CompactRoom
+from social_game.engine import GameRoom, PlayerAction
+from social_game.influence import CONTESTED, FREE, HELD, LOST
+
+
+def score_move(room: GameRoom, enemy_id: str, tx: int, ty: int) -> int:
+    """The bot's original per-cell heuristic, kept as the reference for move_score."""
+    score = 0
+    if (tx, ty) in room.control_points:
+        score += 6
+    for enemy in room.players[enemy_id].units:
+        if (enemy.x, enemy.y) == (tx, ty):
+            score += 7
+        dist = abs(enemy.x - tx) + abs(enemy.y - ty)
+        score += max(0, 3 - dist)
+    return score
+
+
+class InfluenceMapTests(unittest.TestCase):
+    def test_move_score_matches_scalar_heuristic(self):
+        room = GameRoom("r1", "p1", "p2")
+        influence = room.influence("p1")
+        for x in range(room.width):
+            for y in range(room.height):
+                self.assertEqual(influence.score(x, y), score_move(room, "p2", x, y))
+
+    def test_threat_distance_and_contest(self):
+        room = GameRoom("r1", "p1", "p2")
+        room.players["p1"].units[0].x, room.players["p1"].units[0].y = 2, 2
+        room.players["p2"].units[0].x, room.players["p2"].units[0].y = 2, 2
+        room.players["p2"].units[1].x, room.players["p2"].units[1].y = 3, 1
+        room.players["p1"].units[1].x, room.players["p1"].units[1].y = 3, 1
+        room.rebuild_occupancy()
+        influence = room.influence("p1")
+        # scout (atk 2, range 2) and bruiser (atk 3, range 1), both with skill unused
+        self.assertEqual(influence.threat[2 * room.height + 1], 3 + 4)
+        self.assertEqual(influence.threat[0], 0)
+        self.assertEqual(influence.nearest_enemy[0], 4)
+        self.assertEqual(influence.contest, [CONTESTED, FREE, CONTESTED])
+        self.assertEqual(HELD | LOST, CONTESTED)
+
+    def test_cache_is_invalidated_by_resolve_turn(self):
+        for room in (GameRoom("r1", "p1", "p2"), CompactRoom("r1", "p1", "p2")):
+            before = room.influence("p1")
+            self.assertIs(room.influence("p1"), before)
+            room.submit_action(PlayerAction("p1", 0, 1, 0))
+            room.submit_action(PlayerAction("p2", 0, 3, 4))
+            room.resolve_turn()
+            self.assertIsNot(room.influence("p1"), before)
+            self.assertNotEqual(room.influence("p1").move_score, before.move_score)
+
+
+if __name__ == "__main__":
+    unittest.main()
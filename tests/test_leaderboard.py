@@ -0,0 +1,62 @@
+import random
+import unittest
+
+from src.leaderboard import Leaderboard
+from src.rating import EloRating, LadderProfile, settle_match_1v1, settle_matches_1v1
+
+
+def sorted_board(ratings):
+    return sorted(ratings.items(), key=lambda e: (-e[1], e[0]))
+
+
+class LeaderboardTests(unittest.TestCase):
+    def test_queries_match_full_sort_under_churn(self):
+        load, Leaderboard.LOAD = Leaderboard.LOAD, 4  # force many block splits and merges
+        try:
+            rng = random.Random(11)
+            ratings = {f"p{i}": float(rng.randrange(900, 1100, 5)) for i in range(300)}
+            board = Leaderboard.from_ratings(ratings.items())
+            for step in range(2000):
+                pid = f"p{rng.randrange(360)}"
+                if rng.random() < 0.15 and pid in ratings:
+                    del ratings[pid]
+                    self.assertTrue(board.remove(pid))
+                else:
+                    ratings[pid] = float(rng.randrange(900, 1100, 5))
+                    board.update(pid, ratings[pid])
+                if step % 200 == 0:
+                    expected = sorted_board(ratings)
+                    self.assertEqual(board.top(len(expected) + 5), expected)
+                    for rank, (p, _) in enumerate(expected, 1):
+                        self.assertEqual(board.rank(p), rank)
+                        self.assertEqual(board.at(rank)[0], p)
+        finally:
+            Leaderboard.LOAD = load
+
+        self.assertEqual(len(board), len(ratings))
+        self.assertIsNone(board.rank("nobody"))
+
+    def test_ties_page_percentile_and_cutoff(self):
+        board = Leaderboard.from_ratings([("c", 1200.0), ("a", 1200.0), ("b", 1100.0), ("d", 1000.0), ("a", 1300.0)])
+        self.assertEqual(board.top(2), [("a", 1300.0), ("c", 1200.0)])
+        board.update("b", 1200.0)
+        self.assertEqual([p for p, _ in board.top(4)], ["a", "b", "c", "d"])
+        self.assertEqual(board.around("c", radius=1), (2, [("b", 1200.0), ("c", 1200.0), ("d", 1000.0)]))
+        self.assertEqual(board.around("a", radius=1), (1, [("a", 1300.0), ("b", 1200.0)]))
+        self.assertEqual(board.percentile("a"), 100.0)
+        self.assertEqual(board.percentile("d"), 25.0)
+        self.assertEqual(board.cutoff(0.5), 1200.0)
+        with self.assertRaises(IndexError):
+            board.at(5)
+
+    def test_settle_hooks_keep_board_live(self):
+        profiles = [LadderProfile(f"p{i}") for i in range(4)]
+        board = Leaderboard.from_ratings((p.player_id, p.rating) for p in profiles)
+        settle_match_1v1(profiles[3], profiles[0], EloRating(), board)
+        self.assertEqual(board.top(1), [("p3", 1016.0)])
+        settle_matches_1v1(profiles, [1, 1], [2, 3], EloRating(), observer=board)
+        self.assertEqual(board.top(4), sorted_board({p.player_id: p.rating for p in profiles}))
+
+
+if __name__ == "__main__":
+    unittest.main()
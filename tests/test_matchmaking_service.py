@@ -0,0 +1,84 @@
+import asyncio
+import unittest
+
+from src.matchmaking import ManualClock, PlayerTicket
+from src.matchmaking_service import MatchmakingService
+
+
+def ids(matches):
+    return sorted(tuple(sorted((a.player_id, b.player_id))) for a, b in matches)
+
+
+class MatchmakingServiceTests(unittest.TestCase):
+    def test_shard_round_and_cancel(self):
+        async def scenario():
+            svc = MatchmakingService(band_width=200, base_window=50, clock=ManualClock())
+            await svc.enqueue(PlayerTicket("a", 1000, 20))
+            await svc.enqueue(PlayerTicket("b", 1030, 20))
+            await svc.enqueue(PlayerTicket("c", 1020, 20))
+            await svc.enqueue(PlayerTicket("n", 1010, 2))  # newbie pool
+            self.assertEqual(svc.ticket("c").player_id, "c")
+            self.assertTrue(await svc.cancel("c"))
+            self.assertFalse(await svc.cancel("c"))
+            matches = await svc.run_round()
+            await svc.stop()
+            return svc, matches
+
+        svc, matches = asyncio.run(scenario())
+        self.assertEqual(ids(matches), [("a", "b")])
+        self.assertEqual(len(svc), 1)
+        self.assertEqual(sorted(svc.shards), [(False, 5), (True, 5)])
+
+    def test_border_tickets_match_across_bands(self):
+        async def scenario():
+            svc = MatchmakingService(band_width=200, base_window=50, clock=ManualClock())
+            for pid, rating in [("a", 1190), ("b", 1215), ("c", 1390), ("far", 1500)]:
+                await svc.enqueue(PlayerTicket(pid, rating, 20))
+            matches = await svc.run_round()
+            await svc.stop()
+            return svc, matches
+
+        svc, matches = asyncio.run(scenario())
+        self.assertEqual(ids(matches), [("a", "b")])
+        self.assertEqual(sorted(t for t in ("a", "b", "c", "far") if svc.ticket(t)), ["c", "far"])
+
+    def test_wide_windows_reach_bands_further_away(self):
+        async def scenario():
+            svc = MatchmakingService(band_width=200, base_window=50, clock=ManualClock())
+            # both have waited 100s: window 50 + 20 * 20 = 450, past the band in between
+            await svc.enqueue(PlayerTicket("low", 1010, 20, wait_seconds=100))
+            await svc.enqueue(PlayerTicket("high", 1410, 20, wait_seconds=100))
+            matches = await svc.run_round()
+            await svc.stop()
+            return matches
+
+        self.assertEqual(ids(asyncio.run(scenario())), [("high", "low")])
+
+    def test_requeue_keeps_wait_and_cadence_runs_rounds(self):
+        async def scenario():
+            clock = ManualClock()
+            matched = []
+            svc = MatchmakingService(base_window=50, round_interval=0.01, clock=clock, on_match=lambda a, b: matched.append((a, b)))
+            a, b = PlayerTicket("a", 1000, 20), PlayerTicket("b", 1160, 20)
+            await svc.enqueue(a)
+            await svc.enqueue(b)
+            self.assertEqual(await svc.run_round(), [])
+            clock.advance(30)
+            # e.g. a match offer both declined: back in the queue with 30s already waited (window 170)
+            await svc.cancel("a")
+            await svc.cancel("b")
+            await svc.requeue(a)
+            await svc.requeue(b)
+            svc.start()
+            for _ in range(100):
+                if matched:
+                    break
+                await asyncio.sleep(0.01)
+            await svc.stop()
+            return matched
+
+        self.assertEqual(ids(asyncio.run(scenario())), [("a", "b")])
+
+
+if __name__ == "__main__":
+    unittest.main()
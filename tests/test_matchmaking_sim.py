@@ -0,0 +1,27 @@
+import unittest
+
+from src.matchmaking_sim import SimConfig, simulate
+
+
+class MatchmakingSimTests(unittest.TestCase):
+    def test_every_arrival_is_accounted_for(self):
+        for mode in ("pop", "match_all"):
+            result = simulate(SimConfig(duration=600, arrival_rate=4, patience=30, mode=mode, seed=2))
+            self.assertGreater(result.matches, 100)
+            self.assertGreater(result.abandoned, 0)
+            self.assertEqual(2 * result.matches + result.abandoned + result.still_queued, result.arrivals)
+            self.assertEqual(len(result.waits), 2 * result.matches)
+            self.assertTrue(all(w <= 30 for w in result.waits))
+
+    def test_deterministic_summary(self):
+        config = SimConfig(duration=300, arrival_rate=3, seed=5)
+        first, second = simulate(config).summary(), simulate(config).summary()
+        for summary in (first, second):
+            summary.pop("cpu_us_per_call")
+        self.assertEqual(first, second)
+        self.assertEqual(sum(first["rating_gap"]["histogram"].values()), first["matches"])
+        self.assertEqual(first["config"]["mode"], "pop")
+
+
+if __name__ == "__main__":
+    unittest.main()
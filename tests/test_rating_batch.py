@@ -0,0 +1,56 @@
+import random
+import unittest
+from array import array
+
+from social_game.rating import EloRating, PlayerRating, TrueSkillLite
+from src.rating import EloRating as LadderElo
+from src.rating import LadderProfile, settle_match_1v1, settle_matches_1v1
+
+
+def random_matches(n_players, n_matches, seed):
+    rng = random.Random(seed)
+    a_idx, b_idx = [], []
+    for _ in range(n_matches):
+        a, b = rng.sample(range(n_players), 2)
+        a_idx.append(a)
+        b_idx.append(b)
+    return rng, a_idx, b_idx
+
+
+class RatingBatchTests(unittest.TestCase):
+    def test_elo_batch_matches_scalar_in_order(self):
+        rng, a_idx, b_idx = random_matches(20, 500, 1)
+        scores = [rng.choice([0.0, 0.5, 1.0]) for _ in a_idx]
+        elo = EloRating(k=24)
+        scalar = [1200.0 + 10 * i for i in range(20)]
+        for a, b, s in zip(a_idx, b_idx, scores):
+            scalar[a], scalar[b] = elo.update(scalar[a], scalar[b], s)
+        batch = array("d", (1200.0 + 10 * i for i in range(20)))
+        elo.update_batch(batch, a_idx, b_idx, scores)
+        self.assertEqual(list(batch), scalar)
+
+    def test_trueskill_batch_matches_scalar(self):
+        rng, a_idx, b_idx = random_matches(15, 400, 2)
+        wins = [rng.random() < 0.5 for _ in a_idx]
+        ts = TrueSkillLite()
+        players = [PlayerRating(25.0 + i, 8.333) for i in range(15)]
+        for a, b, w in zip(a_idx, b_idx, wins):
+            players[a], players[b] = ts.update_1v1(players[a], players[b], w)
+        mu = array("d", (25.0 + i for i in range(15)))
+        sigma = array("d", [8.333] * 15)
+        ts.update_1v1_batch(mu, sigma, a_idx, b_idx, wins)
+        self.assertEqual(list(mu), [p.mu for p in players])
+        self.assertEqual(list(sigma), [p.sigma for p in players])
+
+    def test_settle_matches_matches_scalar_settlement(self):
+        _, winners, losers = random_matches(30, 800, 3)
+        scalar = [LadderProfile(f"p{i}", rating=1000 + 7 * i) for i in range(30)]
+        for w, l in zip(winners, losers):
+            settle_match_1v1(scalar[w], scalar[l], LadderElo(k=24))
+        batched = [LadderProfile(f"p{i}", rating=1000 + 7 * i) for i in range(30)]
+        settle_matches_1v1(batched, winners, losers, LadderElo(k=24))
+        self.assertEqual(batched, scalar)
+
+
+if __name__ == "__main__":
+    unittest.main()
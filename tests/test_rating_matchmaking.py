@@ -1,6 +1,7 @@
+import random
 import unittest
 
-from src.matchmaking import MatchmakingQueue, PlayerTicket
+from src.matchmaking import ManualClock, MatchmakingQueue, PlayerTicket, TeamQueue, TeamSynergyRecord
 from src.rating import EloRating, LadderProfile, settle_match_1v1
 
 
@@ -27,6 +28,194 @@ class TestRatingAndQueue(unittest.TestCase):
         q.tick(15)
         self.assertIsNotNone(q.pop_match())
 
+    def test_waits_follow_injected_clock(self):
+        clock = ManualClock(100.0)
+        q = MatchmakingQueue(base_window=50, clock=clock)
+        a = PlayerTicket("a", 1000, newbie_games=20)
+        q.enqueue(a)
+        q.enqueue(PlayerTicket("b", 1090, newbie_games=20, wait_seconds=30))
+        clock.advance(9.5)
+        self.assertEqual(q.wait_seconds(a), 9.5)
+        self.assertIsNone(q.pop_match())  # a is at level 1: window 70 < 90
+        self.assertEqual([t.wait_seconds for t in q.queue], [9.5, 39.5])
+        clock.advance(0.5)
+        popped = q.pop_match()
+        self.assertEqual([t.player_id for t in popped], ["a", "b"])
+        self.assertEqual([t.wait_seconds for t in popped], [10.0, 40.0])
+
+    def test_pop_match_matches_pairwise_scan(self):
+        def reference(q):
+            queue, base_window, newbie_limit = q.queue, q.base_window, q.newbie_limit
+            best = None
+            for i in range(len(queue)):
+                for j in range(i + 1, len(queue)):
+                    a, b = queue[i], queue[j]
+                    if (a.newbie_games < newbie_limit) != (b.newbie_games < newbie_limit):
+                        continue
+                    diff = abs(a.rating - b.rating)
+                    if diff <= base_window + min(q.wait_seconds(a), q.wait_seconds(b)) // 5 * 20:
+                        if not best or diff < best[2]:
+                            best = (i, j, diff)
+            return None if best is None else (queue[best[0]].player_id, queue[best[1]].player_id)
+
+        rng = random.Random(5)
+        clock = ManualClock()
+        q = MatchmakingQueue(base_window=30, newbie_limit=10, clock=clock)
+        for n in range(3000):
+            op = rng.random()
+            if op < 0.5:
+                q.enqueue(PlayerTicket(f"p{n}", rng.randrange(900, 1400, 5), rng.choice([2, 20, 30]), rng.randrange(12)))
+            elif op < 0.6:
+                clock.advance(rng.uniform(0, 4))
+            elif op < 0.7:
+                q.tick(rng.randrange(1, 7))
+            else:
+                expected = reference(q)
+                got = q.pop_match()
+                self.assertEqual(None if got is None else (got[0].player_id, got[1].player_id), expected)
+
+    def test_levels_stop_at_rating_span(self):
+        clock = ManualClock()
+        q = MatchmakingQueue(base_window=80, clock=clock)
+        q.enqueue(PlayerTicket("old", 1000, newbie_games=20))
+        clock.advance(10_000)
+        self.assertIsNone(q.pop_match())
+        self.assertEqual(len(q._pools[False]), 1)  # one ticket: nothing to widen towards
+        q.enqueue(PlayerTicket("far", 2000, newbie_games=20))
+        self.assertEqual(len(q._pools[False]), 47)  # window(46) = 1000 covers the span
+        self.assertIsNone(q.pop_match())  # the pair's window is the shorter waiter's
+        clock.advance(46 * 5)
+        self.assertEqual([t.player_id for t in q.pop_match()], ["old", "far"])
+
+    def test_match_all_beats_greedy_pops(self):
+        def fill(q):
+            for i, rating in enumerate([1000, 1012, 1020, 1032, 1200, 1500, 1512]):
+                q.enqueue(PlayerTicket(f"p{i}", rating, newbie_games=20))
+
+        greedy = MatchmakingQueue(base_window=15, clock=ManualClock())
+        fill(greedy)
+        popped = []
+        while (pair := greedy.pop_match()) is not None:
+            popped.append(pair)
+        self.assertEqual(len(popped), 2)
+
+        q = MatchmakingQueue(base_window=15, clock=ManualClock())
+        fill(q)
+        pairs = [(a.player_id, b.player_id) for a, b in q.match_all()]
+        self.assertEqual(pairs, [("p0", "p1"), ("p2", "p3"), ("p5", "p6")])
+        self.assertEqual([t.player_id for t in q.queue], ["p4"])
+
+    def test_match_all_is_exact_for_equal_windows(self):
+        def brute(ratings, window):
+            # (pairs, total gap) of the best matching, by trying every partner for the lowest ticket
+            if len(ratings) < 2:
+                return 0, 0
+            first, rest = ratings[0], ratings[1:]
+            best = brute(rest, window)
+            for k, other in enumerate(rest):
+                if abs(other - first) <= window:
+                    pairs, gap = brute(rest[:k] + rest[k + 1 :], window)
+                    best = max(best, (pairs + 1, gap + abs(other - first)), key=lambda b: (b[0], -b[1]))
+            return best
+
+        rng = random.Random(3)
+        for trial in range(150):
+            ratings = [rng.randrange(1000, 1200, 5) for _ in range(rng.randrange(2, 9))]
+            q = MatchmakingQueue(base_window=40, clock=ManualClock())
+            for i, rating in enumerate(ratings):
+                q.enqueue(PlayerTicket(f"p{i}", rating, newbie_games=20))
+            pairs = q.match_all(lookback=1 + trial % 3)
+            self.assertEqual((len(pairs), sum(abs(a.rating - b.rating) for a, b in pairs)), brute(ratings, 40))
+
+    def test_match_all_respects_pools_and_windows(self):
+        rng = random.Random(9)
+        clock = ManualClock()
+        q = MatchmakingQueue(base_window=20, newbie_limit=10, clock=clock)
+        for i in range(400):
+            q.enqueue(PlayerTicket(f"p{i}", int(rng.gauss(1500, 200)), rng.choice([3, 30])))
+            clock.advance(rng.uniform(0, 0.2))
+        waits = {t.player_id: q.wait_seconds(t) for t in q.queue}
+        pairs = q.match_all()
+        seen = set()
+        for a, b in pairs:
+            self.assertEqual(a.newbie_games < 10, b.newbie_games < 10)
+            self.assertLessEqual(abs(a.rating - b.rating), 20 + min(waits[a.player_id], waits[b.player_id]) // 5 * 20)
+            seen.update((a.player_id, b.player_id))
+        self.assertEqual(len(seen), 2 * len(pairs))
+        self.assertEqual(len(q), 400 - len(seen))
+        self.assertTrue(all(t.player_id not in seen for t in q.queue))
+
+    def test_synergy_record_interns_ids(self):
+        record = TeamSynergyRecord()
+        record.record_win("a", "b")
+        record.record_win("b", "a")
+        self.assertAlmostEqual(record.get("a", "b"), 0.2)
+        self.assertAlmostEqual(record.get_ids(record.ids["b"], record.ids["a"]), 0.2)
+        self.assertEqual(record.get("a", "zz"), 0.0)
+        self.assertEqual(len(record), 1)
+        self.assertEqual(dict(record.pair_synergy), {("a", "b"): record.get("a", "b")})
+        self.assertNotIn(("b", "a"), record.pair_synergy)
+
+    def test_team_queue_balances_with_synergy(self):
+        def teams(match):
+            return sorted([sorted(t.player_id for t in match.team_a), sorted(t.player_id for t in match.team_b)])
+
+        synergy = TeamSynergyRecord()
+        for _ in range(5):
+            synergy.record_win("a", "b")
+        q = TeamQueue(synergy=synergy, clock=ManualClock())
+        for pid in "abcd":
+            q.enqueue(PlayerTicket(pid, 1500, 20))
+        q.enqueue(PlayerTicket("lone", 2500, 20))
+        # a and b play better together (+50), so they are split up
+        self.assertEqual([teams(m) for m in q.form_matches()], [[["a", "c"], ["b", "d"]]])
+        self.assertEqual(len(q), 1)
+
+        q = TeamQueue(clock=ManualClock())
+        q.enqueue(PlayerTicket("s1", 1530, 20))
+        q.enqueue(PlayerTicket("x", 1480, 20), PlayerTicket("y", 1550, 20))
+        q.enqueue(PlayerTicket("s2", 1490, 20))
+        self.assertEqual([teams(m) for m in q.form_matches()], [[["s1", "s2"], ["x", "y"]]])
+
+        # a lopsided duo averages 1500 but its members are outside the window
+        q = TeamQueue(clock=ManualClock())
+        q.enqueue(PlayerTicket("lo", 1200, 20), PlayerTicket("hi", 1800, 20))
+        q.enqueue(PlayerTicket("s1", 1500, 20))
+        q.enqueue(PlayerTicket("s2", 1500, 20))
+        self.assertEqual(q.form_matches(), [])
+
+    def test_team_queue_respects_pools_and_windows(self):
+        rng = random.Random(4)
+        q = TeamQueue(base_window=60, newbie_limit=10, clock=ManualClock())
+        pool, partner = {}, {}
+        for i in range(300):
+            newbie = rng.random() < 0.3
+            games = 2 if newbie else 30
+            if rng.random() < 0.3:
+                a, b = PlayerTicket(f"d{i}a", int(rng.gauss(1500, 200)), games), PlayerTicket(f"d{i}b", int(rng.gauss(1500, 200)), 30)
+                q.enqueue(a, b)
+                partner[a.player_id], partner[b.player_id] = b.player_id, a.player_id
+                pool[a.player_id] = pool[b.player_id] = newbie
+            else:
+                q.enqueue(PlayerTicket(f"s{i}", int(rng.gauss(1500, 200)), games))
+                pool[f"s{i}"] = newbie
+        total = len(q)
+        matches = q.form_matches()
+
+        seen = set()
+        for m in matches:
+            self.assertLessEqual(m.gap, 60)
+            ratings = [p.rating for p in m.team_a + m.team_b]
+            self.assertLessEqual(max(ratings) - min(ratings), 60)
+            self.assertEqual(len({pool[p.player_id] for p in m.team_a + m.team_b}), 1)
+            for team in (m.team_a, m.team_b):
+                ids = {p.player_id for p in team}
+                self.assertTrue(all(partner[pid] in ids for pid in ids if pid in partner))
+            seen.update(p.player_id for p in m.team_a + m.team_b)
+        self.assertEqual(len(seen), 4 * len(matches))
+        self.assertGreater(len(matches), 20)
+        self.assertEqual(len(q), total - len(seen))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,71 @@
+import copy
+import json
+import unittest
+
+from social_game.ai import BotPolicy
+from social_game.engine import GameRoom, PlayerAction
+from social_game.replay import Replay, ReplayRecorder, verify_replay, verify_replays
+from social_game.social import SocialHub
+from social_game.wal import dump_room
+
+
+def record_game(room_id: str, keyframe_interval: int = 3):
+    room = GameRoom(room_id, "p1", "p2")
+    recorder = ReplayRecorder(room, keyframe_interval=keyframe_interval)
+    snapshots = {room.turn: copy.deepcopy(room.snapshot())}
+    while True:
+        for pid in room.players:
+            room.submit_action(BotPolicy(pid).choose_action(room))
+        result = recorder.resolve_turn()
+        snapshots[room.turn] = copy.deepcopy(room.snapshot())
+        if result.winner:
+            return recorder.replay, snapshots
+
+
+class ReplayTests(unittest.TestCase):
+    def test_seek_matches_live_game(self):
+        replay, snapshots = record_game("r1")
+        self.assertTrue(all(t == 1 or (t - 1) % 3 == 0 for t in replay.keyframes))
+        for turn, snap in snapshots.items():
+            self.assertEqual(replay.seek(turn).snapshot(), snap)
+
+    def test_json_round_trip_and_hub_seek(self):
+        replay, snapshots = record_game("r1")
+        hub = SocialHub()
+        hub.save_replay(Replay.from_dict(json.loads(json.dumps(replay.to_dict()))))
+        self.assertEqual(hub.seek_replay("r1", 2).snapshot(), snapshots[2])
+
+    def test_verifier_flags_tampered_replays(self):
+        honest, _ = record_game("honest")
+        forged, _ = record_game("forged")
+        forged.winner = "p2" if forged.winner == "p1" else "p1"
+        edited, _ = record_game("edited")
+        edited.turns[0][0] = ("p1", 1, 0, 2, False)
+
+        self.assertTrue(verify_replay(honest).ok)
+        results = verify_replays([honest, forged, edited], workers=2, chunksize=1)
+        self.assertEqual([r.ok for r in results], [True, False, False])
+        self.assertIn("winner", results[1].reason)
+
+    def test_verifier_rejects_forged_opening(self):
+        replay, _ = record_game("r1")
+        replay.keyframes[1]["units"]["p1"][0][1] += 20  # extra hp from the first turn on
+        result = verify_replay(replay)
+        self.assertFalse(result.ok)
+        self.assertIn("opening", result.reason)
+
+        room = GameRoom("late", "p1", "p2")
+        room.turn = 3
+        late = ReplayRecorder(room).replay
+        self.assertFalse(verify_replay(late).ok)
+        self.assertTrue(verify_replay(late, opening=dump_room(room)).ok)
+
+    def test_recorder_requires_empty_turn(self):
+        room = GameRoom("r1", "p1", "p2")
+        room.submit_action(PlayerAction("p1", 0, 1, 0))
+        with self.assertRaises(ValueError):
+            ReplayRecorder(room)
+
+
+if __name__ == "__main__":
+    unittest.main()
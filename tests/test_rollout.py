@@ -0,0 +1,37 @@
+import unittest
+
+from social_game.engine import GameRoom
+from social_game.rollout import DIFFICULTY, RolloutBot, candidate_moves
+
+
+class RolloutBotTests(unittest.TestCase):
+    def test_pool_and_inline_agree_for_same_seed(self):
+        room = GameRoom("r1", "p1", "p2")
+        inline = RolloutBot("p2", rollouts=4, seed=5)
+        pooled = RolloutBot("p2", rollouts=4, seed=5, workers=2, batch_size=8)
+        try:
+            self.assertEqual(inline.choose_action(room), pooled.choose_action(room))
+        finally:
+            pooled.close()
+
+    def test_batches_cover_every_rollout_once(self):
+        bot = RolloutBot("p2", rollouts=10, batch_size=16)
+        moves = candidate_moves(GameRoom("r1", "p1", "p2"), "p2")
+        counts = {}
+        for batch in bot._jobs(moves):
+            self.assertLessEqual(sum(job[3] for job in batch), 16 + 10)
+            for cand, _, first, count in batch:
+                counts.setdefault(cand, []).extend(range(first, first + count))
+        self.assertEqual(sorted(counts), list(range(len(moves))))
+        self.assertTrue(all(sorted(ks) == list(range(10)) for ks in counts.values()))
+
+    def test_difficulty_presets(self):
+        bot = RolloutBot.for_difficulty("p2", "easy")
+        self.assertEqual(bot.rollouts, DIFFICULTY["easy"]["rollouts"])
+        self.assertEqual(bot.time_budget, DIFFICULTY["easy"]["time_budget"])
+        action = bot.choose_action(GameRoom("r1", "p1", "p2"))
+        self.assertEqual(action.player_id, "p2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from social_game.ai import BotPolicy
+from social_game.engine import GameRoom
+from social_game.search import SearchBot, TranspositionTable
+
+
+def play(room: GameRoom, bots) -> str:
+    while True:
+        for bot in bots:
+            room.submit_action(bot.choose_action(room))
+        result = room.resolve_turn()
+        if result.winner:
+            return result.winner
+
+
+class SearchBotTests(unittest.TestCase):
+    def test_returns_legal_move_within_budget(self):
+        ticks = iter(range(1_000_000))
+        room = GameRoom("r1", "p1", "p2")
+        # every clock read is one "second": the budget runs out after 40 reads, mid-search
+        bot = SearchBot("p2", time_budget=40, max_depth=4, clock=lambda: next(ticks))
+        action = bot.choose_action(room)
+        self.assertLess(bot.completed_depth, 4)
+        self.assertIn((action.target_x, action.target_y), room.legal_moves("p2", action.unit_index))
+
+        unbounded = SearchBot("p2", time_budget=float("inf"), max_depth=2)
+        unbounded.choose_action(room)
+        self.assertEqual(unbounded.completed_depth, 2)
+
+    def test_finishes_off_a_wounded_unit(self):
+        room = GameRoom("r1", "p1", "p2")
+        scout = room.players["p2"].units[0]
+        scout.hp, scout.x, scout.y = 1, 1, 1
+        room.rebuild_occupancy()
+        action = SearchBot("p1", time_budget=float("inf"), max_depth=2).choose_action(room)
+        self.assertEqual((action.target_x, action.target_y), (1, 1))
+
+    def test_beats_greedy_bot(self):
+        bot = SearchBot("p1", time_budget=float("inf"), max_depth=2)
+        winner = play(GameRoom("r1", "p1", "p2"), [bot, BotPolicy("p2")])
+        self.assertEqual(winner, "p1")
+
+    def test_transposition_table_is_bounded(self):
+        table = TranspositionTable(bits=4)
+        for key in range(1, 1000):
+            table.put(key, 1, float(key), None)
+        self.assertEqual(len(table._entries), 16)
+        self.assertEqual(table.get(999), (1, 999.0, None))
+        self.assertIsNone(table.get(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import random
+import unittest
+
+from social_game.ai import BotPolicy
+from social_game.engine import GameRoom, PlayerAction
+from social_game.sync import apply_delta, decode_delta, decode_snapshot, encode_delta, encode_snapshot
+
+
+class SnapshotSyncTests(unittest.TestCase):
+    def test_binary_snapshot_round_trips(self):
+        room = GameRoom("r1", "p1", "p2")
+        snap = room.snapshot()
+        raw = encode_snapshot(snap)
+        self.assertEqual(decode_snapshot(raw), snap)
+        self.assertLess(len(raw), len(json.dumps(snap)) // 3)
+
+    def test_wire_format_limits(self):
+        room = GameRoom("r1", "p1", "p2")
+        snap = room.snapshot()
+        unit = snap["players"]["p1"][0]
+        unit.update(id=255, hp=-32768, pos=[255, 255])
+        snap["turn"] = 65535
+        self.assertEqual(decode_snapshot(encode_snapshot(snap)), snap)
+        for field, value in (("id", 256), ("hp", 32768), ("atk", -1)):
+            bad = json.loads(json.dumps(snap))
+            bad["players"]["p1"][0][field] = value
+            with self.assertRaisesRegex(ValueError, "wire format"):
+                encode_snapshot(bad)
+        with self.assertRaises(ValueError):
+            encode_snapshot({**snap, "turn": 65536})
+
+        delta = room.snapshot_delta(1)
+        self.assertEqual(decode_delta(encode_delta({**delta, "removed": [0, 255]}))["removed"], [0, 255])
+        with self.assertRaisesRegex(ValueError, "removed unit id"):
+            encode_delta({**delta, "removed": [256]})
+
+    def test_client_rebuilds_state_from_binary_deltas(self):
+        rng = random.Random(11)
+        room = GameRoom("r1", "p1", "p2")
+        bots = [BotPolicy("p1"), BotPolicy("p2")]
+        client = decode_snapshot(encode_snapshot(room.snapshot()))
+        while True:
+            for bot in bots:
+                action = bot.choose_action(room)
+                if rng.random() < 0.3:
+                    action = PlayerAction(action.player_id, 0, rng.randrange(5), rng.randrange(5), True)
+                room.submit_action(action)
+            since = room.turn
+            result = room.resolve_turn()
+            client = apply_delta(client, decode_delta(encode_delta(room.snapshot_delta(since))))
+            self.assertEqual(client, room.snapshot())
+            if result.winner:
+                break
+
+    def test_delta_skips_unchanged_units(self):
+        room = GameRoom("r1", "p1", "p2")
+        room.submit_action(PlayerAction("p1", 0, 1, 0))
+        room.submit_action(PlayerAction("p2", 0, 9, 9))
+        room.resolve_turn()
+        delta = room.snapshot_delta(1)
+        self.assertEqual([u["id"] for u in delta["units"]], [0])
+        self.assertEqual(room.snapshot_delta(2)["units"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
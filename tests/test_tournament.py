@@ -0,0 +1,47 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from social_game.tournament import FIELDS, WinRate, aggregate, iter_results, run_tournament, schedule
+
+
+class TournamentTests(unittest.TestCase):
+    def test_results_file_and_win_rates(self):
+        specs = list(schedule(12, ["greedy", "random"], ["standard", "flipped", "random"], seed=3))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.csv")
+            games, _ = run_tournament(specs, path, workers=1)
+            with open(path, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+            rates = aggregate(path)
+
+        self.assertEqual(games, 12)
+        self.assertEqual(list(rows[0]), FIELDS)
+        self.assertEqual([int(r["game_id"]) for r in rows], list(range(12)))
+        self.assertTrue(all(r["winner"] in ("a", "b") for r in rows))
+        self.assertTrue(all(len(r["units"].split(";")) == 4 for r in rows))
+        # every game counts once from each seat, mirror games once in total
+        mirrors = [r for r in rows if r["policy_a"] == r["policy_b"]]
+        self.assertTrue(mirrors)
+        self.assertEqual(sum(r.games for r in rates), 24 - len(mirrors))
+        self.assertEqual(sum(r.wins for r in rates), 12 - sum(r["winner"] == "b" for r in mirrors))
+        for r in rates:
+            if r.policy == r.opponent:
+                self.assertEqual(r.games, sum(row["policy_a"] == row["policy_b"] == r.policy for row in rows))
+
+    def test_parallel_results_match_serial(self):
+        specs = list(schedule(8, ["greedy", "random"], ["random"], seed=1))
+        serial = list(iter_results(specs, workers=1))
+        parallel = list(iter_results(specs, workers=2, chunksize=3))
+        self.assertEqual(parallel, serial)
+
+    def test_wilson_interval(self):
+        lo, hi = WinRate("a", "b", 100, 50).interval()
+        self.assertAlmostEqual(lo, 0.4038, places=3)
+        self.assertAlmostEqual(hi, 0.5962, places=3)
+        self.assertEqual(WinRate("a", "b", 10, 10).interval()[1], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import random
+import unittest
+
+from src.game import BoardGameEngine, create_mirror_opening
+from src.verify import encode_game, verify_lines, verify_stream
+
+
+def random_game(game_id: str, seed: int, max_actions: int = 40) -> str:
+    rng = random.Random(seed)
+    opening = create_mirror_opening()
+    engine = BoardGameEngine(create_mirror_opening())
+    actions = []
+    while len(actions) < max_actions and not engine.state.winner:
+        pid = engine.state.current_player
+        action = rng.choice(list(engine.legal_actions(pid)))
+        actions.append((pid, action.unit_id, action.action_type.value, *action.target))
+        engine.submit_action(pid, action)
+    return encode_game(game_id, opening, actions, engine.state.winner)
+
+
+class VerifyTests(unittest.TestCase):
+    def test_legal_games_pass(self):
+        lines = [random_game(f"g{i}", i) for i in range(20)]
+        verdicts = list(verify_stream(lines, workers=1, chunksize=7))
+        self.assertEqual([v.game_id for v in verdicts], [f"g{i}" for i in range(20)])
+        self.assertTrue(all(v.ok for v in verdicts))
+
+    def test_reports_first_illegal_action(self):
+        line = random_game("bad", 1).replace('["p1","p1_u2","move",', '["p2","p1_u2","move",', 1)
+        cheat = encode_game("tele", create_mirror_opening(), [("p1", "p1_u1", "move", 4, 0), ("p2", "p2_u1", "move", 3, 4)])
+        claimed = encode_game("claim", create_mirror_opening(), [("p1", "p1_u1", "move", 1, 0)], winner="p1")
+        bad, tele, claim, junk = verify_lines([line, cheat, claimed, "{not json"])
+
+        self.assertFalse(bad.ok)
+        self.assertEqual(bad.reason, "not your turn")
+        self.assertEqual((tele.illegal_index, tele.reason), (0, "move too far"))
+        self.assertEqual((claim.illegal_index, claim.actions), (None, 1))
+        self.assertIn("claimed winner", claim.reason)
+        self.assertIn("malformed", junk.reason)
+
+    def test_parallel_matches_serial(self):
+        lines = [random_game(f"g{i}", i) for i in range(12)]
+        self.assertEqual(list(verify_stream(lines, workers=2, chunksize=2)), list(verify_stream(lines)))
+
+
+if __name__ == "__main__":
+    unittest.main()
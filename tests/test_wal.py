@@ -0,0 +1,163 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from social_game.ai import BotPolicy
+from social_game.engine import GameRoom, PlayerAction
+from social_game.host import RoomHost
+from social_game.wal import WriteAheadLog, recover
+
+
+def play_turn(wal: WriteAheadLog, room: GameRoom) -> None:
+    for pid in room.players:
+        action = BotPolicy(pid).choose_action(room)
+        room.submit_action(action)
+        wal.log_action(room.room_id, action)
+    wal.log_resolve(room.room_id, room.turn)
+    room.resolve_turn()
+
+
+class WriteAheadLogTests(unittest.TestCase):
+    def test_recover_from_checkpoint_and_tail(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            wal = WriteAheadLog(tmp)
+            rooms = [GameRoom(f"r{i}", "a", "b") for i in range(5)]
+            for room in rooms:
+                wal.log_open(room)
+                play_turn(wal, room)
+            wal.checkpoint(rooms)
+            for room in rooms[:3]:
+                play_turn(wal, room)
+            pending = PlayerAction("a", 1, 1, 1, use_skill=True)
+            rooms[4].submit_action(pending)
+            wal.log_action("r4", pending)
+            wal.close()
+
+            recovered = recover(tmp)
+            self.assertEqual(len(list(Path(tmp).glob("wal-*.log"))), 1)
+
+        self.assertEqual(sorted(recovered), [r.room_id for r in rooms])
+        for room in rooms:
+            self.assertEqual(recovered[room.room_id].snapshot(), room.snapshot())
+            self.assertEqual(recovered[room.room_id].pending_actions, room.pending_actions)
+
+    def test_torn_tail_is_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            wal = WriteAheadLog(tmp)
+            room = GameRoom("r1", "a", "b")
+            wal.log_open(room)
+            play_turn(wal, room)
+            lsn = wal.log_action("r1", PlayerAction("a", 0, 1, 0))
+            wal.wait_durable(lsn)
+            wal.close()
+            segment = next(Path(tmp).glob("wal-*.log"))
+            segment.write_bytes(segment.read_bytes()[:-3])
+
+            recovered = recover(tmp)["r1"]
+        self.assertEqual(recovered.snapshot(), room.snapshot())
+        self.assertEqual(recovered.pending_actions, {})
+
+    def test_durable_futures_resolve_in_lsn_order(self):
+        async def scenario(wal):
+            lsns = [wal.log_resolve("r1", turn) for turn in range(1, 4)]
+            futures = [wal.durable(lsn) for lsn in reversed(lsns)]
+            self.assertFalse(any(f.done() for f in futures))
+            await asyncio.wait_for(asyncio.gather(*futures), 1)
+            self.assertTrue(wal.durable(lsns[-1]).done())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            wal = WriteAheadLog(tmp, commit_interval=0.05)
+            asyncio.run(scenario(wal))
+            wal.close()
+
+    def test_host_logs_turns_for_recovery(self):
+        async def scenario(wal):
+            host = RoomHost(wal=wal)
+            room = host.open_room("r1", "you", "bot", bots=["bot"])
+            await (await host.submit_action("r1", PlayerAction("you", 0, 1, 0)))
+            await host.shutdown()
+            return room
+
+        with tempfile.TemporaryDirectory() as tmp:
+            wal = WriteAheadLog(tmp)
+            room = asyncio.run(scenario(wal))
+            wal.close()
+            recovered = recover(tmp)
+        self.assertEqual(recovered["r1"].snapshot(), room.snapshot())
+
+    def test_finished_rooms_are_not_recovered(self):
+        async def scenario(wal):
+            host = RoomHost(wal=wal)
+            host.open_room("done", "a", "b", bots=["a", "b"])
+            live = host.open_room("live", "you", "bot", bots=["bot"])
+            while "done" in host.rooms:
+                await asyncio.sleep(0.01)
+            await host.shutdown()
+            return live
+
+        with tempfile.TemporaryDirectory() as tmp:
+            wal = WriteAheadLog(tmp)
+            live = asyncio.run(scenario(wal))
+            wal.close()
+            recovered = recover(tmp)
+        self.assertEqual(sorted(recovered), ["live"])
+        self.assertEqual(recovered["live"].snapshot(), live.snapshot())
+
+    def test_rejected_open_is_not_logged(self):
+        async def scenario(wal):
+            host = RoomHost(wal=wal)
+            host.open_room("r1", "a", "b")
+            with self.assertRaises(ValueError):
+                host.open_room("r1", "c", "d")
+            await host.shutdown()
+            with self.assertRaises(RuntimeError):
+                host.open_room("r2", "a", "b")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            wal = WriteAheadLog(tmp)
+            asyncio.run(scenario(wal))
+            wal.close()
+            recovered = recover(tmp)
+        self.assertEqual(sorted(recovered), ["r1"])
+        self.assertEqual(list(recovered["r1"].players), ["a", "b"])
+
+    def test_host_reports_turns_only_once_durable(self):
+        async def scenario(wal, tmp):
+            # a long commit interval: results have to wait for the flusher's next commit
+            seen = []
+            host = RoomHost(wal=wal, on_result=lambda room_id, r: seen.append(recover(tmp)[room_id].turn))
+            host.open_room("r1", "you", "bot", bots=["bot"])
+            await (await host.submit_action("r1", PlayerAction("you", 0, 1, 0)))
+            await host.shutdown()
+            return seen
+
+        with tempfile.TemporaryDirectory() as tmp:
+            wal = WriteAheadLog(tmp, commit_interval=0.05)
+            seen = asyncio.run(scenario(wal, tmp))
+            wal.close()
+        self.assertEqual(seen, [2])
+
+    def test_host_checkpoint_while_rooms_play(self):
+        async def scenario(wal):
+            finished = []
+            host = RoomHost(wal=wal, on_result=lambda room_id, r: r.winner and finished.append(room_id))
+            rooms = [host.open_room(f"r{i}", "a", "b", bots=["a", "b"]) for i in range(8)]
+            await asyncio.sleep(0)
+            await host.checkpoint()
+            await asyncio.sleep(0.02)
+            await host.shutdown(drain=False)
+            return rooms, finished
+
+        with tempfile.TemporaryDirectory() as tmp:
+            wal = WriteAheadLog(tmp)
+            rooms, finished = asyncio.run(scenario(wal))
+            wal.close()
+            recovered = recover(tmp)
+        self.assertEqual(sorted(recovered), sorted(r.room_id for r in rooms if r.room_id not in finished))
+        by_id = {r.room_id: r for r in rooms}
+        for room_id, room in recovered.items():
+            self.assertEqual(room.snapshot(), by_id[room_id].snapshot())
+
+if __name__ == "__main__":
+    unittest.main()
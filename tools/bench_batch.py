@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from social_game.batch import BatchEngine, np
+from social_game.engine import GameRoom, PlayerAction
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="BatchEngine throughput (random bot-vs-bot games)")
+    p.add_argument("--rooms", type=int, default=10000, help="rooms per batch")
+    p.add_argument("--seed", type=int, default=1)
+    return p.parse_args()
+
+
+def run_batch(n: int, seed: int, vectorized: bool) -> float:
+    rng = random.Random(seed)
+    engine = BatchEngine(n, vectorized=vectorized)
+    start = time.perf_counter()
+    while engine.active():
+        first = engine.random_actions(rng, 0)
+        second = engine.random_actions(rng, 1)
+        engine.resolve_turn([first, second])
+    return n / (time.perf_counter() - start)
+
+
+def run_scalar(n: int, seed: int) -> float:
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(n):
+        room = GameRoom("bench", "p1", "p2")
+        while True:
+            for pid in room.players:
+                units = room.players[pid].units
+                if not units:
+                    room.submit_action(PlayerAction(pid, 0, 0, 0))
+                    continue
+                i = rng.randrange(len(units))
+                tx, ty = rng.choice(room.legal_moves(pid, i))
+                room.submit_action(PlayerAction(pid, i, tx, ty, use_skill=rng.random() < 0.5))
+            if room.resolve_turn().winner:
+                break
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    args = parse_args()
+    loops = run_batch(args.rooms, args.seed, vectorized=False)
+    scalar = run_scalar(args.rooms, args.seed)
+    print(f"rooms={args.rooms}")
+    if np is not None:
+        print(f"batch (numpy): {run_batch(args.rooms, args.seed, vectorized=True):,.0f} games/s")
+    print(f"batch (loops): {loops:,.0f} games/s")
+    print(f"scalar:        {scalar:,.0f} games/s")
+
+
+if __name__ == "__main__":
+    main()
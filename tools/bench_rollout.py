@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from social_game.engine import GameRoom
+from social_game.rollout import RolloutBot, candidate_moves
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="RolloutBot scaling across worker processes")
+    p.add_argument("--rollouts", type=int, default=64, help="rollouts per candidate move")
+    p.add_argument("--batch-size", type=int, default=64)
+    p.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    room = GameRoom("bench", "p1", "p2")
+    total = args.rollouts * len(candidate_moves(room, "p2"))
+    print(f"cores={os.cpu_count()} rollouts/decision={total}")
+
+    baseline = None
+    workers = 0
+    while workers <= args.max_workers:
+        bot = RolloutBot("p2", rollouts=args.rollouts, workers=workers, batch_size=args.batch_size)
+        bot.choose_action(room)  # warm up the pool
+        start = time.perf_counter()
+        action = bot.choose_action(room)
+        elapsed = time.perf_counter() - start
+        bot.close()
+        rate = total / elapsed
+        baseline = baseline or rate
+        label = "inline" if workers == 0 else f"{workers} proc"
+        print(f"{label:>8}: {rate:10,.0f} rollouts/s  speedup={rate / baseline:4.2f}x  move={action}")
+        workers = 1 if workers == 0 else workers * 2
+
+
+if __name__ == "__main__":
+    main()
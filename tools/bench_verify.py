@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+
+from src.game import BoardGameEngine, create_mirror_opening
+from src.verify import encode_game, verify_file
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Bulk turn-log verification throughput")
+    p.add_argument("--games", type=int, default=20000)
+    p.add_argument("--actions", type=int, default=60, help="max actions per generated game")
+    p.add_argument("--cheat-rate", type=float, default=0.01, help="fraction of games with a forged action")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--chunksize", type=int, default=256)
+    return p.parse_args()
+
+
+def generate(path: str, games: int, max_actions: int, cheat_rate: float) -> None:
+    rng = random.Random(0)
+    with open(path, "w", encoding="utf-8") as f:
+        for g in range(games):
+            opening = create_mirror_opening()
+            engine = BoardGameEngine(create_mirror_opening())
+            actions = []
+            while len(actions) < max_actions and not engine.state.winner:
+                pid = engine.state.current_player
+                action = rng.choice(list(engine.legal_actions(pid)))
+                actions.append((pid, action.unit_id, action.action_type.value, *action.target))
+                engine.make(action)
+            if rng.random() < cheat_rate and actions:
+                pid, uid, _, _, _ = actions[-1]
+                actions[-1] = (pid, uid, "skill", 4, 0)
+            f.write(encode_game(f"g{g}", opening, actions, engine.state.winner) + "\n")
+
+
+def main() -> None:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.jsonl")
+        generate(path, args.games, args.actions, args.cheat_rate)
+        report = verify_file(path, args.workers, args.chunksize)
+    workers = args.workers or os.cpu_count() or 1
+    print(f"games={report.games} actions={report.actions} illegal={report.illegal} workers={workers}")
+    print(
+        f"verify: {report.seconds:.2f}s {report.games_per_second:,.0f} games/s "
+        f"({report.actions / report.seconds:,.0f} actions/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import threading
+import time
+
+from social_game.ai import BotPolicy
+from social_game.engine import GameRoom
+from social_game.wal import WriteAheadLog, recover
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Write-ahead log throughput and recovery time")
+    p.add_argument("--rooms", type=int, default=5000)
+    p.add_argument("--turns", type=int, default=6)
+    p.add_argument("--writers", type=int, default=4, help="threads appending concurrently")
+    p.add_argument("--checkpoint-at", type=int, default=3, help="turn after which to checkpoint (0 = never)")
+    return p.parse_args()
+
+
+def play(wal: WriteAheadLog, rooms: list, turns: range) -> None:
+    for _ in turns:
+        for room in rooms:
+            for pid in room.players:
+                action = BotPolicy(pid).choose_action(room)
+                room.submit_action(action)
+                wal.log_action(room.room_id, action)
+            wal.log_resolve(room.room_id, room.turn)
+            room.resolve_turn()
+
+
+def main() -> None:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        wal = WriteAheadLog(tmp)
+        rooms = [GameRoom(f"room-{i}", "a", "b") for i in range(args.rooms)]
+        for room in rooms:
+            wal.log_open(room)
+        shards = [rooms[i :: args.writers] for i in range(args.writers)]
+
+        phases = [range(args.checkpoint_at), range(args.turns - args.checkpoint_at)] if args.checkpoint_at else [range(args.turns)]
+        start = time.perf_counter()
+        for i, turns in enumerate(phases):
+            threads = [threading.Thread(target=play, args=(wal, shard, turns)) for shard in shards]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            if i == 0 and len(phases) > 1:
+                wal.checkpoint(rooms)
+        records = wal.last_lsn
+        wal.close()
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        recovered = recover(tmp)
+        recovery = time.perf_counter() - start
+
+    print(f"rooms={args.rooms} turns={args.turns} writers={args.writers}")
+    print(f"log:      {records:,} records in {elapsed:.2f}s ({records / elapsed:,.0f} records/s, incl. bot moves)")
+    print(f"recovery: {len(recovered):,} rooms in {recovery:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, List
+
+from src.matchmaking import PlayerTicket
+from src.matchmaking_service import MatchmakingService
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Matchmaking service load test: synthetic arrivals on one event loop")
+    p.add_argument("--rate", type=float, default=5000, help="arrivals per second")
+    p.add_argument("--seconds", type=float, default=10)
+    p.add_argument("--round-interval", type=float, default=0.5)
+    p.add_argument("--band-width", type=int, default=200)
+    p.add_argument("--cancel-rate", type=float, default=0.05, help="fraction of players who cancel while queued")
+    p.add_argument("--seed", type=int, default=1)
+    return p.parse_args()
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+async def run(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    enqueued_at: Dict[str, float] = {}
+    latencies: List[float] = []
+
+    def on_match(a: PlayerTicket, b: PlayerTicket) -> None:
+        now = time.perf_counter()
+        for t in (a, b):
+            latencies.append(now - enqueued_at.pop(t.player_id))
+
+    svc = MatchmakingService(band_width=args.band_width, round_interval=args.round_interval, on_match=on_match)
+    svc.start()
+    start = time.perf_counter()
+    n = 0
+    cancels = 0
+    while time.perf_counter() - start < args.seconds:
+        # arrivals due so far, in 10ms slices so the cadence task keeps running
+        due = int((time.perf_counter() - start) * args.rate)
+        for _ in range(due - n):
+            pid = f"p{n}"
+            enqueued_at[pid] = time.perf_counter()
+            await svc.enqueue(PlayerTicket(pid, int(rng.gauss(1500, 350)), rng.choice([3, 30, 30, 30])))
+            n += 1
+            if rng.random() < args.cancel_rate:
+                victim = f"p{rng.randrange(n)}"
+                if await svc.cancel(victim):
+                    enqueued_at.pop(victim, None)
+                    cancels += 1
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    await svc.stop()
+
+    print(
+        f"arrivals={n} cancels={cancels} matches={svc.matched} still_queued={len(svc)} shards={len(svc.shards)}"
+    )
+    print(
+        f"throughput={svc.matched / elapsed:,.0f} matches/s "
+        f"p50={percentile(latencies, 0.50):.2f}s p99={percentile(latencies, 0.99):.2f}s (enqueue to match)"
+    )
+
+
+def main() -> None:
+    asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
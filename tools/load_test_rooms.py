@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+
+from social_game.engine import PlayerAction
+from social_game.host import RoomHost
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="RoomHost load test: human-vs-bot rooms on one event loop")
+    p.add_argument("--rooms", type=int, nargs="+", default=[1000, 10000, 50000])
+    p.add_argument("--turns", type=int, default=3, help="turns played per room")
+    p.add_argument("--seed", type=int, default=1)
+    return p.parse_args()
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def play(host: RoomHost, room_id: str, turns: int, rng: random.Random, latencies: List[float]) -> None:
+    room = host.rooms[room_id].room
+    for _ in range(turns):
+        units = room.players["you"].units
+        if not units or room_id not in host.rooms:
+            return
+        i = rng.randrange(len(units))
+        tx, ty = rng.choice(room.legal_moves("you", i))
+        start = time.perf_counter()
+        fut = await host.submit_action(room_id, PlayerAction("you", i, tx, ty))
+        result = await fut
+        latencies.append(time.perf_counter() - start)
+        if result.winner:
+            return
+
+
+async def run(n_rooms: int, turns: int, seed: int) -> None:
+    rng = random.Random(seed)
+    host = RoomHost()
+    for i in range(n_rooms):
+        host.open_room(f"room-{i}", "you", "bot", bots=["bot"])
+
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(play(host, f"room-{i}", turns, rng, latencies) for i in range(n_rooms)))
+    elapsed = time.perf_counter() - start
+    await host.shutdown()
+
+    print(
+        f"rooms={n_rooms:>6} resolves={len(latencies):>7} "
+        f"p50={percentile(latencies, 0.50) * 1000:8.2f}ms "
+        f"p99={percentile(latencies, 0.99) * 1000:8.2f}ms "
+        f"throughput={len(latencies) / elapsed:,.0f} turns/s"
+    )
+
+
+def main() -> None:
+    args = parse_args()
+    for n in args.rooms:
+        asyncio.run(run(n, args.turns, args.seed))
+
+
+if __name__ == "__main__":
+    main()